@@ -0,0 +1,206 @@
+"""
+Time-series analytics for job applications.
+
+``JobApplicationRollup`` holds one row per day, BD, platform, status and job
+type with the number of applications, for both applied_date and created_at
+days. Refreshes are incremental: only days that contain a job updated since
+the last watermark (``jobs.updated_at`` is indexed) or that lost a job to a
+delete (``JobRollupDirtyDay``) are recomputed. Queries truncate those daily
+rows to days, weeks or months, so a one-year range reads at most a few
+thousand rows whatever the size of the jobs table.
+
+Job writes queue a refresh for the end of the current minute
+(:func:`schedule_refresh`); reads refresh inline when the rollup is still
+older than ``ANALYTICS_ROLLUP_MAX_AGE``.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate, TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from . import tasks
+from .models import JobApplication, JobApplicationRollup, JobApplicationWithArchive, JobRollupDirtyDay, RollupState
+
+ROLLUP_NAME = 'job_applications'
+BASES = ('applied_date', 'created_at')
+
+INTERVALS = {
+    'day': TruncDay,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+# Public group-by name -> rollup column
+GROUP_BY_FIELDS = {
+    'bd': 'bd_id',
+    'platform': 'platform',
+    'status': 'application_status',
+    'job_type': 'job_type',
+}
+
+# Rows committed by transactions that started before the previous refresh
+# can carry an updated_at older than its watermark; rescanning a short
+# overlap picks them up (recomputing a day is idempotent).
+WATERMARK_OVERLAP = timedelta(minutes=5)
+
+DAY_BATCH = 200
+
+# Job writes within one window share a single queued refresh
+REFRESH_WINDOW_SECONDS = 60
+
+
+def _day_expression(basis):
+    return F('applied_date') if basis == 'applied_date' else TruncDate('created_at')
+
+
+def _grouped_jobs(basis, jobs):
+    return (
+        jobs.annotate(day=_day_expression(basis))
+        .values('day', 'bd_id', 'platform', 'application_status', 'job_type')
+        .annotate(n=Count('pk'))
+    )
+
+
+def _rebuild_days(basis, days):
+    """
+    Recompute the rollup rows of ``basis`` for ``days``, or all of them when
+    ``days`` is None. Returns the number of days recomputed (None for all).
+    Archived jobs (authapp.archive) still count.
+    """
+    jobs = JobApplicationWithArchive.objects.order_by()
+    if days is None:
+        JobApplicationRollup.objects.filter(basis=basis).delete()
+        JobApplicationRollup.objects.bulk_create(_rollup_rows(basis, _grouped_jobs(basis, jobs)), batch_size=2000)
+        return None
+
+    days = sorted(days)
+    for start in range(0, len(days), DAY_BATCH):
+        batch = days[start:start + DAY_BATCH]
+        if basis == 'applied_date':
+            day_jobs = jobs.filter(applied_date__in=batch)
+        else:
+            # The raw created_at range can use an index and prune partitions; the __date lookup cannot
+            day_jobs = jobs.created_between(batch[0], batch[-1] + timedelta(days=1)).filter(created_at__date__in=batch)
+        rows = _grouped_jobs(basis, day_jobs)
+        JobApplicationRollup.objects.filter(basis=basis, day__in=batch).delete()
+        JobApplicationRollup.objects.bulk_create(_rollup_rows(basis, rows), batch_size=2000)
+    return len(days)
+
+
+def _rollup_rows(basis, rows):
+    for row in rows:
+        yield JobApplicationRollup(
+            basis=basis,
+            day=row['day'],
+            bd_id=row['bd_id'],
+            platform=row['platform'],
+            application_status=row['application_status'],
+            job_type=row['job_type'] or '',
+            count=row['n'],
+        )
+
+
+@tasks.task(max_attempts=3)
+def refresh_rollups(full=False):
+    """
+    Bring the rollup up to date. Returns the number of days recomputed per
+    basis, or None per basis for a full rebuild.
+    """
+    with transaction.atomic():
+        state, _ = RollupState.objects.select_for_update().get_or_create(name=ROLLUP_NAME)
+        started = timezone.now()
+        dirty = JobRollupDirtyDay.objects.select_for_update()
+
+        if full or state.watermark is None:
+            result = {basis: _rebuild_days(basis, None) for basis in BASES}
+            dirty.delete()
+        else:
+            changed = JobApplication.objects.order_by().filter(updated_at__gte=state.watermark - WATERMARK_OVERLAP)
+            days = {basis: set() for basis in BASES}
+            for basis in BASES:
+                days[basis].update(
+                    changed.annotate(day=_day_expression(basis)).values_list('day', flat=True).distinct()
+                )
+            for basis, day in dirty.values_list('basis', 'day'):
+                days[basis].add(day)
+            dirty.delete()
+            result = {basis: _rebuild_days(basis, days[basis]) for basis in BASES}
+
+        state.watermark = started
+        state.refreshed_at = timezone.now()
+        state.save()
+    return result
+
+
+def rollup_age():
+    """Seconds since the last refresh, None if it never ran."""
+    refreshed_at = RollupState.objects.filter(name=ROLLUP_NAME).values_list('refreshed_at', flat=True).first()
+    if refreshed_at is None:
+        return None
+    return (timezone.now() - refreshed_at).total_seconds()
+
+
+def ensure_fresh():
+    """Refresh when the rollup is older than ``ANALYTICS_ROLLUP_MAX_AGE`` seconds."""
+    age = rollup_age()
+    if age is None or age > getattr(settings, 'ANALYTICS_ROLLUP_MAX_AGE', 60):
+        refresh_rollups()
+
+
+def schedule_refresh():
+    """
+    Queue a refresh to run when the current window closes, so it covers
+    every job written in the window. Without a task worker the read-time
+    refresh in :func:`ensure_fresh` is relied on instead.
+    """
+    if not tasks.enabled():
+        return None
+    delay = REFRESH_WINDOW_SECONDS - time.time() % REFRESH_WINDOW_SECONDS
+    return tasks.enqueue(
+        'refresh_rollups', idempotency_key=tasks.window_key('refresh_rollups', REFRESH_WINDOW_SECONDS), delay=delay
+    )
+
+
+def mark_days_dirty(job):
+    """Queue the days a deleted job was counted on for recomputation."""
+    created = timezone.localdate(job.created_at) if job.created_at else None
+    entries = [('applied_date', job.applied_date), ('created_at', created)]
+    JobRollupDirtyDay.objects.bulk_create(
+        [JobRollupDirtyDay(basis=basis, day=day) for basis, day in entries if day],
+        ignore_conflicts=True,
+    )
+
+
+def job_timeseries(interval='day', group_by=(), start=None, end=None, basis='applied_date', filters=None):
+    """
+    Application counts per ``interval`` bucket between ``start`` and ``end``
+    (inclusive dates), split by ``group_by`` names from :data:`GROUP_BY_FIELDS`
+    and narrowed by ``filters`` ({group-by name: value}).
+    """
+    columns = [GROUP_BY_FIELDS[name] for name in group_by]
+    rollups = JobApplicationRollup.objects.filter(basis=basis)
+    if start:
+        rollups = rollups.filter(day__gte=start)
+    if end:
+        rollups = rollups.filter(day__lte=end)
+    for name, value in (filters or {}).items():
+        rollups = rollups.filter(**{GROUP_BY_FIELDS[name]: value})
+
+    rows = (
+        rollups.annotate(bucket=INTERVALS[interval]('day'))
+        .values('bucket', *columns)
+        .annotate(total=Sum('count'))
+        .order_by('bucket', *columns)
+    )
+    buckets = []
+    for row in rows:
+        bucket = {'bucket': row['bucket'].isoformat()}
+        for name, column in zip(group_by, columns):
+            bucket[name] = row[column] if name != 'job_type' else (row[column] or None)
+        bucket['count'] = row['total']
+        buckets.append(bucket)
+    return buckets
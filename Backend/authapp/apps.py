@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class AuthappConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'authapp'
+
+    def ready(self):
+        # reports registers its background task; signals its receivers and tasks
+        from . import checks, reports, signals  # noqa: F401
@@ -0,0 +1,265 @@
+"""
+Archive tier for closed job applications.
+
+Jobs in a final status (``workflow.TERMINAL_STATUSES``) whose status last
+changed more than ``ARCHIVE_AFTER_DAYS`` ago are moved, together with their
+interviews, from ``jobs`` and ``interview_schedules`` to ``jobs_archive``
+and ``interview_schedules_archive`` by ``manage.py archive_jobs`` (e.g.
+nightly from cron). Each batch of ``ARCHIVE_BATCH_SIZE`` jobs is copied with
+INSERT ... SELECT and deleted in its own transaction, so ids and timestamps
+are kept and no model signals run; the status counters' ``current`` (live
+jobs) is adjusted in the same transaction. ``manage.py restore_archived_jobs``
+moves jobs back the same way.
+
+The list, search and stats endpoints read the live tables only, so they no
+longer scan closed jobs. With ``include_archived=1`` they read the
+``jobs_with_archive`` and ``interview_schedules_with_archive`` views instead
+(UNION ALL of the live and archive table, ``archived_at`` null for live
+rows; see :func:`jobs` and :func:`interviews`). Analytics rollups and the
+weekly BD reports always read the views, so archiving changes no history,
+and the status log keeps the transitions of archived jobs.
+
+The views are created by a migration from the models' columns. A migration
+that changes the columns of ``jobs`` or ``interview_schedules`` must drop
+them before and recreate them after its operations::
+
+    migrations.RunPython(archive.drop_views, archive.create_views),
+    ...
+    migrations.RunPython(archive.create_views, archive.drop_views),
+
+``check --database default`` warns when a view no longer matches its model.
+"""
+from collections import Counter
+from datetime import timedelta
+from typing import NamedTuple
+
+from django.apps import apps as global_apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from . import workflow
+from .models import (
+    ArchivedInterviewSchedule,
+    ArchivedJobApplication,
+    InterviewSchedule,
+    InterviewScheduleWithArchive,
+    JobApplication,
+    JobApplicationWithArchive,
+)
+
+# (live, archive, view) model names; by name so migrations can pass their historical models
+VIEWS = (
+    ('JobApplication', 'ArchivedJobApplication', 'JobApplicationWithArchive'),
+    ('InterviewSchedule', 'ArchivedInterviewSchedule', 'InterviewScheduleWithArchive'),
+)
+
+
+class ArchiveResult(NamedTuple):
+    jobs: int
+    interviews: int
+    batches: int
+
+
+# -------- Reading live and archived rows --------
+def include_archived(params):
+    """Whether request ``params`` ask for archived rows too (``include_archived=1``)."""
+    return str(params.get('include_archived', '')).lower() in ('1', 'true', 'yes')
+
+
+def jobs(include=False):
+    """Job applications, archived ones included when ``include`` is set."""
+    return (JobApplicationWithArchive if include else JobApplication).objects.all()
+
+
+def interviews(include=False):
+    """Interview schedules, those of archived jobs included when ``include`` is set."""
+    return (InterviewScheduleWithArchive if include else InterviewSchedule).objects.all()
+
+
+def archived_counts(field):
+    """``{value: count}`` of archived jobs grouped by ``field``."""
+    return dict(ArchivedJobApplication.objects.order_by().values_list(field).annotate(count=Count('pk')))
+
+
+# -------- Views --------
+def _columns(model):
+    return [field.column for field in model._meta.concrete_fields]
+
+
+def view_sql(live, archive, view, quote):
+    """CREATE VIEW statement of ``view`` over the tables of ``live`` and ``archive``."""
+    columns = ', '.join(quote(column) for column in _columns(live))
+    return (
+        f'CREATE VIEW {quote(view._meta.db_table)} AS '
+        f'SELECT {columns}, NULL AS {quote("archived_at")} FROM {quote(live._meta.db_table)} '
+        f'UNION ALL SELECT {columns}, {quote("archived_at")} FROM {quote(archive._meta.db_table)}'
+    )
+
+
+def create_views(apps, schema_editor):
+    """(Re)create the union views; a ``RunPython`` operation."""
+    quote = schema_editor.quote_name
+    for live, archive, view in VIEWS:
+        live, archive, view = (apps.get_model('authapp', name) for name in (live, archive, view))
+        schema_editor.execute(f'DROP VIEW IF EXISTS {quote(view._meta.db_table)}')
+        schema_editor.execute(view_sql(live, archive, view, quote))
+
+
+def drop_views(apps, schema_editor):
+    for _, _, view in VIEWS:
+        schema_editor.execute(f'DROP VIEW IF EXISTS {schema_editor.quote_name(apps.get_model("authapp", view)._meta.db_table)}')
+
+
+def views_over(table):
+    """``(drop, create)`` statements of the views reading ``table``, for rebuilding the table."""
+    quote = connection.ops.quote_name
+    drop, create = [], []
+    for names in VIEWS:
+        live, archive, view = (global_apps.get_model('authapp', name) for name in names)
+        if table in (live._meta.db_table, archive._meta.db_table):
+            drop.append(f'DROP VIEW IF EXISTS {quote(view._meta.db_table)}')
+            create.append(view_sql(live, archive, view, quote))
+    return drop, create
+
+
+def stale_views(using_connection):
+    """``[(view, reason)]`` for the views that are missing or whose columns differ from their model's."""
+    stale = []
+    with using_connection.cursor() as cursor:
+        existing = {info.name for info in using_connection.introspection.get_table_list(cursor)}
+        for _, _, name in VIEWS:
+            view = global_apps.get_model('authapp', name)
+            table = view._meta.db_table
+            if table not in existing:
+                stale.append((table, 'missing'))
+                continue
+            columns = {column.name for column in using_connection.introspection.get_table_description(cursor, table)}
+            expected = set(_columns(view))
+            if columns != expected:
+                differing = sorted(columns.symmetric_difference(expected))
+                stale.append((table, f"stale (columns differ: {', '.join(differing)})"))
+    return stale
+
+
+# -------- Archive and restore --------
+def archive_cutoff(days=None):
+    return timezone.now() - timedelta(days=settings.ARCHIVE_AFTER_DAYS if days is None else days)
+
+
+def archivable(cutoff, bd_id=None):
+    """Live jobs in a final status that last changed before ``cutoff``, oldest id first."""
+    closed = JobApplication.objects.filter(application_status__in=workflow.TERMINAL_STATUSES).filter(
+        Q(status_changed_at__lt=cutoff) | Q(status_changed_at=None, created_at__lt=cutoff)
+    )
+    if bd_id:
+        closed = closed.for_bd(bd_id)
+    return closed.order_by('job_id')
+
+
+def _locked(queryset):
+    # A job being edited is left for the next run rather than waited for
+    if connection.features.has_select_for_update_skip_locked:
+        return queryset.select_for_update(skip_locked=True)
+    return queryset.select_for_update()
+
+
+def _copy(cursor, source, target, ids, archived_at=None):
+    """Copy the rows of ``source`` with job_id in ``ids`` to ``target``; returns the row count."""
+    quote = connection.ops.quote_name
+    columns = ', '.join(quote(column) for column in _columns(source) if column != 'archived_at')
+    placeholders = ', '.join(['%s'] * len(ids))
+    if archived_at is None:
+        cursor.execute(
+            f'INSERT INTO {quote(target._meta.db_table)} ({columns}) '
+            f'SELECT {columns} FROM {quote(source._meta.db_table)} WHERE {quote("job_id")} IN ({placeholders})',
+            list(ids),
+        )
+    else:
+        cursor.execute(
+            f'INSERT INTO {quote(target._meta.db_table)} ({columns}, {quote("archived_at")}) '
+            f'SELECT {columns}, %s FROM {quote(source._meta.db_table)} WHERE {quote("job_id")} IN ({placeholders})',
+            [archived_at, *ids],
+        )
+    return cursor.rowcount
+
+
+def _delete(cursor, model, ids):
+    quote = connection.ops.quote_name
+    placeholders = ', '.join(['%s'] * len(ids))
+    cursor.execute(f'DELETE FROM {quote(model._meta.db_table)} WHERE {quote("job_id")} IN ({placeholders})', list(ids))
+
+
+def _move(selected, step, batch_size):
+    """
+    Run ``step(cursor, rows)`` on batches of ``(job_id, bd_id, status)`` rows
+    of ``selected``, one transaction each; returns an ArchiveResult.
+    """
+    jobs_moved = interviews_moved = batches = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                _locked(selected.filter(job_id__gt=last_id).order_by('job_id'))
+                .values_list('job_id', 'bd_id', 'application_status')[:batch_size]
+            )
+            if not rows:
+                break
+            with connection.cursor() as cursor:
+                interviews_moved += step(cursor, rows)
+        last_id = rows[-1][0]
+        jobs_moved += len(rows)
+        batches += 1
+    return ArchiveResult(jobs_moved, interviews_moved, batches)
+
+
+def _status_counts(rows):
+    return Counter((bd_id, status) for _, bd_id, status in rows)
+
+
+def archive_jobs(days=None, batch_size=None, bd_id=None):
+    """Move the jobs :func:`archivable` selects, and their interviews, to the archive tables."""
+
+    def step(cursor, rows):
+        ids = [row[0] for row in rows]
+        archived_at = timezone.now()
+        # Jobs first: archived interviews reference the archived job
+        _copy(cursor, JobApplication, ArchivedJobApplication, ids, archived_at)
+        moved = _copy(cursor, InterviewSchedule, ArchivedInterviewSchedule, ids, archived_at)
+        _delete(cursor, InterviewSchedule, ids)
+        _delete(cursor, JobApplication, ids)
+        for (job_bd_id, status), count in _status_counts(rows).items():
+            workflow.record_archived(job_bd_id, status, count)
+        return moved
+
+    return _move(archivable(archive_cutoff(days), bd_id), step, batch_size or settings.ARCHIVE_BATCH_SIZE)
+
+
+def restorable(job_ids=None, bd_id=None, archived_since=None):
+    """Archived jobs, optionally only ``job_ids``, one BD's or those archived since a moment."""
+    archived = ArchivedJobApplication.objects.all()
+    if job_ids is not None:
+        archived = archived.filter(job_id__in=job_ids)
+    if bd_id:
+        archived = archived.for_bd(bd_id)
+    if archived_since is not None:
+        archived = archived.filter(archived_at__gte=archived_since)
+    return archived.order_by('job_id')
+
+
+def restore_jobs(job_ids=None, bd_id=None, archived_since=None, batch_size=None):
+    """Move archived jobs (see :func:`restorable`) and their interviews back to the live tables."""
+
+    def step(cursor, rows):
+        ids = [row[0] for row in rows]
+        _copy(cursor, ArchivedJobApplication, JobApplication, ids)
+        moved = _copy(cursor, ArchivedInterviewSchedule, InterviewSchedule, ids)
+        _delete(cursor, ArchivedInterviewSchedule, ids)
+        _delete(cursor, ArchivedJobApplication, ids)
+        for (job_bd_id, status), count in _status_counts(rows).items():
+            workflow.record_restored(job_bd_id, status, count)
+        return moved
+
+    selected = restorable(job_ids, bd_id, archived_since)
+    return _move(selected, step, batch_size or settings.ARCHIVE_BATCH_SIZE)
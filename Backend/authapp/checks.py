@@ -0,0 +1,149 @@
+from django.conf import settings
+from django.core.checks import Error, Info, Tags, Warning, register
+from django.db import DatabaseError, connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.utils import timezone
+
+from backend.db import connection_summary, effective_pool_size
+
+from . import archive, partitioning
+
+# Migration that creates the live-plus-archive views
+ARCHIVE_VIEWS_MIGRATION = ('authapp', '0020_job_archive')
+
+
+@register('database_pool')
+def check_database_pool(app_configs, **kwargs):
+    """
+    Warn about database connection settings that cannot take effect: a pool
+    requested where it is unavailable, or more connections across the
+    workers than the server allows. The effective configuration is reported
+    by :func:`report_database_pool`.
+    """
+    messages = []
+    workers = getattr(settings, 'WEB_CONCURRENCY', 1)
+    max_connections = getattr(settings, 'DB_MAX_CONNECTIONS', None)
+
+    for alias, config in settings.DATABASES.items():
+        _, max_size = effective_pool_size(config)
+        pool_status = config.get('POOL_STATUS')
+
+        if pool_status and not config.get('OPTIONS', {}).get('pool'):
+            messages.append(Warning(
+                f"Database '{alias}': {pool_status}.",
+                hint='Use PostgreSQL with psycopg[pool] installed, or unset DB_POOL.',
+                id='authapp.W001',
+            ))
+
+        if max_connections and max_size * workers > max_connections:
+            messages.append(Warning(
+                f"Database '{alias}': {max_size * workers} connections may be opened "
+                f"but the server allows {max_connections}.",
+                hint='Lower DB_POOL_MAX_SIZE or WEB_CONCURRENCY, or raise DB_MAX_CONNECTIONS.',
+                id='authapp.W002',
+            ))
+    return messages
+
+
+@register('database_pool', deploy=True)
+def report_database_pool(app_configs, **kwargs):
+    """
+    The effective pool or persistent-connection settings of each database,
+    as an Info per alias. Only ``check --deploy`` (run when deploying)
+    reports them, so other management commands stay quiet.
+    """
+    workers = getattr(settings, 'WEB_CONCURRENCY', 1)
+    return [
+        Info(connection_summary(alias, config, workers), id='authapp.I001')
+        for alias, config in settings.DATABASES.items()
+    ]
+
+
+# Cache backends whose entries other worker processes cannot see
+PER_PROCESS_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches)
+def check_replica_cache(app_configs, **kwargs):
+    """
+    Replica routing keeps a caller on the primary after a write with a marker
+    in the default cache (backend.middleware.ReplicaRoutingMiddleware); a
+    per-process cache only holds it for the worker that served the write.
+    """
+    if not getattr(settings, 'DATABASE_REPLICAS', None):
+        return []
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    if backend not in PER_PROCESS_CACHES:
+        return []
+    return [Error(
+        f'DB_REPLICAS is set but the default cache ({backend.rsplit(".", 1)[-1]}) is not shared '
+        'between processes, so reads after a write can go to a lagging replica.',
+        hint='Set CACHE_REDIS_URL, or configure a shared cache such as DatabaseCache in CACHES.',
+        id='authapp.E001',
+    )]
+
+
+@register(Tags.database)
+def check_partitions(app_configs, databases=None, **kwargs):
+    """
+    Warn when a range-partitioned table (authapp.partitioning) has no
+    partition for next month, so new rows would pile up in its default
+    partition. Database checks only run with ``check --database`` and
+    ``migrate``.
+    """
+    messages = []
+    for alias in databases or ():
+        connection = connections[alias]
+        if connection.vendor != 'postgresql':
+            continue
+        next_month = partitioning.next_month(timezone.now())
+        for table in partitioning.TABLES:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) FROM pg_inherits i "
+                        "JOIN pg_class c ON c.oid = i.inhrelid JOIN pg_partitioned_table p ON p.partrelid = i.inhparent "
+                        "WHERE i.inhparent = to_regclass(%s) AND p.partstrat = 'r'",
+                        [table],
+                    )
+                    partitions = [partitioning.Partition(name, bound, 0) for name, bound in cursor.fetchall()]
+            except DatabaseError:
+                continue
+            if partitions and not any(
+                bounds and bounds[0] <= next_month < bounds[1] for bounds in map(partitioning.range_bounds, partitions)
+            ):
+                messages.append(Warning(
+                    f"Database '{alias}': {table} has no partition for {next_month:%Y-%m}.",
+                    hint='Run manage.py create_partitions (e.g. daily from cron).',
+                    id='authapp.W003',
+                ))
+    return messages
+
+
+@register(Tags.database)
+def check_archive_views(app_configs, databases=None, **kwargs):
+    """
+    Warn when a live-plus-archive view (authapp.archive) is missing or no
+    longer has its model's columns, e.g. after a migration changed the jobs
+    table without recreating it. Databases that have not reached the
+    migration creating the views yet (``migrate`` runs its checks before
+    migrating) are skipped.
+    """
+    messages = []
+    for alias in databases or ():
+        try:
+            if ARCHIVE_VIEWS_MIGRATION not in MigrationRecorder(connections[alias]).applied_migrations():
+                continue
+            stale = archive.stale_views(connections[alias])
+        except DatabaseError:
+            continue
+        for view, reason in stale:
+            messages.append(Warning(
+                f"Database '{alias}': view {view} is {reason}.",
+                hint='Recreate it with a migration running authapp.archive.create_views.',
+                id='authapp.W004',
+            ))
+    return messages
@@ -0,0 +1,300 @@
+"""
+Near-duplicate clustering of job descriptions (MinHash + LSH).
+
+The same role posted on several platforms arrives with slightly different
+``job_description`` text. :func:`cluster_descriptions` groups such jobs and
+stores the job_id of each group's oldest job in ``JobApplication.cluster_id``
+(NULL for jobs without a near-duplicate), which is what the job list's
+``?collapse=clusters`` option reads.
+
+Creating a job or changing its description clears its ``cluster_id``
+(authapp.signals) and, with the task queue enabled, queues a clustering run
+for the end of the current ``CLUSTER_WINDOW_SECONDS`` window
+(:func:`schedule_clustering`). Without a worker, run ``manage.py
+cluster_job_descriptions`` periodically instead.
+
+Every step after reading the text is vectorized with NumPy:
+
+* descriptions are normalized like the dedup fingerprint and split into
+  overlapping 3-word shingles, hashed per batch over one concatenated byte
+  array (no per-word Python);
+* each description gets a ``NUM_PERM``-value MinHash signature;
+* signatures are cut into ``BANDS`` bands and bucketed by band hash;
+  candidates that share a bucket are kept when their signatures agree on at
+  least ``threshold`` of the values (the estimated Jaccard similarity);
+* connected components are found by min-label propagation.
+
+Memory is dominated by the signatures, ``NUM_PERM * 4`` bytes per
+description (256MB for a million).
+
+NumPy is optional for the rest of the project; without it clustering is
+unavailable and the stored cluster ids are simply left as they are.
+"""
+import logging
+import time
+
+from django.db.models import Max, Q
+
+from backend.startup import optional_import
+
+from . import tasks
+from .dedup import normalize_text
+from .models import JobApplication
+
+# NumPy, imported by available(): only recomputing clusters needs it
+np = None
+
+logger = logging.getLogger(__name__)
+
+NUM_PERM = 64
+BANDS = 16
+SHINGLE_WORDS = 3
+# Descriptions shorter than this carry too little text to compare
+MIN_WORDS = 8
+DEFAULT_THRESHOLD = 0.8
+DOC_BATCH = 500
+SEED = 1
+# Writes within one window share a single clustering run
+CLUSTER_WINDOW_SECONDS = 300
+
+_BASE = 0x100000001B3
+_SHINGLE_MULTIPLIERS = (0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F)
+
+
+def available():
+    global np
+    np = optional_import('numpy')
+    return np is not None
+
+
+def _mix(x):
+    """splitmix64 finalizer, in place on a uint64 array."""
+    x ^= x >> np.uint64(30)
+    x *= np.uint64(0xBF58476D1CE4E5B9)
+    x ^= x >> np.uint64(27)
+    x *= np.uint64(0x94D049BB133111EB)
+    x ^= x >> np.uint64(31)
+    return x
+
+
+class _Hasher:
+    """Word hashing and MinHash permutations, shared by every batch."""
+
+    def __init__(self, num_perm=NUM_PERM, seed=SEED):
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: odd multipliers, top 32 bits of a*x + b
+        self.a = (rng.integers(0, 1 << 63, num_perm, dtype=np.uint64) << np.uint64(1)) | np.uint64(1)
+        self.b = rng.integers(0, 1 << 63, num_perm, dtype=np.uint64)
+        self.powers = np.zeros(0, dtype=np.uint64)
+        self.inverse_powers = np.zeros(0, dtype=np.uint64)
+
+    def _power_tables(self, size):
+        if len(self.powers) < size:
+            size = max(size, 2 * len(self.powers))
+            self.powers = np.cumprod(np.full(size, _BASE, dtype=np.uint64))
+            self.powers = np.concatenate(([np.uint64(1)], self.powers[:-1]))
+            inverse = pow(_BASE, -1, 1 << 64)
+            self.inverse_powers = np.cumprod(np.full(size, inverse, dtype=np.uint64))
+            self.inverse_powers = np.concatenate(([np.uint64(1)], self.inverse_powers[:-1]))
+        return self.powers[:size], self.inverse_powers[:size]
+
+    def shingles(self, texts):
+        """
+        Shingle hashes of normalized ``texts`` and, per text, the index of
+        its first shingle (texts without shingles get the next text's).
+        """
+        data = ' '.join(texts).encode('utf-8')
+        chars = np.frombuffer(data, dtype=np.uint8)
+        if not len(chars):
+            return np.zeros(0, dtype=np.uint64), np.zeros(len(texts), dtype=np.int64)
+
+        # Word spans: a word starts after a space (or at 0) and ends before one
+        in_word = np.concatenate(([0], (chars != 0x20).astype(np.int8), [0]))
+        edges = np.diff(in_word)
+        starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+        # Position-independent polynomial hash of each word: prefix sums of
+        # c[j] * B**j, shifted back by B**-start (B is odd, so invertible mod 2**64)
+        powers, inverse_powers = self._power_tables(len(chars) + 1)
+        weighted = np.zeros(len(chars) + 1, dtype=np.uint64)
+        np.cumsum((chars.astype(np.uint64) + np.uint64(1)) * powers[:len(chars)], out=weighted[1:])
+        words = _mix((weighted[ends] - weighted[starts]) * inverse_powers[starts])
+
+        # Text each word belongs to, from the byte offset each text starts at
+        lengths = np.fromiter((len(text.encode('utf-8')) + 1 for text in texts), dtype=np.int64, count=len(texts))
+        text_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        owner = np.searchsorted(text_starts, starts, side='right') - 1
+
+        # A shingle starts at every word whose text has SHINGLE_WORDS - 1 more words
+        span = SHINGLE_WORDS - 1
+        count = max(len(words) - span, 0)
+        keep = owner[:count] == owner[span:span + count]
+        shingles = words[:count].copy()
+        for offset, multiplier in zip(range(1, SHINGLE_WORDS), _SHINGLE_MULTIPLIERS):
+            shingles *= np.uint64(multiplier)
+            shingles += words[offset:offset + count]
+        shingles = _mix(shingles[keep])
+        first = np.searchsorted(owner[:count][keep], np.arange(len(texts)))
+        return shingles, first
+
+    def signatures(self, texts):
+        """(len(texts), NUM_PERM) uint32 MinHash signatures; rows of texts without shingles are all max."""
+        shingles, first = self.shingles(texts)
+        signatures = np.full((len(texts), len(self.a)), np.iinfo(np.uint32).max, dtype=np.uint32)
+        counts = np.diff(np.concatenate((first, [len(shingles)])))
+        present = np.flatnonzero(counts > 0)
+        if not len(present):
+            return signatures
+        hashed = (self.a[:, None] * shingles[None, :] + self.b[:, None]) >> np.uint64(32)
+        signatures[present] = np.minimum.reduceat(hashed, first[present], axis=1).T.astype(np.uint32)
+        return signatures
+
+
+def compute_signatures(rows, batch_size=DOC_BATCH):
+    """
+    Signatures of ``(job_id, description)`` rows. Returns ``(job_ids,
+    signatures)`` for the descriptions long enough to compare.
+    """
+    hasher = _Hasher()
+    job_ids, blocks = [], []
+    batch_ids, batch_texts = [], []
+
+    def flush():
+        if batch_texts:
+            job_ids.extend(batch_ids)
+            blocks.append(hasher.signatures(batch_texts))
+            batch_ids.clear()
+            batch_texts.clear()
+
+    for job_id, description in rows:
+        text = normalize_text(description)
+        if text.count(' ') + 1 < MIN_WORDS:
+            continue
+        batch_ids.append(job_id)
+        batch_texts.append(text)
+        if len(batch_texts) >= batch_size:
+            flush()
+    flush()
+
+    if not blocks:
+        return np.zeros(0, dtype=np.int64), np.zeros((0, NUM_PERM), dtype=np.uint32)
+    return np.asarray(job_ids, dtype=np.int64), np.concatenate(blocks)
+
+
+def candidate_pairs(signatures, bands=BANDS, threshold=DEFAULT_THRESHOLD, chunk=200_000):
+    """
+    Index pairs that share an LSH bucket in some band and whose signatures
+    agree on at least ``threshold`` of their values.
+    """
+    count, num_perm = signatures.shape
+    rows = num_perm // bands
+    pairs = []
+    for band in range(bands):
+        keys = np.zeros(count, dtype=np.uint64)
+        for column in signatures[:, band * rows:(band + 1) * rows].T:
+            keys *= np.uint64(_BASE)
+            keys += column.astype(np.uint64)
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        run_start = np.concatenate(([True], sorted_keys[1:] != sorted_keys[:-1]))
+        # Every bucket member is compared with the bucket's first member
+        first = np.flatnonzero(run_start)[np.cumsum(run_start) - 1]
+        members = np.flatnonzero(~run_start)
+        if not len(members):
+            continue
+        left, right = order[members], order[first[members]]
+        for start in range(0, len(left), chunk):
+            a, b = left[start:start + chunk], right[start:start + chunk]
+            similar = (signatures[a] == signatures[b]).mean(axis=1) >= threshold
+            pairs.append(np.stack((a[similar], b[similar]), axis=1))
+    if not pairs:
+        return np.zeros((0, 2), dtype=np.int64)
+    return np.unique(np.concatenate(pairs), axis=0)
+
+
+def connected_labels(count, pairs):
+    """Smallest member index of each index's component."""
+    labels = np.arange(count)
+    if not len(pairs):
+        return labels
+    a, b = pairs[:, 0], pairs[:, 1]
+    while True:
+        low = np.minimum(labels[a], labels[b])
+        updated = labels.copy()
+        np.minimum.at(updated, a, low)
+        np.minimum.at(updated, b, low)
+        # Pointer jumping until every label points at a root
+        while True:
+            jumped = updated[updated]
+            if np.array_equal(jumped, updated):
+                break
+            updated = jumped
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+def find_clusters(rows, threshold=DEFAULT_THRESHOLD, bands=BANDS, batch_size=DOC_BATCH):
+    """
+    {job_id: cluster_id} for every job with at least one near-duplicate;
+    ``rows`` are ``(job_id, description)`` in ascending job_id order, so a
+    cluster's id is its oldest job.
+    """
+    job_ids, signatures = compute_signatures(rows, batch_size)
+    labels = connected_labels(len(job_ids), candidate_pairs(signatures, bands, threshold))
+    sizes = np.bincount(labels, minlength=len(job_ids))
+    clustered = np.flatnonzero(sizes[labels] > 1)
+    return dict(zip(job_ids[clustered].tolist(), job_ids[labels[clustered]].tolist()))
+
+
+def cluster_descriptions(threshold=DEFAULT_THRESHOLD, bands=BANDS, batch_size=DOC_BATCH, dry_run=False):
+    """
+    Recompute ``cluster_id`` for every job. Returns ``(clusters, clustered
+    jobs, rows changed)``. Rows are written with ``bulk_update`` so neither
+    ``updated_at`` nor the save signals are touched.
+    """
+    if not available():
+        raise RuntimeError('NumPy is required to cluster job descriptions.')
+
+    jobs = JobApplication.objects.order_by('job_id')
+    rows = jobs.exclude(job_description=None).values_list('job_id', 'job_description')
+    assignments = find_clusters(rows.iterator(chunk_size=2000), threshold, bands, batch_size)
+    clusters = len(set(assignments.values()))
+
+    changed = []
+    for job_id, current in jobs.values_list('job_id', 'cluster_id').iterator(chunk_size=10000):
+        cluster_id = assignments.get(job_id)
+        if cluster_id != current:
+            changed.append(JobApplication(job_id=job_id, cluster_id=cluster_id))
+    if not dry_run and changed:
+        JobApplication.objects.bulk_update(changed, ['cluster_id'], batch_size=1000)
+    logger.info("Clustered %d jobs into %d clusters, %d rows changed", len(assignments), clusters, len(changed))
+    return clusters, len(assignments), len(changed)
+
+
+@tasks.task(name='cluster_job_descriptions', max_attempts=3)
+def cluster_descriptions_task():
+    if not available():
+        logger.warning("NumPy is not installed on the task worker; job descriptions were not clustered")
+        return
+    cluster_descriptions()
+
+
+def schedule_clustering():
+    """Queue a clustering run at the end of the current window; None without a task worker."""
+    if not tasks.enabled():
+        return None
+    delay = CLUSTER_WINDOW_SECONDS - time.time() % CLUSTER_WINDOW_SECONDS
+    return tasks.enqueue(
+        'cluster_job_descriptions',
+        idempotency_key=tasks.window_key('cluster_job_descriptions', CLUSTER_WINDOW_SECONDS), delay=delay,
+    )
+
+
+def collapse_clusters(queryset):
+    """Keep only the newest job of each cluster among ``queryset``'s rows."""
+    newest = (
+        queryset.order_by().filter(cluster_id__isnull=False)
+        .values('cluster_id').annotate(keep=Max('job_id')).values('keep')
+    )
+    return queryset.filter(Q(cluster_id__isnull=True) | Q(job_id__in=newest))
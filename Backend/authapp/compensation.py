@@ -0,0 +1,307 @@
+"""
+Numeric salaries and rates.
+
+``Developer_data.Salary``, ``BD.salary`` and ``JobApplication.salary_range``
+are free text ("80k-100k", "$50/hr", "PKR 150,000 per month"). On every save
+a pre_save signal (authapp.signals) parses the text into
+
+* ``salary_min`` / ``salary_max``: the amounts as quoted (``salary_max`` is
+  NULL for open-ended figures such as "80k+");
+* ``salary_currency``: ISO code, '' when the text names none;
+* ``salary_period``: hour, day, week, month or year.
+
+Nothing is converted between currencies or periods; those would need
+exchange rates and working-time assumptions the data does not carry.
+Range filters and statistics therefore work within one period (``year``
+unless the request says otherwise), and statistics are reported per
+currency. The columns are indexed as (period, currency, amount).
+
+Text the parser cannot read leaves the columns NULL. After changing the
+parsing rules, re-run ``manage.py backfill_salaries``.
+"""
+import re
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import NamedTuple, Optional
+
+from django.conf import settings
+from django.db.models import Avg, Count, Max, Min, Q
+
+from .models import BD, Developer_data, JobApplication
+
+PERIODS = ('hour', 'day', 'week', 'month', 'year')
+
+# Source name -> (model, free-text field, skills field, experience field)
+SOURCES = {
+    'developers': (Developer_data, 'Salary', 'technicalSkills', 'experience'),
+    'bds': (BD, 'salary', None, 'experience'),
+    'jobs': (JobApplication, 'salary_range', 'skills', 'experience_level'),
+}
+GROUP_BY = ('skill', 'location', 'experience')
+RANGE_PARAMS = ('min_salary', 'max_salary')
+
+SALARY_FIELDS = ['salary_min', 'salary_max', 'salary_currency', 'salary_period']
+CENTS = Decimal('0.01')
+# Largest amount the DecimalField(max_digits=14, decimal_places=2) columns hold
+MAX_AMOUNT = Decimal('999999999999.99')
+
+# Figures below this with no period in the text are read as hourly rates
+HOURLY_BELOW = Decimal(1000)
+
+
+class Salary(NamedTuple):
+    min: Optional[Decimal] = None
+    max: Optional[Decimal] = None
+    currency: str = ''
+    period: Optional[str] = None
+
+
+UNPARSED = Salary()
+
+# -------- Parsing --------
+_CURRENCY_SYMBOLS = (('us$', 'USD'), ('$', 'USD'), ('€', 'EUR'), ('£', 'GBP'), ('₹', 'INR'))
+_CURRENCY_WORDS = {
+    'usd': 'USD', 'dollar': 'USD', 'dollars': 'USD',
+    'eur': 'EUR', 'euro': 'EUR', 'euros': 'EUR',
+    'gbp': 'GBP', 'inr': 'INR', 'cad': 'CAD', 'aud': 'AUD', 'aed': 'AED', 'sar': 'SAR',
+    # The business is based in Pakistan; bare "Rs" means rupees there
+    'pkr': 'PKR', 'rs': 'PKR', 'rupees': 'PKR',
+}
+_PERIOD_PATTERNS = (
+    ('hour', r'/\s*h(?:ou)?r?s?\b|\bper\s+h(?:ou)?r\b|\bhourly\b|\bp/?h\b|\ban?\s+hour\b'),
+    ('day', r'/\s*d(?:ay)?\b|\bper\s+day\b|\bdaily\b|\ba\s+day\b'),
+    ('week', r'/\s*w(?:ee)?k\b|\bper\s+week\b|\bweekly\b|\ba\s+week\b'),
+    ('month', r'/\s*mo(?:nth)?s?\b|\bper\s+month\b|\bmonthly\b|\bp\.?m\.?(?=\s|$)|\ba\s+month\b'),
+    ('year', r'/\s*(?:yr|year|annum)\b|\bper\s+(?:year|annum)\b|\b(?:yearly|annual|annually)\b|\bp\.?a\.?(?=\s|$)|\ba\s+year\b|\d\s*lpa\b'),
+)
+_PERIODS = [(period, re.compile(pattern)) for period, pattern in _PERIOD_PATTERNS]
+_MULTIPLIERS = {
+    'k': 1000, 'm': 1000000, 'mn': 1000000, 'million': 1000000,
+    'l': 100000, 'lac': 100000, 'lacs': 100000, 'lakh': 100000, 'lakhs': 100000,
+    # "lakh per annum"; the year comes from the period patterns
+    'lpa': 100000,
+}
+_AMOUNT = re.compile(r'(\d+(?:[.,]\d+)*)\s*(million|lakhs?|lacs?|lpa|mn|k|m|l)?(?![a-z])')
+# "2,50,000", "1,00,00,000.50": Indian grouping, pairs of digits before the last three
+_LAKH_GROUPED = re.compile(r'\d{1,2}(?:,\d{2})+,\d{3}(?:\.\d{1,2})?')
+_WORD = re.compile(r'[a-z]+')
+
+
+def _number(digits):
+    """Decimal for '80,000', '2,50,000', '1.5', '1,5', '120,000.00' or '1.234,5'; None when malformed."""
+    if _LAKH_GROUPED.fullmatch(digits):
+        digits = digits.replace(',', '')
+    groups = re.split(r'[.,]', digits)
+    separators = re.findall(r'[.,]', digits)
+    if len(groups) == 1:
+        pass
+    elif all(len(group) == 3 for group in groups[1:]):
+        digits = ''.join(groups)  # thousands separators
+    elif len(groups) == 2:
+        digits = f'{groups[0]}.{groups[1]}'
+    elif (
+        all(len(group) == 3 for group in groups[1:-1]) and len(groups[-1]) <= 2
+        and len(set(separators[:-1])) == 1 and separators[-1] != separators[0]
+    ):
+        digits = f"{''.join(groups[:-1])}.{groups[-1]}"  # thousands separators and decimals
+    else:
+        return None
+    try:
+        return Decimal(digits)
+    except InvalidOperation:
+        return None
+
+
+def _currency(text):
+    for symbol, code in _CURRENCY_SYMBOLS:
+        if symbol in text:
+            return code
+    for word in _WORD.findall(text):
+        if word in _CURRENCY_WORDS:
+            return _CURRENCY_WORDS[word]
+    return getattr(settings, 'SALARY_DEFAULT_CURRENCY', '')
+
+
+def parse_salary(text):
+    """Parse a free-text salary or rate into a ``Salary``; ``UNPARSED`` when it holds no amount."""
+    if not text:
+        return UNPARSED
+    text = str(text).casefold().replace('–', '-').replace('—', '-')
+    amounts = []
+    for match in _AMOUNT.finditer(text):
+        value = _number(match.group(1))
+        if value is not None:
+            amounts.append((value, _MULTIPLIERS.get(match.group(2))))
+        if len(amounts) == 2:
+            break
+    if not amounts:
+        return UNPARSED
+
+    low, low_multiplier = amounts[0]
+    if len(amounts) == 2:
+        high, high_multiplier = amounts[1]
+        # "80-100k": the second figure's multiplier applies to both
+        if low_multiplier is None and high_multiplier is not None and low < high:
+            low_multiplier = high_multiplier
+        high *= high_multiplier or 1
+    low *= low_multiplier or 1
+    if len(amounts) == 2:
+        low, high = min(low, high), max(low, high)
+    elif re.search(r'\d\s*[a-z]*\s*\+', text):
+        high = None  # "80k+"
+    else:
+        high = low
+    if low > MAX_AMOUNT or (high is not None and high > MAX_AMOUNT):
+        return UNPARSED
+
+    period = next((name for name, pattern in _PERIODS if pattern.search(text)), None)
+    if period is None:
+        period = 'hour' if (high or low) < HOURLY_BELOW else getattr(settings, 'SALARY_DEFAULT_PERIOD', 'year')
+    return Salary(
+        low.quantize(CENTS, ROUND_HALF_UP),
+        None if high is None else high.quantize(CENTS, ROUND_HALF_UP),
+        _currency(text),
+        period,
+    )
+
+
+def salary_values(salary):
+    return dict(zip(SALARY_FIELDS, salary))
+
+
+def fill_salary_fields(instance, text):
+    for name, value in salary_values(parse_salary(text)).items():
+        setattr(instance, name, value)
+
+
+def backfill(source, batch_size=2000):
+    """Re-parse every row of ``source``; returns the number of rows whose columns changed."""
+    model, text_field, _, _ = SOURCES[source]
+    rows = model.objects.order_by('pk').values_list('pk', text_field, *SALARY_FIELDS)
+    # Salary texts repeat a lot, so rows are updated per distinct parse
+    # result rather than one CASE expression per row
+    changes = defaultdict(list)
+    for pk, text, *stored in rows.iterator(chunk_size=batch_size):
+        salary = parse_salary(text)
+        if salary != tuple(stored):
+            changes[salary].append(pk)
+    updated = 0
+    for salary, pks in changes.items():
+        for start in range(0, len(pks), batch_size):
+            updated += model.objects.filter(pk__in=pks[start:start + batch_size]).update(**salary_values(salary))
+    return updated
+
+
+# -------- Range filters --------
+def salary_range_params(params):
+    """
+    ``{'min': ..., 'max': ..., 'period': ..., 'currency': ...}`` from
+    ?min_salary=, ?max_salary=, ?salary_period= and ?currency=, or None when
+    no range was asked for. Raises ValueError for malformed values.
+    """
+    bounds = {}
+    for name, key in (('min_salary', 'min'), ('max_salary', 'max')):
+        value = params.get(name)
+        if value in (None, ''):
+            continue
+        try:
+            bounds[key] = Decimal(value)
+        except InvalidOperation:
+            raise ValueError(f"'{name}' must be a number.")
+        if not bounds[key].is_finite() or bounds[key] < 0:
+            raise ValueError(f"'{name}' must be a non-negative number.")
+    if not bounds:
+        return None
+    period = params.get('salary_period') or 'year'
+    if period not in PERIODS:
+        raise ValueError(f"'salary_period' must be one of: {', '.join(PERIODS)}")
+    bounds['period'] = period
+    bounds['currency'] = (params.get('currency') or '').upper()
+    return bounds
+
+
+def filter_salary_range(queryset, salary_range):
+    """
+    Rows whose quoted range overlaps the requested one: ``min`` keeps rows
+    that pay at least that much at the top of their range (or are
+    open-ended), ``max`` rows that start at or below it.
+    """
+    if salary_range is None:
+        return queryset
+    queryset = queryset.filter(salary_period=salary_range['period'])
+    if salary_range['currency']:
+        queryset = queryset.filter(salary_currency=salary_range['currency'])
+    if 'min' in salary_range:
+        queryset = queryset.filter(
+            Q(salary_max__gte=salary_range['min']) | Q(salary_max=None, salary_min__isnull=False)
+        )
+    if 'max' in salary_range:
+        queryset = queryset.filter(salary_min__lte=salary_range['max'])
+    return queryset
+
+
+# -------- Statistics --------
+def _money(value):
+    return None if value is None else str(Decimal(value).quantize(CENTS, ROUND_HALF_UP))
+
+
+def _stats_row(group, currency, count, average_min, average_max, lowest, highest):
+    return {
+        'group': group,
+        'currency': currency or None,
+        'count': count,
+        'average_min': _money(average_min),
+        'average_max': _money(average_max),
+        'lowest': _money(lowest),
+        'highest': _money(highest),
+    }
+
+
+def compensation_stats(source, group_by, period='year', currency=''):
+    """
+    Salary statistics of ``source`` rows quoted per ``period``, per group and
+    currency. Location and experience are aggregated in the database; skills
+    live in a JSON list, so those rows are streamed and summed here.
+    """
+    model, _, skills_field, experience_field = SOURCES[source]
+    queryset = model.objects.order_by().filter(salary_period=period, salary_min__isnull=False)
+    if currency:
+        queryset = queryset.filter(salary_currency=currency.upper())
+
+    if group_by != 'skill':
+        column = 'location' if group_by == 'location' else experience_field
+        rows = (
+            queryset.values(column, 'salary_currency')
+            .annotate(
+                count=Count('pk'), average_min=Avg('salary_min'), average_max=Avg('salary_max'),
+                lowest=Min('salary_min'), highest=Max('salary_max'),
+            )
+            .order_by('-count', column, 'salary_currency')
+        )
+        return [
+            _stats_row(row[column], row['salary_currency'], row['count'], row['average_min'],
+                       row['average_max'], row['lowest'], row['highest'])
+            for row in rows
+        ]
+
+    # Per (skill, currency): count, sum of mins, count/sum of maxes, lowest, highest
+    totals = defaultdict(lambda: [0, Decimal(0), 0, Decimal(0), None, None])
+    values = queryset.values_list(skills_field, 'salary_currency', 'salary_min', 'salary_max')
+    for skills, row_currency, low, high in values.iterator(chunk_size=2000):
+        if not isinstance(skills, list):
+            continue
+        for skill in {skill.strip() for skill in skills if isinstance(skill, str) and skill.strip()}:
+            total = totals[skill, row_currency]
+            total[0] += 1
+            total[1] += low
+            if high is not None:
+                total[2] += 1
+                total[3] += high
+                total[5] = high if total[5] is None else max(total[5], high)
+            total[4] = low if total[4] is None else min(total[4], low)
+    rows = [
+        _stats_row(skill, row_currency, count, min_sum / count, max_sum / max_count if max_count else None, lowest, highest)
+        for (skill, row_currency), (count, min_sum, max_count, max_sum, lowest, highest) in totals.items()
+    ]
+    rows.sort(key=lambda row: (-row['count'], row['group'], row['currency'] or ''))
+    return rows
@@ -0,0 +1,244 @@
+"""
+Duplicate job-lead detection.
+
+Every job carries ``dedup_fingerprint``, a hash of its canonical URL and
+case-folded company and title, filled in on save (authapp.signals). The
+``(bd_id, dedup_fingerprint)`` index turns the duplicate check on create into
+a single index probe; :func:`save_new_job` runs it under a lock on the BD row
+so two concurrent creates of the same posting cannot both get through.
+
+What happens to a duplicate is set by ``JOB_DEDUP_POLICY``:
+
+* ``reject`` - nothing is saved, the existing job is reported back;
+* ``merge``  - blank fields of the existing job are filled in from the new
+  one and its skills are added;
+* ``allow``  - the job is created anyway.
+
+Existing duplicates are collapsed with the ``collapse_duplicate_jobs``
+command.
+"""
+import hashlib
+import re
+import unicodedata
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+
+from .compensation import SALARY_FIELDS
+from .models import BD, InterviewSchedule, JobApplication
+from .workflow import PIPELINE
+
+POLICIES = ('reject', 'merge', 'allow')
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = frozenset({
+    'gclid', 'fbclid', 'msclkid', 'dclid', 'mc_cid', 'mc_eid', '_hsenc', '_hsmi',
+    'ref', 'refid', 'ref_src', 'referrer', 'src', 'source', 'from',
+    'trk', 'trkinfo', 'trackingid', 'tracking_id', 'lipi', 'gh_src',
+    'vjs', 'tk', 'sid', 'session_id',
+})
+TRACKING_PREFIXES = ('utm_',)
+
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+# Fields a merge fills in when they are blank on the existing job
+MERGE_FIELDS = (
+    'location', 'salary_range', 'job_type', 'experience_level', 'job_url',
+    'job_description', 'key_requirements', 'personal_notes',
+)
+
+_NON_WORD = re.compile(r'[\W_]+')
+# ASCII fast path of _NON_WORD: everything but letters and digits -> space
+_ASCII_NON_WORD = str.maketrans({
+    chr(code): ' ' for code in range(128) if not chr(code).isalnum()
+})
+
+
+def dedup_policy(override=None):
+    policy = override or getattr(settings, 'JOB_DEDUP_POLICY', 'reject')
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown duplicate policy '{policy}'. Must be one of: {', '.join(POLICIES)}")
+    return policy
+
+
+def normalize_text(value):
+    """Case-folded words only: 'Acme, Inc.' and 'ACME inc' compare equal."""
+    if not value:
+        return ''
+    if value.isascii():
+        return ' '.join(value.lower().translate(_ASCII_NON_WORD).split())
+    value = unicodedata.normalize('NFKC', value).casefold()
+    return _NON_WORD.sub(' ', value).strip()
+
+
+def canonical_url(url):
+    """
+    ``url`` without what varies between copies of one posting: scheme and host
+    case, ``www.``/``m.`` prefixes, default ports, fragments, trailing slashes,
+    tracking parameters and query parameter order.
+    """
+    if not url:
+        return ''
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip().casefold()
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    for prefix in ('www.', 'm.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if port is not None and str(port) != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{port}'
+
+    path = re.sub(r'/{2,}', '/', parts.path).rstrip('/')
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PREFIXES)
+    )
+    # The scheme is dropped: http and https copies are the same posting
+    return f'{host}{path}?{urlencode(query)}' if query else f'{host}{path}'
+
+
+def job_fingerprint(company, job_title, job_url):
+    key = '\x1f'.join((normalize_text(company), normalize_text(job_title), canonical_url(job_url)))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def fingerprint_of(job):
+    return job_fingerprint(job.company, job.job_title, job.job_url)
+
+
+def find_duplicate(bd_id, fingerprint, exclude_pk=None):
+    """The oldest job of ``bd_id`` with ``fingerprint``, or None."""
+    jobs = JobApplication.objects.filter(bd_id=bd_id, dedup_fingerprint=fingerprint)
+    if exclude_pk is not None:
+        jobs = jobs.exclude(pk=exclude_pk)
+    return jobs.order_by('job_id').first()
+
+
+def merge_into(target, values):
+    """
+    Fill the blank ``MERGE_FIELDS`` of ``target`` from ``values`` (a dict of
+    field values) and add skills it does not list yet. Returns the names of
+    the fields that changed; ``target`` is saved when there are any.
+    """
+    changed = []
+    for name in MERGE_FIELDS:
+        value = values.get(name)
+        if value and not getattr(target, name):
+            setattr(target, name, value)
+            changed.append(name)
+
+    skills = list(target.skills) if isinstance(target.skills, list) else []
+    known = {skill.casefold() for skill in skills}
+    added = [skill for skill in values.get('skills') or () if skill.casefold() not in known]
+    if added:
+        target.skills = skills + list(dict.fromkeys(added))
+        changed.append('skills')
+
+    if changed:
+        derived = ['dedup_fingerprint', 'updated_at']
+        if 'salary_range' in changed:
+            derived += SALARY_FIELDS
+        target.save(update_fields=changed + derived)
+    return changed
+
+
+def save_new_job(serializer, policy=None):
+    """
+    Save a validated ``JobApplicationSerializer`` unless it duplicates an
+    existing job of the same BD. Returns ``(job, outcome)`` where outcome is
+    ``'created'``, ``'merged'`` (job is the existing one, updated) or
+    ``'duplicate'`` (job is the existing one, nothing saved).
+    """
+    policy = dedup_policy(policy)
+    if policy == 'allow':
+        return serializer.save(), 'created'
+
+    data = serializer.validated_data
+    bd = data['bd_id']
+    fingerprint = job_fingerprint(data.get('company'), data.get('job_title'), data.get('job_url'))
+    with transaction.atomic():
+        # Serializes creates per BD, so the lookup below cannot race an insert
+        list(BD.objects.select_for_update().filter(pk=bd.pk).values_list('pk', flat=True))
+        existing = find_duplicate(bd.pk, fingerprint)
+        if existing is None:
+            return serializer.save(), 'created'
+        if policy == 'merge':
+            merge_into(existing, data)
+            return existing, 'merged'
+        return existing, 'duplicate'
+
+
+# -------- Batch collapse --------
+def duplicate_groups():
+    """``(bd_id, fingerprint, count)`` for every fingerprint held by more than one job of a BD."""
+    return (
+        JobApplication.objects.order_by()
+        .exclude(dedup_fingerprint='')
+        .values_list('bd_id', 'dedup_fingerprint')
+        .annotate(n=Count('pk'))
+        .filter(n__gt=1)
+    )
+
+
+def _survivor_rank(job):
+    # Keep the copy furthest along the pipeline, the oldest one on ties
+    position = PIPELINE.index(job.application_status) if job.application_status in PIPELINE else -1
+    return (-position, job.created_at, job.job_id)
+
+
+def collapse_group(bd_id, fingerprint, dry_run=False):
+    """
+    Merge every job of ``bd_id`` with ``fingerprint`` into one and delete the
+    rest; their interviews move to the survivor. The status log is
+    append-only: the removed jobs' transitions are kept as for any deleted
+    job, and the survivor's history stays its own. Returns
+    ``(survivor_id, [removed ids])``.
+    """
+    with transaction.atomic():
+        jobs = list(
+            JobApplication.objects.select_for_update()
+            .filter(bd_id=bd_id, dedup_fingerprint=fingerprint)
+            .order_by('job_id')
+        )
+        if len(jobs) < 2:
+            return (jobs[0].job_id if jobs else None), []
+        jobs.sort(key=_survivor_rank)
+        survivor, duplicates = jobs[0], jobs[1:]
+        removed = [job.job_id for job in duplicates]
+        if not dry_run:
+            for job in duplicates:
+                merge_into(survivor, {name: getattr(job, name) for name in MERGE_FIELDS + ('skills',)})
+            # Before the delete, which would cascade to the interviews
+            InterviewSchedule.objects.filter(job_id__in=removed).update(job_id=survivor.job_id)
+            JobApplication.objects.filter(pk__in=removed).delete()
+        return survivor.job_id, removed
+
+
+def backfill_fingerprints(batch_size=2000, only_missing=True):
+    """Compute ``dedup_fingerprint`` for existing rows in primary key order. Returns the number updated."""
+    jobs = JobApplication.objects.order_by('job_id')
+    if only_missing:
+        jobs = jobs.filter(dedup_fingerprint='')
+    jobs = jobs.only('job_id', 'company', 'job_title', 'job_url', 'dedup_fingerprint')
+
+    updated = 0
+    batch = []
+    for job in jobs.iterator(chunk_size=batch_size):
+        fingerprint = fingerprint_of(job)
+        if fingerprint != job.dedup_fingerprint:
+            job.dedup_fingerprint = fingerprint
+            batch.append(job)
+        if len(batch) >= batch_size:
+            updated += JobApplication.objects.bulk_update(batch, ['dedup_fingerprint'])
+            batch = []
+    if batch:
+        updated += JobApplication.objects.bulk_update(batch, ['dedup_fingerprint'])
+    return updated
@@ -0,0 +1,54 @@
+"""
+Experience as numbers.
+
+``Developer_data.experience`` and ``BD.experience`` hold labels such as
+'3-5 years' or '5+ years'. Each row also stores the label's bounds in
+``experience_min_years`` / ``experience_max_years`` (NULL max for open-ended
+labels), filled by a pre_save signal (authapp.signals), so range filters use
+an index instead of matching labels:
+
+* ``?min_experience=N``: at least N years, i.e. ``experience_min_years >= N``;
+* ``?max_experience=N``: at most N years, i.e. ``experience_max_years <= N``
+  ('5+ years' never qualifies).
+"""
+import re
+
+_LABEL = re.compile(r'^\s*(\d+)\s*(?:(\+)|-\s*(\d+))?\s*(?:years?|yrs?)?\s*$', re.IGNORECASE)
+
+
+def experience_years(label):
+    """(min_years, max_years) for an experience label; max is None when open-ended, both None when unparseable."""
+    match = _LABEL.match(label or '')
+    if match is None:
+        return None, None
+    low = int(match.group(1))
+    if match.group(2):
+        return low, None
+    if match.group(3):
+        return low, max(low, int(match.group(3)))
+    return low, low
+
+
+def experience_range_params(params):
+    """
+    ``(min_experience, max_experience)`` from query params, None where absent.
+    Raises ValueError for anything but a non-negative whole number.
+    """
+    bounds = []
+    for name in ('min_experience', 'max_experience'):
+        value = params.get(name)
+        if value in (None, ''):
+            bounds.append(None)
+            continue
+        if not (value.strip().isascii() and value.strip().isdigit()):
+            raise ValueError(f"'{name}' must be a non-negative whole number of years.")
+        bounds.append(int(value))
+    return tuple(bounds)
+
+
+def filter_experience_range(queryset, min_years=None, max_years=None):
+    if min_years is not None:
+        queryset = queryset.filter(experience_min_years__gte=min_years)
+    if max_years is not None:
+        queryset = queryset.filter(experience_max_years__lte=max_years)
+    return queryset
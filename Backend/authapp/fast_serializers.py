@@ -0,0 +1,304 @@
+"""
+Compiled read-only serializers for list endpoints.
+
+DRF resolves every field of every row through ``get_attribute`` and
+``to_representation``, which dominates CPU time for large lists. A compiled
+serializer inspects the DRF serializer once, turns each field into a plain
+converter over a ``.values()`` row and then replays the serializer's
+``to_representation`` customizations. The output is identical to the DRF
+serializer's, key order included.
+"""
+from functools import lru_cache
+
+from django.conf import settings
+from rest_framework import serializers
+
+from .fieldsets import prune_fields, prune_queryset, prune_representation, resolve_fieldset
+from .models import BD, Developer_data
+from .serializers import (
+    BDSerializer,
+    DeveloperDataSerializer,
+    InterviewScheduleSerializer,
+    JobApplicationListSerializer,
+    use_display_fields,
+)
+
+
+def fast_serializers_enabled():
+    return getattr(settings, 'FAST_LIST_SERIALIZERS', False)
+
+
+def _as_str(value):
+    return value if type(value) is str else str(value)
+
+
+def _identity(value):
+    return value
+
+
+# Field classes whose representation is a cheap, context-free conversion.
+_SIMPLE_CONVERTERS = (
+    (serializers.ChoiceField, None),  # bound to_representation, see _converter
+    (serializers.CharField, _as_str),
+    (serializers.IntegerField, int),
+    (serializers.JSONField, _identity),
+    (serializers.BooleanField, bool),
+)
+
+
+def _converter(field):
+    for field_class, converter in _SIMPLE_CONVERTERS:
+        if isinstance(field, field_class):
+            return converter or field.to_representation
+    # Dates, times, decimals and anything else keep DRF's own formatting.
+    return field.to_representation
+
+
+class CompiledSerializer:
+    """
+    Flat row -> dict serializer compiled from ``serializer_class``.
+
+    Subclasses list the ``.values()`` paths their customizations need in
+    ``extra_values`` and implement ``computed_field`` for fields that are not
+    backed by a model column and ``finish`` for the extra keys the DRF
+    serializer adds in ``to_representation``.
+
+    With a ``fieldset`` (see :mod:`authapp.fieldsets`) only the requested
+    fields are read and emitted.
+    """
+
+    serializer_class = None
+    extra_values = ()
+
+    def __init__(self, fieldset=None):
+        serializer = self.serializer_class()
+        model = serializer.Meta.model
+        columns = {field.name for field in model._meta.concrete_fields}
+        self.fieldset = fieldset
+        self.plan = []
+        value_paths = []
+        for name, field in serializer.fields.items():
+            if field.write_only or (fieldset is not None and name not in fieldset):
+                continue
+            if field.source not in columns or isinstance(field, serializers.SerializerMethodField):
+                self.plan.append((name, None, None))
+                continue
+            value_paths.append(field.source)
+            if isinstance(field, serializers.RelatedField):
+                converter = _identity  # .values() already yields the raw key
+            else:
+                converter = _converter(field)
+            self.plan.append((name, field.source, converter))
+        self.value_paths = value_paths + [path for path in self.get_extra_values() if path not in value_paths]
+
+    def get_extra_values(self):
+        return list(self.extra_values)
+
+    def computed_field(self, name, row):
+        raise NotImplementedError(f'{type(self).__name__} does not compute {name!r}')
+
+    def prepare(self, rows):
+        """Hook to batch-load anything the rows are missing."""
+        return rows
+
+    def finish(self, row, representation):
+        return representation
+
+    def to_representation(self, row):
+        representation = {}
+        for name, source, converter in self.plan:
+            if source is None:
+                representation[name] = self.computed_field(name, row)
+            else:
+                value = row[source]
+                representation[name] = None if value is None else converter(value)
+        representation = self.finish(row, representation)
+        if self.fieldset is not None:
+            return prune_representation(representation, self.fieldset)
+        return representation
+
+    def serialize(self, queryset):
+        rows = self.prepare(list(queryset.values(*self.value_paths)))
+        to_representation = self.to_representation
+        return [to_representation(row) for row in rows]
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+class BDDisplayMixin:
+    """``bd_info`` from the denormalized columns or the joined BD row."""
+
+    def bd_value_paths(self):
+        if use_display_fields():
+            return ['bd_id', 'bd_display_name', 'bd_display_email']
+        return ['bd_id', 'bd_id__name', 'bd_id__email']
+
+    def fill_missing_bd_display(self, rows):
+        if not use_display_fields():
+            return rows
+        missing = {row['bd_id'] for row in rows if not row['bd_display_name']}
+        if missing:
+            bds = BD.objects.in_bulk(missing)
+            for row in rows:
+                if not row['bd_display_name']:
+                    row['bd_display_name'] = bds[row['bd_id']].name
+                    row['bd_display_email'] = bds[row['bd_id']].email
+        return rows
+
+    @staticmethod
+    def bd_info(row):
+        if 'bd_display_name' in row:
+            return {'bd_id': row['bd_id'], 'name': row['bd_display_name'], 'email': row['bd_display_email']}
+        return {'bd_id': row['bd_id'], 'name': row['bd_id__name'], 'email': row['bd_id__email']}
+
+
+class CompiledJobApplicationList(BDDisplayMixin, CompiledSerializer):
+    serializer_class = JobApplicationListSerializer
+
+    def get_extra_values(self):
+        return self.bd_value_paths() + ['skills', 'created_at', 'updated_at', 'applied_date']
+
+    def prepare(self, rows):
+        return self.fill_missing_bd_display(rows)
+
+    def computed_field(self, name, row):
+        if name == 'bd_name':
+            return self.bd_info(row)['name']
+        if name == 'skills_display':
+            skills = row['skills']
+            return ', '.join(skills) if isinstance(skills, list) else _as_str(skills or '')
+        return super().computed_field(name, row)
+
+    def finish(self, row, representation):
+        representation['bd_info'] = self.bd_info(row)
+        skills = row['skills']
+        if isinstance(skills, str):
+            representation['skills'] = [skills] if skills else []
+        elif isinstance(skills, list):
+            representation['skills'] = skills
+        else:
+            representation['skills'] = []
+        for name in ('created_at', 'updated_at', 'applied_date'):
+            if row[name]:
+                representation[name] = row[name].isoformat()
+        return representation
+
+
+class CompiledDeveloperData(CompiledSerializer):
+    serializer_class = DeveloperDataSerializer
+    extra_values = ('firstName', 'lastName', 'created_at', 'updated_at')
+
+    def finish(self, row, representation):
+        representation['full_name'] = f"{row['firstName']} {row['lastName']}"
+        representation['created_at'] = _isoformat(row['created_at'])
+        representation['updated_at'] = _isoformat(row['updated_at'])
+        return representation
+
+
+class CompiledBD(CompiledSerializer):
+    serializer_class = BDSerializer
+    extra_values = ('name', 'created_at', 'updated_at')
+
+    def finish(self, row, representation):
+        representation['full_name'] = row['name']
+        if row['created_at']:
+            representation['created_at'] = row['created_at'].isoformat()
+        if row['updated_at']:
+            representation['updated_at'] = row['updated_at'].isoformat()
+        representation.pop('password', None)
+        return representation
+
+
+class CompiledInterviewSchedule(BDDisplayMixin, CompiledSerializer):
+    serializer_class = InterviewScheduleSerializer
+
+    def get_extra_values(self):
+        if use_display_fields():
+            developer = ['dev_id', 'dev_display_name', 'dev_display_email', 'dev_display_title']
+        else:
+            developer = ['dev_id', 'dev_id__firstName', 'dev_id__lastName', 'dev_id__email', 'dev_id__professionalTitle']
+        return self.bd_value_paths() + developer
+
+    def prepare(self, rows):
+        rows = self.fill_missing_bd_display(rows)
+        if use_display_fields():
+            missing = {row['dev_id'] for row in rows if not row['dev_display_name']}
+            if missing:
+                developers = Developer_data.objects.in_bulk(missing)
+                for row in rows:
+                    if not row['dev_display_name']:
+                        developer = developers[row['dev_id']]
+                        row['dev_display_name'] = developer.full_name
+                        row['dev_display_email'] = developer.email
+                        row['dev_display_title'] = developer.professionalTitle
+        return rows
+
+    @staticmethod
+    def developer_info(row):
+        if 'dev_display_name' in row:
+            return {
+                'office_id': row['dev_id'],
+                'name': row['dev_display_name'],
+                'email': row['dev_display_email'],
+                'title': row['dev_display_title'],
+            }
+        return {
+            'office_id': row['dev_id'],
+            'name': f"{row['dev_id__firstName']} {row['dev_id__lastName']}",
+            'email': row['dev_id__email'],
+            'title': row['dev_id__professionalTitle'],
+        }
+
+    def computed_field(self, name, row):
+        if name == 'bd_name':
+            return self.bd_info(row)['name']
+        if name == 'developer_name':
+            return self.developer_info(row)['name']
+        return super().computed_field(name, row)
+
+    def finish(self, row, representation):
+        representation['bd_info'] = self.bd_info(row)
+        representation['developer_info'] = self.developer_info(row)
+        return representation
+
+
+COMPILED_SERIALIZERS = {
+    JobApplicationListSerializer: CompiledJobApplicationList,
+    DeveloperDataSerializer: CompiledDeveloperData,
+    BDSerializer: CompiledBD,
+    InterviewScheduleSerializer: CompiledInterviewSchedule,
+}
+
+def get_compiled(serializer_class, fieldset=None):
+    """Compiled serializer for ``serializer_class`` or None if there is none."""
+    compiled_class = COMPILED_SERIALIZERS.get(serializer_class)
+    if compiled_class is None:
+        return None
+    return _build_compiled(compiled_class, use_display_fields(), fieldset)
+
+
+@lru_cache(maxsize=256)
+def _build_compiled(compiled_class, display_fields, fieldset):
+    # display_fields is only part of the cache key: the value paths differ.
+    return compiled_class(fieldset)
+
+
+def serialize_list(queryset, serializer_class, fields=None):
+    """
+    Serialize a list queryset, through the compiled fast path when
+    ``FAST_LIST_SERIALIZERS`` is enabled and one exists for the class.
+
+    ``fields`` is the raw ``?fields=`` value; when it names known fields only
+    those columns are loaded and only those keys are returned.
+    """
+    fieldset = resolve_fieldset(serializer_class, fields)
+    if fast_serializers_enabled():
+        compiled = get_compiled(serializer_class, fieldset)
+        if compiled is not None:
+            return compiled.serialize(queryset)
+    serializer = prune_fields(serializer_class(prune_queryset(queryset, serializer_class, fieldset), many=True), fieldset)
+    if fieldset is None:
+        return serializer.data
+    return [prune_representation(row, fieldset) for row in serializer.data]
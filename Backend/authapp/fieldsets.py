@@ -0,0 +1,133 @@
+"""
+Sparse fieldsets for list endpoints: ``?fields=job_id,job_title,company``.
+
+Requested names are matched against the keys a list serializer outputs.
+Unknown names are ignored and a request that names no known key gets the
+full representation. The queryset is narrowed with ``.only()`` so unrequested
+columns are neither fetched nor serialized; the columns a serializer's
+``to_representation`` reads on every row are always loaded, otherwise each
+row would trigger a deferred-field query.
+"""
+from functools import lru_cache
+
+from rest_framework import serializers
+
+from .serializers import (
+    BDSerializer,
+    ClientSerializer,
+    DeveloperDataSerializer,
+    InterviewScheduleSerializer,
+    JobApplicationListSerializer,
+    use_display_fields,
+)
+
+BD_DISPLAY_COLUMNS = ('bd_display_name', 'bd_display_email')
+DEVELOPER_DISPLAY_COLUMNS = ('dev_display_name', 'dev_display_email', 'dev_display_title')
+BD_RELATED_COLUMNS = ('name', 'email')
+DEVELOPER_RELATED_COLUMNS = ('firstName', 'lastName', 'email', 'professionalTitle')
+
+# Per serializer:
+#   extra    - keys to_representation adds on top of the declared fields
+#   columns  - model columns to_representation reads on every row
+#   display  - denormalized columns read when DENORMALIZED_DISPLAY_FIELDS is on
+#   related  - columns read from select_related() rows, by relation
+FIELDSET_RULES = {
+    JobApplicationListSerializer: {
+        'extra': ('bd_info',),
+        'columns': ('bd_id', 'skills', 'created_at', 'updated_at', 'applied_date'),
+        'display': BD_DISPLAY_COLUMNS,
+        'related': {'bd_id': BD_RELATED_COLUMNS},
+    },
+    DeveloperDataSerializer: {
+        'extra': ('full_name',),
+        'columns': ('firstName', 'lastName', 'created_at', 'updated_at'),
+    },
+    BDSerializer: {
+        'extra': ('full_name',),
+        'columns': ('name', 'created_at', 'updated_at'),
+    },
+    InterviewScheduleSerializer: {
+        'extra': ('bd_info', 'developer_info'),
+        'columns': ('bd_id', 'dev_id'),
+        'display': BD_DISPLAY_COLUMNS + DEVELOPER_DISPLAY_COLUMNS,
+        'related': {'bd_id': BD_RELATED_COLUMNS, 'dev_id': DEVELOPER_RELATED_COLUMNS},
+    },
+    ClientSerializer: {},
+}
+
+
+def parse_fields(value):
+    """Split a ``?fields=`` value into a set of names, None when absent or empty."""
+    if not value:
+        return None
+    names = frozenset(name.strip() for name in value.split(',') if name.strip())
+    return names or None
+
+
+@lru_cache(maxsize=None)
+def field_sources(serializer_class):
+    """Output key -> model column for every readable declared field."""
+    serializer = serializer_class()
+    model = serializer.Meta.model
+    columns = {field.name for field in model._meta.concrete_fields}
+    sources = {}
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        is_column = field.source in columns and not isinstance(field, serializers.SerializerMethodField)
+        sources[name] = field.source if is_column else None
+    return sources
+
+
+def resolve_fieldset(serializer_class, fields):
+    """
+    The requested output keys ``serializer_class`` knows about, or None to
+    serialize everything. ``fields`` is the raw ``?fields=`` value or a set.
+    """
+    if isinstance(fields, str):
+        fields = parse_fields(fields)
+    if not fields or serializer_class not in FIELDSET_RULES:
+        return None
+    known = set(field_sources(serializer_class)) | set(FIELDSET_RULES[serializer_class].get('extra', ()))
+    fieldset = frozenset(fields) & known
+    return fieldset or None
+
+
+def only_columns(queryset, serializer_class, fieldset):
+    """Column paths for ``queryset.only()`` covering ``fieldset``."""
+    rules = FIELDSET_RULES[serializer_class]
+    model = queryset.model
+    paths = [model._meta.pk.name]
+    sources = field_sources(serializer_class)
+    paths.extend(sources[name] for name in fieldset if sources.get(name))
+    paths.extend(rules.get('columns', ()))
+    if use_display_fields():
+        paths.extend(rules.get('display', ()))
+    selected = queryset.query.select_related
+    if selected:
+        for relation, related_columns in rules.get('related', {}).items():
+            if selected is True or relation in selected:
+                paths.append(relation)
+                paths.extend(f'{relation}__{column}' for column in related_columns)
+    return list(dict.fromkeys(paths))
+
+
+def prune_queryset(queryset, serializer_class, fieldset):
+    if fieldset is None:
+        return queryset
+    return queryset.only(*only_columns(queryset, serializer_class, fieldset))
+
+
+def prune_fields(serializer, fieldset):
+    """Drop the declared fields of a (list) serializer that were not requested."""
+    if fieldset is None:
+        return serializer
+    child = getattr(serializer, 'child', serializer)
+    for name in list(child.fields):
+        if name not in fieldset:
+            child.fields.pop(name)
+    return serializer
+
+
+def prune_representation(representation, fieldset):
+    return {key: value for key, value in representation.items() if key in fieldset}
@@ -0,0 +1,160 @@
+"""
+``Idempotency-Key`` support for POST endpoints.
+
+A form that retries after a timeout cannot tell whether its first attempt
+created the row. When the request carries an ``Idempotency-Key`` header,
+:class:`IdempotencyMiddleware` records the key before the view runs and the
+response after it. A retry with the same key gets the stored response back
+(marked ``Idempotent-Replayed: true``) without reaching the view, so nothing
+is created twice.
+
+* Keys are scoped to the caller (JWT role and email, else remote address,
+  as in backend.throttling) and the request path.
+* Reusing a key with a different body is refused with 422. A retry that
+  arrives while the first attempt is still running gets 409 and Retry-After.
+* Only successful responses are kept. Errors created nothing, and a 4xx
+  can depend on state that changes (a missing BD, a duplicate that was
+  deleted), so a retry after one runs the view again. The same goes for an
+  attempt whose worker died: its claim is taken over after
+  ``IDEMPOTENCY_LOCK_SECONDS``.
+* Records expire after ``IDEMPOTENCY_TTL_HOURS``. ``manage.py
+  purge_idempotency_records`` deletes expired ones, and an expired key is
+  simply claimed afresh.
+
+Endpoints in ``IDEMPOTENCY_EXCLUDED_VIEWS`` (login and register, whose
+responses hold tokens or credentials) are never recorded.
+"""
+import hashlib
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
+from backend.throttling import caller
+
+from .models import IdempotencyRecord
+
+logger = logging.getLogger(__name__)
+
+HEADER = 'HTTP_IDEMPOTENCY_KEY'
+MAX_KEY_LENGTH = 255
+
+
+def replayable(status_code):
+    """Responses stored for replay: those of requests that may have changed something."""
+    return status_code < 400
+
+
+def scope_of(request):
+    role, identity = caller(request)
+    return hashlib.sha256(f'{role}:{identity}\n{request.path}'.encode()).hexdigest()
+
+
+def _error(status_code, error, message):
+    response = JsonResponse({'success': False, 'error': error, 'message': message}, status=status_code)
+    if status_code == 409:
+        response['Retry-After'] = '1'
+    return response
+
+
+def replay(record):
+    response = HttpResponse(bytes(record.response_body), status=record.response_status, content_type=record.content_type)
+    response['Idempotent-Replayed'] = 'true'
+    return response
+
+
+def claim(scope, key, request_hash):
+    """
+    Record ``key`` as in progress. Returns ``(record, None)`` when the caller
+    should run the view, or ``(None, response)`` with the replayed or error
+    response.
+    """
+    for _ in range(2):
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                record = IdempotencyRecord.objects.create(
+                    scope=scope, key=key, request_hash=request_hash,
+                    expires_at=now + timedelta(hours=getattr(settings, 'IDEMPOTENCY_TTL_HOURS', 24)),
+                )
+            return record, None
+        except IntegrityError:
+            existing = IdempotencyRecord.objects.filter(scope=scope, key=key).first()
+        if existing is None:
+            continue  # deleted meanwhile
+
+        abandoned = now - timedelta(seconds=getattr(settings, 'IDEMPOTENCY_LOCK_SECONDS', 120))
+        if existing.expires_at <= now or (existing.status == 'processing' and existing.created_at < abandoned):
+            IdempotencyRecord.objects.filter(pk=existing.pk, status=existing.status, created_at=existing.created_at).delete()
+            continue
+        if existing.request_hash != request_hash:
+            return None, _error(422, 'Idempotency-Key reused', 'This Idempotency-Key was used for a different request.')
+        if existing.status == 'processing':
+            return None, _error(409, 'Request in progress', 'A request with this Idempotency-Key is still being processed.')
+        return None, replay(existing)
+    return None, _error(409, 'Request in progress', 'A request with this Idempotency-Key is still being processed.')
+
+
+def finish(record, response):
+    """Store ``response`` for replays, or drop the claim so a retry runs again."""
+    records = IdempotencyRecord.objects.filter(pk=record.pk, status='processing')
+    if response.streaming or not replayable(response.status_code):
+        records.delete()
+        return
+    records.update(
+        status='done',
+        response_status=response.status_code,
+        response_body=response.content,
+        content_type=response.get('Content-Type', ''),
+    )
+
+
+class IdempotencyMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        try:
+            response = self.get_response(request)
+        except Exception:
+            record = getattr(request, '_idempotency_record', None)
+            if record is not None:
+                IdempotencyRecord.objects.filter(pk=record.pk, status='processing').delete()
+            raise
+        record = getattr(request, '_idempotency_record', None)
+        if record is not None:
+            finish(record, response)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        key = request.META.get(HEADER)
+        if request.method != 'POST' or not key:
+            return None
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        if url_name in getattr(settings, 'IDEMPOTENCY_EXCLUDED_VIEWS', ()):
+            return None
+        if len(key) > MAX_KEY_LENGTH:
+            return _error(400, 'Invalid Idempotency-Key', f'Idempotency-Key must be at most {MAX_KEY_LENGTH} characters.')
+
+        record, response = claim(scope_of(request), key, hashlib.sha256(request.body).hexdigest())
+        if response is not None:
+            logger.info("Idempotency-Key %s on %s answered with %s", key, request.path, response.status_code)
+            return response
+        request._idempotency_record = record
+        return None
+
+
+def purge_expired(batch_size=2000):
+    """Delete expired records in batches; returns the number deleted."""
+    deleted = 0
+    while True:
+        expired = list(
+            IdempotencyRecord.objects.filter(expires_at__lte=timezone.now())
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        if not expired:
+            return deleted
+        deleted += IdempotencyRecord.objects.filter(pk__in=expired).delete()[0]
@@ -0,0 +1,310 @@
+"""
+Index advisor.
+
+Reads SELECT statements (the ones the read endpoints in authapp.queryplans
+issue against seeded data, statements from query logs, or PostgreSQL's
+pg_stat_statements) and works out, per table, which columns each statement
+compares to a value, which it range-filters and which it sorts by. Each
+pattern suggests one composite index in the order a B-tree can serve it:
+equality columns first, then the sort columns when the statement has a
+LIMIT (the index lets it stop early) or no range filter, else the first
+range column (sorting the matching rows is cheaper than reading them all in
+order). GROUP BY columns count as the sort when there is no ORDER BY.
+
+Mixed sort directions keep theirs: '-created_at', 'office_id' becomes
+'created_at', '-office_id', which the index serves scanned backwards.
+
+A suggestion is dropped when an index already in the database starts with
+the same columns, and folded into a longer suggestion that starts with it.
+Substring filters (``icontains``) are counted separately: a B-tree cannot
+serve ``LIKE '%term%'``.
+
+The output is a list to review, not to apply blindly: each index costs
+writes and space, and column order among the equality columns is best
+decided with the data's selectivity in mind. ``manage.py bench_indexes``
+measures what an index buys.
+"""
+import json
+import re
+import time
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.apps import apps
+from django.db import connection, transaction
+
+_COLUMN = r'"(\w+)"\."(\w+)"'
+_COMPARISON = re.compile(
+    _COLUMN + r'\s*(=|>=|<=|>|<|IN\b|BETWEEN\b|LIKE\b)(?!\s*"\w+"\.)',
+    re.IGNORECASE,
+)
+_SUBSTRING_COLUMN = re.compile(r'(?:UPPER\()?' + _COLUMN + r'(?:::text\))?\s+LIKE\s+(?:UPPER\()?\s*\'%', re.IGNORECASE)
+_ORDER_BY = re.compile(r'ORDER BY (.+?)(?:\s+LIMIT\b|\s+OFFSET\b|\)|$)', re.IGNORECASE | re.DOTALL)
+_GROUP_BY = re.compile(r'GROUP BY (.+?)(?:\s+HAVING\b|\s+ORDER\b|\s+LIMIT\b|\)|$)', re.IGNORECASE | re.DOTALL)
+_ORDER_COLUMN = re.compile(_COLUMN + r'(?:\s+(ASC|DESC))?', re.IGNORECASE)
+_BARE_COLUMN = re.compile(r'^\s*' + _COLUMN + r'(?:\s+AS\s+"\w+")?\s*$', re.IGNORECASE)
+_LIMIT = re.compile(r'\bLIMIT\b', re.IGNORECASE)
+_ALIASES = re.compile(r'(?:FROM|JOIN)\s+"(\w+)"\s+(?:AS\s+)?"?(\w+)"?', re.IGNORECASE)
+
+
+class Pattern(NamedTuple):
+    table: str
+    equality: tuple
+    ranges: tuple
+    order: tuple  # column names, '-' for descending
+    limited: bool
+
+    def columns(self):
+        """Suggested index columns for this pattern."""
+        if self.order and (self.limited or not self.ranges):
+            order = self.order
+            if order[0].startswith('-'):
+                # An index scanned backwards serves the reversed order
+                order = tuple(column[1:] if column.startswith('-') else f'-{column}' for column in order)
+            order = tuple(column for column in order if column.lstrip('-') not in self.equality)
+            return self.equality + order
+        return self.equality + self.ranges[:1]
+
+
+def _select_list(sql):
+    """Top-level items of the outermost SELECT list."""
+    start = sql.upper().find('SELECT') + len('SELECT')
+    items, depth, current = [], 0, []
+    for position in range(start, len(sql)):
+        char = sql[position]
+        if depth == 0 and sql[position:position + 6].upper() == ' FROM ':
+            break
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+        if char == ',' and depth == 0:
+            items.append(''.join(current))
+            current = []
+        else:
+            current.append(char)
+    items.append(''.join(current))
+    return items
+
+
+def _sort_columns(clause, sql):
+    """(table, column, direction) of a sort/group clause; positional references resolve to the select list."""
+    columns = []
+    for item in clause.split(','):
+        item = item.strip()
+        reference = re.match(r'^(\d+)(?:\s+(ASC|DESC))?', item, re.IGNORECASE)
+        if reference:
+            select = _select_list(sql)
+            index = int(reference.group(1)) - 1
+            bare = _BARE_COLUMN.match(select[index]) if index < len(select) else None
+            if bare:
+                columns.append((*bare.groups(), reference.group(2) or ''))
+            continue
+        columns.extend(_ORDER_COLUMN.findall(item)[:1])
+    return columns
+
+
+def patterns(sql):
+    """One Pattern per table the statement filters or sorts, plus (table, column) substring filters."""
+    aliases = {alias: table for table, alias in _ALIASES.findall(sql)}
+    equality, ranges, order = defaultdict(list), defaultdict(list), defaultdict(list)
+
+    for table, column, operator in _COMPARISON.findall(sql):
+        table = aliases.get(table, table)
+        operator = operator.upper().split()[0]
+        if operator == 'LIKE':
+            continue
+        target = equality if operator in ('=', 'IN') else ranges
+        if column not in target[table]:
+            target[table].append(column)
+
+    match = _ORDER_BY.search(sql) or _GROUP_BY.search(sql)
+    if match:
+        for table, column, direction in _sort_columns(match.group(1), sql):
+            table = aliases.get(table, table)
+            order[table].append(f'-{column}' if direction.upper() == 'DESC' else column)
+
+    found = []
+    for table in {*equality, *ranges, *order}:
+        found.append(Pattern(
+            table,
+            tuple(sorted(equality[table])),
+            tuple(column for column in ranges[table] if column not in equality[table]),
+            tuple(order[table]),
+            bool(_LIMIT.search(sql)),
+        ))
+    substrings = {(aliases.get(table, table), column) for table, column in _SUBSTRING_COLUMN.findall(sql)}
+    return found, substrings
+
+
+# -------- Statement sources --------
+_LOG_STATEMENT = re.compile(r'(?:statement:|execute [^:]*:)\s*(.+)$', re.IGNORECASE)
+_DJANGO_LOG = re.compile(r'^\(\d+(?:\.\d+)?\)\s*(.+?)(?:;\s*args=.*)?$', re.DOTALL)
+
+
+def statements_from_log(lines):
+    """
+    SELECTs from query log lines: PostgreSQL server logs (``statement: ...``),
+    Django's ``django.db.backends`` debug lines (``(0.002) SELECT ...; args=...``),
+    JSON lines carrying either as ``message``, or bare SQL.
+    """
+    for line in lines:
+        line = line.strip()
+        if line.startswith('{'):
+            try:
+                line = str(json.loads(line).get('message', ''))
+            except ValueError:
+                continue
+        match = _LOG_STATEMENT.search(line)
+        if match:
+            line = match.group(1)
+        else:
+            match = _DJANGO_LOG.match(line)
+            if match:
+                line = match.group(1)
+        if line.upper().startswith(('SELECT', 'WITH')):
+            yield line, 1
+
+
+def statements_from_pg_stat_statements(limit=500):
+    """The most called SELECTs recorded by pg_stat_statements, with their call counts."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT query, calls FROM pg_stat_statements "
+            "WHERE query ILIKE 'select%%' OR query ILIKE 'with%%' ORDER BY calls DESC LIMIT %s",
+            [limit],
+        )
+        return cursor.fetchall()
+
+
+def statements_from_endpoints(results):
+    """(statement, 1) for every statement of authapp.queryplans results."""
+    for result in results:
+        for sql in result.statements:
+            yield sql, 1
+
+
+# -------- Advice --------
+class Advice(NamedTuple):
+    table: str
+    columns: tuple
+    count: int
+    examples: list
+    covered_by: str  # name of the existing index serving it, '' when none
+
+    def field_names(self):
+        """Model field names for ``models.Index(fields=...)``; db column names where no field matches."""
+        model = _models_by_table().get(self.table)
+        if model is None:
+            return list(self.columns)
+        by_column = {field.column: field.name for field in model._meta.concrete_fields}
+        names = []
+        for column in self.columns:
+            prefix = '-' if column.startswith('-') else ''
+            names.append(prefix + by_column.get(column.lstrip('-'), column.lstrip('-')))
+        return names
+
+
+def _models_by_table():
+    return {model._meta.db_table: model for model in apps.get_models()}
+
+
+def existing_indexes(table):
+    """{index name: (column tuple, unique)} for every index and unique constraint on ``table``."""
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, table)
+    return {
+        name: (tuple(info['columns']), bool(info['unique'] or info['primary_key']))
+        for name, info in constraints.items()
+        if (info['index'] or info['unique'] or info['primary_key']) and info['columns']
+    }
+
+
+def _covers(index, equality_count, columns):
+    index_columns, unique = index
+    names = [column.lstrip('-') for column in columns]
+    if unique and set(index_columns) <= set(names[:equality_count]):
+        return True  # at most one row, nothing left to sort
+    if len(index_columns) < len(names):
+        return False
+    return (
+        set(index_columns[:equality_count]) == set(names[:equality_count])
+        and list(index_columns[equality_count:len(names)]) == names[equality_count:]
+    )
+
+
+def advise(statements):
+    """
+    ``(advice, substrings)``: index suggestions by descending statement count,
+    and {(table, column): count} of substring filters no B-tree can serve.
+    """
+    suggestions = {}
+    substrings = defaultdict(int)
+    known_tables = set(connection.introspection.table_names())
+
+    for sql, count in statements:
+        found, substring_columns = patterns(sql)
+        for key in substring_columns:
+            substrings[key] += count
+        for pattern in found:
+            columns = pattern.columns()
+            if not columns or pattern.table not in known_tables:
+                continue
+            key = (pattern.table, columns)
+            entry = suggestions.setdefault(key, {'count': 0, 'examples': [], 'equality': len(pattern.equality)})
+            entry['count'] += count
+            if len(entry['examples']) < 3:
+                entry['examples'].append(sql)
+
+    # Fold suggestions into longer ones on the same table that start with them
+    for table, columns in sorted(suggestions, key=lambda key: -len(key[1])):
+        entry = suggestions.get((table, columns))
+        if entry is None:
+            continue
+        for other_table, other in list(suggestions):
+            if other_table == table and len(other) < len(columns) and columns[:len(other)] == other:
+                folded = suggestions.pop((table, other))
+                entry['count'] += folded['count']
+                entry['examples'] = (entry['examples'] + folded['examples'])[:3]
+
+    advice = []
+    indexes = {}
+    for (table, columns), entry in suggestions.items():
+        if table not in indexes:
+            indexes[table] = existing_indexes(table)
+        covered_by = next(
+            (name for name, index in indexes[table].items() if _covers(index, entry['equality'], columns)),
+            '',
+        )
+        advice.append(Advice(table, columns, entry['count'], entry['examples'], covered_by))
+    advice.sort(key=lambda item: (bool(item.covered_by), -item.count, item.table, item.columns))
+    return advice, dict(substrings)
+
+
+# -------- Benchmarks --------
+def time_statement(sql, repeat=5):
+    """Best wall time of ``repeat`` runs of a SELECT, fetching every row."""
+    best = None
+    with connection.cursor() as cursor:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            cursor.execute(sql)
+            cursor.fetchall()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark_index(index_name, statements, repeat=5):
+    """
+    ``[(sql, seconds with the index, seconds without)]`` for ``statements``.
+    The index is dropped inside a transaction that is rolled back, so it is
+    back afterwards; on PostgreSQL the table is locked meanwhile.
+    """
+    with_index = [time_statement(sql, repeat) for sql in statements]
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP INDEX {connection.ops.quote_name(index_name)}')
+        without_index = [time_statement(sql, repeat) for sql in statements]
+        transaction.set_rollback(True)
+    return list(zip(statements, with_index, without_index))
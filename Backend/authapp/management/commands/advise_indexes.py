@@ -0,0 +1,69 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from authapp import indexes, queryplans
+
+
+class Command(BaseCommand):
+    help = (
+        "Suggest composite indexes from the filter and sort patterns of the read "
+        "endpoints (run against seeded data and rolled back) and of query logs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed', type=int, default=0, metavar='ROWS',
+            help='Seed this many rows first (rolled back); 0, the default, uses the data already there.',
+        )
+        parser.add_argument('--no-endpoints', action='store_true', help='Skip the endpoints; only read logs.')
+        parser.add_argument(
+            '--log', action='append', default=[], metavar='FILE',
+            help='Query log to read (PostgreSQL, django.db.backends or bare SQL lines); may be repeated.',
+        )
+        parser.add_argument(
+            '--pg-stat-statements', action='store_true',
+            help='Also read the most called statements from pg_stat_statements (PostgreSQL).',
+        )
+        parser.add_argument('--all', action='store_true', help='Also list patterns existing indexes serve.')
+
+    def handle(self, *args, **options):
+        statements = []
+        if not options['no_endpoints']:
+            with transaction.atomic():
+                if options['seed']:
+                    try:
+                        queryplans.seed(options['seed'])
+                    except ValueError as e:
+                        raise CommandError(f'{e} Run with --seed 0 to use them.')
+                results = queryplans.capture()
+                transaction.set_rollback(True)
+            statements.extend(indexes.statements_from_endpoints(results))
+        for path in options['log']:
+            try:
+                with open(path, encoding='utf-8', errors='replace') as log:
+                    statements.extend(indexes.statements_from_log(log))
+            except OSError as e:
+                raise CommandError(f'Cannot read {path}: {e}')
+        if options['pg_stat_statements']:
+            if connection.vendor != 'postgresql':
+                raise CommandError('pg_stat_statements needs PostgreSQL.')
+            statements.extend(indexes.statements_from_pg_stat_statements())
+        if not statements:
+            raise CommandError('No statements to analyze.')
+
+        advice, substrings = indexes.advise(statements)
+        self.stdout.write(f'{len(statements)} statements analyzed')
+        for item in advice:
+            if item.covered_by and not options['all']:
+                continue
+            status = f'served by {item.covered_by}' if item.covered_by else 'missing'
+            self.stdout.write(f"\n{item.table} ({', '.join(item.columns)})  {item.count} statement(s), {status}")
+            if not item.covered_by:
+                self.stdout.write(f'    models.Index(fields={item.field_names()!r}, name=...)')
+            if options['verbosity'] > 1:
+                for sql in item.examples:
+                    self.stdout.write(f'    e.g. {sql[:300]}')
+        if substrings:
+            self.stdout.write('\nSubstring filters (a B-tree index cannot serve these):')
+            for (table, column), count in sorted(substrings.items(), key=lambda item: -item[1]):
+                self.stdout.write(f'    {table}.{column}  {count} statement(s)')
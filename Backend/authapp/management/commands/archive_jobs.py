@@ -0,0 +1,28 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from authapp import archive
+
+
+class Command(BaseCommand):
+    help = (
+        "Move jobs in a final status (Rejected, Withdrawn, Accepted) that has "
+        "not changed for --days days, with their interviews, to the archive "
+        "tables in batched transactions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ARCHIVE_AFTER_DAYS)
+        parser.add_argument('--batch-size', type=int, default=settings.ARCHIVE_BATCH_SIZE)
+        parser.add_argument('--bd', help='Only this BD\'s jobs.')
+        parser.add_argument('--dry-run', action='store_true', help='Count the jobs that would move.')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            count = archive.archivable(archive.archive_cutoff(options['days']), options['bd']).count()
+            self.stdout.write(f"Would archive {count} jobs closed more than {options['days']} days ago")
+            return
+        result = archive.archive_jobs(options['days'], options['batch_size'], options['bd'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Archived {result.jobs} jobs and {result.interviews} interviews in {result.batches} batches'
+        ))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from authapp import compensation
+
+
+class Command(BaseCommand):
+    help = (
+        "Parse the free-text salaries of developers, BDs and jobs into the numeric "
+        "salary columns, e.g. after the parsing rules changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source', action='append', choices=sorted(compensation.SOURCES),
+            help='Only this source; may be repeated. Default: all.',
+        )
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        for source in options['source'] or compensation.SOURCES:
+            updated = compensation.backfill(source, batch_size=options['batch_size'])
+            self.stdout.write(f'{source}: updated {updated} rows')
+        self.stdout.write(self.style.SUCCESS('Salaries parsed'))
@@ -0,0 +1,58 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from authapp import indexes, queryplans
+
+
+class Command(BaseCommand):
+    help = (
+        "Time the endpoint statements that use each index with and without it. "
+        "Indexes are dropped inside a transaction that is rolled back; on "
+        "PostgreSQL that locks the table meanwhile, so not for production."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('index', nargs='*', help='Index names. Default: every index declared on authapp models.')
+        parser.add_argument(
+            '--seed', type=int, default=0, metavar='ROWS',
+            help='Seed this many developers, jobs and clients first (rolled back); 0 uses the data already there.',
+        )
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        declared = {
+            index.name: model._meta.db_table
+            for model in apps.get_app_config('authapp').get_models()
+            for index in model._meta.indexes
+        }
+        names = options['index'] or sorted(declared)
+        unknown = [name for name in names if name not in declared]
+        if unknown:
+            raise CommandError(f"Not declared on any authapp model: {', '.join(unknown)}")
+
+        with transaction.atomic():
+            if options['seed']:
+                try:
+                    queryplans.seed(options['seed'])
+                except ValueError as e:
+                    raise CommandError(f'{e} Run with --seed 0 to use them.')
+            results = queryplans.capture()
+            for name in names:
+                # Statements whose plan reads through the index
+                used = {}
+                for result in results:
+                    for sql, plan in zip(result.statements, result.plans):
+                        if any(f' {name} ' in f'{access} ' for access in plan):
+                            used.setdefault(sql, result.case.name)
+                if not used:
+                    self.stdout.write(f'{name}: not used by any endpoint')
+                    continue
+                self.stdout.write(f'{name} ({declared[name]}):')
+                timings = indexes.benchmark_index(name, list(used), options['repeat'])
+                for sql, with_index, without_index in timings:
+                    self.stdout.write(
+                        f'    {used[sql]:32} {without_index * 1000:9.2f} ms -> {with_index * 1000:9.2f} ms'
+                        f'  x{without_index / with_index:.1f}'
+                    )
+            transaction.set_rollback(True)
@@ -0,0 +1,121 @@
+import io
+import time
+from datetime import datetime, timedelta, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.settings import api_settings
+
+from authapp.fast_serializers import serialize_list
+from authapp.models import Client, Developer_data, InterviewSchedule, JobApplication
+from authapp.serializers import (
+    DeveloperDataSerializer,
+    InterviewScheduleSerializer,
+    JobApplicationListSerializer,
+)
+from authapp.views import with_display_relations
+from backend import renderers
+
+
+# Text as real job leads carry it: hyphenated words, emails, version numbers
+# and timestamps all contain "e-" or "e<digit>"
+_DESCRIPTIONS = (
+    'Build state-of-the-art e-commerce services with a cross-functional team.',
+    'Own the end-to-end release pipeline; e2e tests with Playwright, Vue3 front end.',
+    'Senior role, 5+ years of hands-on experience; contact jane-doe@example.com.',
+)
+_TITLES = ('Senior Vue3 Engineer', 'Back-end Developer (Python 3.12)', 'Site Reliability Engineer - EMEA')
+
+
+def realistic_jobs(rows):
+    """Job list rows shaped like JobApplicationListSerializer output, with realistic text."""
+    start = datetime(2025, 1, 6, 9, 30, tzinfo=timezone.utc)
+    jobs = []
+    for i in range(rows):
+        created = (start + timedelta(minutes=37 * i)).isoformat()
+        jobs.append({
+            'job_id': i + 1,
+            'job_title': _TITLES[i % len(_TITLES)],
+            'company': f'Acme-{i % 40} Labs',
+            'location': 'Remote - Europe',
+            'salary_range': '$85,000 - $95,000 per year',
+            'job_type': 'Full-time',
+            'experience_level': 'Senior (5+ years)',
+            'platform': 'LinkedIn',
+            'job_url': f'https://jobs.example.com/e-{i}',
+            'skills': ['Python', 'Vue3', 'e2e testing'],
+            'job_description': _DESCRIPTIONS[i % len(_DESCRIPTIONS)],
+            'key_requirements': 'Degree in CS or equivalent experience',
+            'personal_notes': None,
+            'application_status': 'Applied',
+            'cluster_id': None,
+            'bd_name': 'Jane Doe',
+            'skills_display': 'Python, Vue3, e2e testing',
+            'applied_date': created[:10],
+            'created_at': created,
+            'updated_at': created,
+            'bd_info': {'bd_id': f'BD-{i % 12}', 'name': 'Jane Doe', 'email': 'jane-doe@example.com'},
+        })
+    return jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare encode/decode throughput of DRF's JSON renderer and parser with "
+        "the orjson ones and check both produce the same bytes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--rows', type=int, default=10000, help='Rows in the synthetic jobs payload.')
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            raise CommandError('orjson is not installed; ORJSONRenderer falls back to the stdlib encoder.')
+
+        payloads = [
+            ('jobs', serialize_list(with_display_relations(JobApplication.objects.all(), 'bd_id'), JobApplicationListSerializer)),
+            ('developers', serialize_list(Developer_data.objects.all(), DeveloperDataSerializer)),
+            ('interviews', serialize_list(with_display_relations(InterviewSchedule.objects.all(), 'bd_id', 'dev_id'), InterviewScheduleSerializer)),
+            # Raw model values: Decimal hourly_rate and date deadline go
+            # through the encoder rather than the serializer fields.
+            ('clients (raw)', list(Client.objects.values())),
+            ('jobs (synthetic)', realistic_jobs(options['rows'])),
+        ]
+        drf_renderer, fast_renderer = JSONRenderer(), renderers.ORJSONRenderer()
+        drf_parser, fast_parser = JSONParser(), renderers.ORJSONParser()
+        context = {'encoding': 'utf-8'}
+
+        self.stdout.write(
+            f'{"payload":14} {"bytes":>9}  {"encode MB/s (DRF / orjson)":>28}  {"decode MB/s (DRF / orjson)":>28}'
+        )
+        for label, data in payloads:
+            drf_bytes, drf_encode = self.measure(lambda: drf_renderer.render(data), options['repeat'])
+            fast_bytes, fast_encode = self.measure(lambda: fast_renderer.render(data), options['repeat'])
+            if drf_bytes != fast_bytes:
+                raise CommandError(f'{label}: ORJSONRenderer output differs from JSONRenderer')
+
+            drf_data, drf_decode = self.measure(lambda: drf_parser.parse(io.BytesIO(drf_bytes), parser_context=context), options['repeat'])
+            fast_data, fast_decode = self.measure(lambda: fast_parser.parse(io.BytesIO(drf_bytes), parser_context=context), options['repeat'])
+            if drf_data != fast_data:
+                raise CommandError(f'{label}: ORJSONParser result differs from JSONParser')
+
+            size = len(drf_bytes)
+            megabytes = size / 1e6
+            self.stdout.write(
+                f'{label:14} {size:9}  {megabytes / drf_encode:12.1f} / {megabytes / fast_encode:7.1f} x{drf_encode / fast_encode:4.1f}'
+                f'  {megabytes / drf_decode:12.1f} / {megabytes / fast_decode:7.1f} x{drf_decode / fast_decode:4.1f}'
+            )
+        self.stdout.write(f'UNICODE_JSON={api_settings.UNICODE_JSON} COMPACT_JSON={api_settings.COMPACT_JSON}')
+
+    @staticmethod
+    def measure(run, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = run()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return result, best
+
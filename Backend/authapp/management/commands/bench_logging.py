@@ -0,0 +1,86 @@
+import logging
+import statistics
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from authapp.views import JobApplicationListCreateView, JobApplicationSearchView
+from backend.log import AsyncQueueHandler, JSONFormatter, RedactionFilter, SamplingFilter
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure job list/search latency with logging disabled, with a "
+        "synchronous file handler and with the async queue handler."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200)
+        parser.add_argument('--level', default='DEBUG')
+        parser.add_argument('--sample-rate', type=float, default=1.0)
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        level = getattr(logging, options['level'].upper())
+        factory = RequestFactory()
+        views = [
+            ('/api/job-applications/', JobApplicationListCreateView.as_view()),
+            ('/api/job-applications/search/', JobApplicationSearchView.as_view()),
+        ]
+        app_logger = logging.getLogger('authapp')
+        saved = (app_logger.handlers[:], app_logger.level, app_logger.propagate)
+
+        def run():
+            timings = []
+            for _ in range(iterations):
+                for path, view in views:
+                    request = factory.get(path)
+                    start = time.perf_counter()
+                    view(request)
+                    timings.append((time.perf_counter() - start) * 1000)
+            return timings
+
+        def install(handler):
+            app_logger.handlers = [handler] if handler else []
+            app_logger.setLevel(level)
+            app_logger.propagate = False
+            if handler:
+                handler.setFormatter(JSONFormatter())
+                handler.addFilter(SamplingFilter({'authapp': options['sample_rate']}))
+                handler.addFilter(RedactionFilter())
+
+        results = []
+        with tempfile.TemporaryFile('w+') as sync_stream, tempfile.TemporaryFile('w+') as async_stream:
+            try:
+                logging.disable(logging.CRITICAL)
+                run()  # warm-up
+                results.append(('logging disabled', run()))
+                logging.disable(logging.NOTSET)
+
+                install(logging.StreamHandler(sync_stream))
+                results.append(('sync file handler', run()))
+
+                async_handler = AsyncQueueHandler(stream=async_stream)
+                install(async_handler)
+                results.append(('async queue handler', run()))
+                async_handler.close()
+            finally:
+                logging.disable(logging.NOTSET)
+                app_logger.handlers, app_logger.level, app_logger.propagate = saved
+
+        self.stdout.write(
+            f"{len(views)} endpoints x{iterations}, level={options['level'].upper()}, "
+            f"sample rate={options['sample_rate']}"
+        )
+        baseline = statistics.mean(results[0][1])
+        for label, timings in results:
+            timings.sort()
+            mean = statistics.mean(timings)
+            self.stdout.write(
+                f'  {label:20} mean {mean:7.2f} ms  p95 {timings[int(len(timings) * 0.95) - 1]:7.2f} ms  '
+                f'overhead {mean - baseline:+6.2f} ms'
+            )
+        if async_handler.dropped:
+            self.stdout.write(self.style.WARNING(f'  async handler dropped {async_handler.dropped} records'))
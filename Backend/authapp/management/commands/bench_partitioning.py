@@ -0,0 +1,45 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from authapp import partitioning, queryplans
+
+
+class Command(BaseCommand):
+    help = (
+        "Copy jobs or interview_schedules into an unpartitioned and a partitioned "
+        "scratch table (same indexes) and time BD-scoped, by-id, monthly and "
+        "latest-first queries on both. Everything is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--table', choices=partitioning.TABLES, default='jobs')
+        parser.add_argument('--scheme', choices=sorted(partitioning.KEYS), default='hash')
+        parser.add_argument('--partitions', type=int, default=getattr(settings, 'PARTITION_HASH_PARTITIONS', 16))
+        parser.add_argument(
+            '--seed', type=int, default=0, metavar='ROWS',
+            help='Seed this many developers, jobs and clients first (rolled back); 0 uses the data already there.',
+        )
+        parser.add_argument('--repeat', type=int, default=5)
+
+    def handle(self, *args, **options):
+        try:
+            partitioning.check_supported()
+            with transaction.atomic():
+                if options['seed']:
+                    queryplans.seed(options['seed'])
+                results = partitioning.benchmark(
+                    options['table'], options['scheme'], options['partitions'], options['repeat'],
+                )
+                transaction.set_rollback(True)
+        except partitioning.PartitionError as exc:
+            raise CommandError(str(exc))
+
+        self.stdout.write(f"{options['table']}, {options['scheme']} partitioning:")
+        self.stdout.write(f"    {'query':16} {'flat ms':>9} {'partitioned ms':>15}  relations read")
+        for result in results:
+            self.stdout.write(
+                f'    {result.query.name:16} {result.flat_seconds * 1000:9.2f} {result.partitioned_seconds * 1000:15.2f}'
+                f'  {result.flat_relations} -> {result.partitioned_relations}'
+                f'  x{result.flat_seconds / result.partitioned_seconds:.1f}'
+            )
@@ -0,0 +1,60 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.utils.encoders import JSONEncoder
+
+from authapp.fast_serializers import get_compiled
+from authapp.models import BD, Developer_data, InterviewSchedule, JobApplication
+from authapp.serializers import (
+    BDSerializer,
+    DeveloperDataSerializer,
+    InterviewScheduleSerializer,
+    JobApplicationListSerializer,
+)
+from authapp.views import with_display_relations
+
+
+class Command(BaseCommand):
+    help = "Compare rows/sec of the DRF list serializers with the compiled fast path and check the output matches."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=3)
+
+    def handle(self, *args, **options):
+        cases = [
+            ('jobs', with_display_relations(JobApplication.objects.order_by('-created_at'), 'bd_id'), JobApplicationListSerializer),
+            ('developers', Developer_data.objects.order_by('-created_at'), DeveloperDataSerializer),
+            ('bds', BD.objects.order_by('-created_at'), BDSerializer),
+            ('interviews', with_display_relations(InterviewSchedule.objects.order_by('-created_at'), 'bd_id', 'dev_id'), InterviewScheduleSerializer),
+        ]
+        for label, queryset, serializer_class in cases:
+            compiled = get_compiled(serializer_class)
+            drf_rows, drf_time = self.measure(lambda: serializer_class(queryset.all(), many=True).data, options['repeat'])
+            fast_rows, fast_time = self.measure(lambda: compiled.serialize(queryset.all()), options['repeat'])
+
+            if self.dump(drf_rows) != self.dump(fast_rows):
+                raise CommandError(f'{label}: compiled output differs from {serializer_class.__name__}')
+
+            count = len(drf_rows)
+            if not count:
+                self.stdout.write(f'{label:11} no rows')
+                continue
+            self.stdout.write(
+                f'{label:11} {count:7} rows  DRF {count / drf_time:10.0f} rows/s  '
+                f'compiled {count / fast_time:10.0f} rows/s  x{drf_time / fast_time:.1f}'
+            )
+
+    @staticmethod
+    def measure(serialize, repeat):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = serialize()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return rows, best
+
+    @staticmethod
+    def dump(rows):
+        return json.dumps(rows, cls=JSONEncoder, ensure_ascii=False, separators=(',', ':'))
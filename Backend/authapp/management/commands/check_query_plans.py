@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from authapp import queryplans
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the read endpoints against seeded data, EXPLAIN their queries, flag "
+        "sequential scans of large tables and compare plans with the snapshot. "
+        "Everything runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed', type=int, default=500, metavar='ROWS',
+            help='Seed this many developers, jobs and clients first; 0 uses the data already there.',
+        )
+        parser.add_argument('--case', action='append', help='Only this case; may be repeated.')
+        parser.add_argument('--update', action='store_true', help='Record the plans as the snapshot.')
+
+    def handle(self, *args, **options):
+        cases = queryplans.CASES
+        if options['update'] and options['case']:
+            raise CommandError('--update records every case; run it without --case.')
+        if options['case']:
+            unknown = set(options['case']) - {case.name for case in cases}
+            if unknown:
+                raise CommandError(f"Unknown case(s): {', '.join(sorted(unknown))}")
+            cases = [case for case in cases if case.name in options['case']]
+
+        with transaction.atomic():
+            if options['seed']:
+                try:
+                    queryplans.seed(options['seed'])
+                except ValueError as e:
+                    raise CommandError(f'{e} Run with --seed 0 to use them.')
+            results = queryplans.capture(cases)
+            transaction.set_rollback(True)
+
+        for result in results:
+            self.stdout.write(
+                f'{result.case.name:32} {result.status_code}  {result.queries:4} queries  {result.fingerprint}'
+            )
+            if options['verbosity'] > 1:
+                for plan in result.plans:
+                    self.stdout.write('    ' + ' | '.join(plan))
+
+        accepted = None if options['update'] else queryplans.load_snapshot().get(connection.vendor)
+        if accepted is None and not options['update']:
+            self.stdout.write(self.style.WARNING(f'No plans recorded for {connection.vendor}; only scans are checked.'))
+        if options['update']:
+            queryplans.save_snapshot(results)
+            self.stdout.write(f'Recorded {len(results)} cases for {connection.vendor} in {queryplans.snapshot_path()}')
+
+        problems = queryplans.problems(results, accepted)
+        if problems:
+            raise CommandError('\n'.join(problems))
+        self.stdout.write(self.style.SUCCESS('Query plans OK'))
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authapp import clustering
+
+
+class Command(BaseCommand):
+    help = (
+        "Group job applications with near-identical descriptions (MinHash/LSH) "
+        "and store each group's id in cluster_id."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--threshold', type=float, default=clustering.DEFAULT_THRESHOLD,
+            help='Minimum estimated Jaccard similarity of two descriptions\' word shingles.',
+        )
+        parser.add_argument('--bands', type=int, default=clustering.BANDS)
+        parser.add_argument('--batch-size', type=int, default=clustering.DOC_BATCH)
+        parser.add_argument('--dry-run', action='store_true', help='Compute the clusters without saving them.')
+
+    def handle(self, *args, **options):
+        if not clustering.available():
+            raise CommandError('NumPy is not installed; it is required to cluster job descriptions.')
+        if clustering.NUM_PERM % options['bands']:
+            raise CommandError(f'--bands must divide the signature length ({clustering.NUM_PERM}).')
+
+        start = time.perf_counter()
+        clusters, clustered, changed = clustering.cluster_descriptions(
+            threshold=options['threshold'], bands=options['bands'],
+            batch_size=options['batch_size'], dry_run=options['dry_run'],
+        )
+        verb = 'would change' if options['dry_run'] else 'changed'
+        self.stdout.write(self.style.SUCCESS(
+            f'{clustered} jobs in {clusters} clusters, {changed} rows {verb} ({time.perf_counter() - start:.1f}s)'
+        ))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand
+
+from authapp import dedup
+
+
+class Command(BaseCommand):
+    help = (
+        "Collapse job applications a BD added more than once (same normalized "
+        "company, title and URL) into a single job, merging their details."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report the duplicates without changing anything.')
+        parser.add_argument(
+            '--refingerprint', action='store_true',
+            help='Recompute every fingerprint first, e.g. after the normalization rules changed.',
+        )
+        parser.add_argument('--batch-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        fingerprinted = dedup.backfill_fingerprints(
+            batch_size=options['batch_size'], only_missing=not options['refingerprint']
+        )
+        if fingerprinted:
+            self.stdout.write(f'Fingerprinted {fingerprinted} jobs')
+
+        groups = removed = 0
+        # The group list is materialized first so deletes do not disturb the cursor
+        for bd_id, fingerprint, count in list(dedup.duplicate_groups().iterator(chunk_size=options['batch_size'])):
+            survivor, duplicates = dedup.collapse_group(bd_id, fingerprint, dry_run=dry_run)
+            if not duplicates:
+                continue
+            groups += 1
+            removed += len(duplicates)
+            if options['verbosity'] > 1:
+                self.stdout.write(f'{bd_id}: keeping job {survivor}, removing {", ".join(map(str, duplicates))}')
+
+        verb = 'Would remove' if dry_run else 'Removed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {removed} duplicate jobs in {groups} groups'))
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from authapp import partitioning
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the monthly partitions of range-partitioned tables from the current "
+        "month through PARTITION_MONTHS_AHEAD months ahead. Meant to run daily."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--months-ahead', type=int, default=getattr(settings, 'PARTITION_MONTHS_AHEAD', 3),
+        )
+
+    def handle(self, *args, **options):
+        try:
+            for table in partitioning.TABLES:
+                if partitioning.layout(table).scheme != 'range':
+                    self.stdout.write(f'{table}: not range partitioned, skipped')
+                    continue
+                created = partitioning.create_month_partitions(table, options['months_ahead'])
+                self.stdout.write(self.style.SUCCESS(
+                    f"{table}: created {', '.join(created)}" if created else f'{table}: up to date'
+                ))
+        except partitioning.PartitionError as exc:
+            raise CommandError(str(exc))
@@ -0,0 +1,37 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authapp import partitioning
+
+
+class Command(BaseCommand):
+    help = (
+        "Detach partitions of jobs or interview_schedules: monthly partitions "
+        "that end before --before, or the ones named with --partition. Detached "
+        "partitions stay as standalone tables unless --drop is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('table', choices=partitioning.TABLES)
+        parser.add_argument('--before', type=date.fromisoformat, help='YYYY-MM-DD; range partitioning only.')
+        parser.add_argument('--partition', action='append', default=[], help='Repeatable.')
+        parser.add_argument('--drop', action='store_true', help='Drop the detached tables.')
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        table = options['table']
+        try:
+            names = list(options['partition'])
+            if options['before']:
+                names += [name for name in partitioning.partitions_before(table, options['before']) if name not in names]
+            if not names:
+                raise CommandError('Nothing to detach; give --before or --partition.')
+            if options['dry_run']:
+                self.stdout.write(f"Would detach from {table}: {', '.join(names)}")
+                return
+            partitioning.detach(table, names, drop=options['drop'])
+        except partitioning.PartitionError as exc:
+            raise CommandError(str(exc))
+        action = 'Detached and dropped' if options['drop'] else 'Detached'
+        self.stdout.write(self.style.SUCCESS(f"{action} {', '.join(names)}"))
@@ -0,0 +1,51 @@
+import csv
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from authapp import reports
+from authapp.models import BDReportRun
+
+
+class Command(BaseCommand):
+    help = "Generate the weekly per-BD performance reports, one worker process per BD at a time."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--week', help='Any day of the week to report on (YYYY-MM-DD); default the last complete week.')
+        parser.add_argument('--processes', type=int, help='Worker processes (default REPORT_PROCESSES, or one per CPU).')
+        parser.add_argument('--csv', dest='csv_path', help='Also write the reports to this CSV file.')
+
+    def handle(self, *args, **options):
+        try:
+            day = date.fromisoformat(options['week']) if options['week'] else None
+        except ValueError:
+            raise CommandError('--week must be YYYY-MM-DD')
+
+        week_start, week_end = reports.week_bounds(day)
+        run = BDReportRun.objects.create(week_start=week_start, week_end=week_end)
+        self.stdout.write(f'Run {run.run_id}: week {week_start} to {week_end}')
+        run = reports.run_report(run, processes=options['processes'])
+
+        if options['csv_path']:
+            self.write_csv(options['csv_path'], reports.report_rows(run))
+        if run.status == 'failed':
+            raise CommandError(f'{run.completed_bds}/{run.total_bds} BD reports written; failures:\n{run.error}')
+        self.stdout.write(self.style.SUCCESS(f'{run.completed_bds}/{run.total_bds} BD reports written'))
+
+    @staticmethod
+    def write_csv(path, rows):
+        columns = ['bd_id', 'bd_name', 'jobs_total', 'interviews_scheduled', 'interview_rate', 'offer_rate',
+                   'acceptance_rate', 'rejection_rate', 'jobs_by_status', 'top_skills']
+        with open(path, 'w', newline='') as handle:
+            writer = csv.DictWriter(handle, fieldnames=columns)
+            writer.writeheader()
+            for row in rows:
+                writer.writerow({
+                    'bd_id': row['bd_id'],
+                    'bd_name': row['bd_name'],
+                    'jobs_total': row['jobs_total'],
+                    'interviews_scheduled': row['interviews_scheduled'],
+                    **row['conversion'],
+                    'jobs_by_status': '; '.join(f'{name}: {count}' for name, count in row['jobs_by_status'].items()),
+                    'top_skills': ', '.join(item['skill'] for item in row['top_skills']),
+                })
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from authapp import partitioning
+
+
+class Command(BaseCommand):
+    help = (
+        "Show how jobs and interview_schedules are partitioned, or convert them "
+        "to PostgreSQL declarative partitioning (hash on bd_id or monthly range "
+        "on created_at). The conversion copies each table under an ACCESS "
+        "EXCLUSIVE lock and drops the foreign keys that reference jobs."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scheme', choices=sorted(partitioning.KEYS), help='Convert with this scheme. Default: only show the layout.')
+        parser.add_argument('--table', action='append', choices=partitioning.TABLES, help='Repeatable. Default: both tables.')
+        parser.add_argument(
+            '--partitions', type=int, default=getattr(settings, 'PARTITION_HASH_PARTITIONS', 16),
+            help='Hash partitions per table.',
+        )
+        parser.add_argument(
+            '--months-ahead', type=int, default=getattr(settings, 'PARTITION_MONTHS_AHEAD', 3),
+            help='Monthly range partitions to create past the current month.',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='Print the statements without running them.')
+
+    def handle(self, *args, **options):
+        tables = options['table'] or list(partitioning.TABLES)
+        try:
+            if not options['scheme']:
+                for table in tables:
+                    self.show(partitioning.layout(table))
+                return
+            if options['scheme'] == 'hash' and options['partitions'] < 2:
+                raise CommandError('--partitions must be at least 2.')
+            for table in tables:
+                if options['dry_run']:
+                    statements, dropped = partitioning.conversion_sql(
+                        table, options['scheme'], options['partitions'], options['months_ahead'],
+                    )
+                    self.stdout.write(';\n'.join(statements) + ';')
+                else:
+                    statements, dropped = partitioning.convert(
+                        table, options['scheme'], options['partitions'], options['months_ahead'],
+                    )
+                    self.stdout.write(self.style.SUCCESS(f"Partitioned {table} by {options['scheme']} ({len(statements)} statements)"))
+                for name, owner in dropped:
+                    self.stdout.write(f'    foreign key {name} on {owner} dropped')
+        except partitioning.PartitionError as exc:
+            raise CommandError(str(exc))
+
+    def show(self, layout):
+        if not layout.scheme:
+            self.stdout.write(f'{layout.table}: not partitioned')
+            return
+        self.stdout.write(f'{layout.table}: {layout.scheme} on {layout.key}, {len(layout.partitions)} partitions')
+        for partition in layout.partitions:
+            self.stdout.write(f'    {partition.name:32} {partition.rows:10} rows  {partition.bound}')
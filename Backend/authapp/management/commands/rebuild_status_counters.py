@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from authapp.workflow import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-BD/per-status job counters from the jobs table and the status transition log."
+
+    def handle(self, *args, **options):
+        rows = rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {rows} job status counter rows.'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from authapp.analytics import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = "Refresh the job application analytics rollup incrementally, or rebuild it with --full."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute every day instead of the changed ones.')
+
+    def handle(self, *args, **options):
+        result = refresh_rollups(full=options['full'])
+        for basis, days in result.items():
+            detail = 'rebuilt' if days is None else f'{days} days recomputed'
+            self.stdout.write(self.style.SUCCESS(f'{basis}: {detail}'))
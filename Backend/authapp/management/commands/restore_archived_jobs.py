@@ -0,0 +1,42 @@
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from authapp import archive
+
+
+def _moment(value):
+    moment = datetime.fromisoformat(value)
+    return timezone.make_aware(moment) if timezone.is_naive(moment) else moment
+
+
+class Command(BaseCommand):
+    help = (
+        "Move archived jobs and their interviews back to the live tables: the "
+        "jobs given by id, one BD's with --bd, those archived since "
+        "--archived-since, or all with --all. A restored job that still "
+        "qualifies is archived again by the next archive_jobs run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('job_ids', nargs='*', type=int)
+        parser.add_argument('--bd')
+        parser.add_argument('--archived-since', type=_moment, help='ISO date or date-time.')
+        parser.add_argument('--all', action='store_true')
+        parser.add_argument('--batch-size', type=int, default=settings.ARCHIVE_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Count the jobs that would move.')
+
+    def handle(self, *args, **options):
+        job_ids = options['job_ids'] or None
+        if not (job_ids or options['bd'] or options['archived_since'] or options['all']):
+            raise CommandError('Nothing to restore; give job ids, --bd, --archived-since or --all.')
+        selection = (job_ids, options['bd'], options['archived_since'])
+        if options['dry_run']:
+            self.stdout.write(f'Would restore {archive.restorable(*selection).count()} jobs')
+            return
+        result = archive.restore_jobs(*selection, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Restored {result.jobs} jobs and {result.interviews} interviews in {result.batches} batches'
+        ))
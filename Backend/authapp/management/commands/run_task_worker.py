@@ -0,0 +1,68 @@
+import multiprocessing
+import os
+import signal
+import socket
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from authapp import tasks
+from backend.log import use_plain_handlers
+
+
+def _work(options, forked=False):
+    if forked:
+        # The log listener thread stayed in the parent
+        use_plain_handlers()
+    stopping = []
+
+    def stop(signum, frame):
+        stopping.append(signum)
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    worker = f'{socket.gethostname()}:{os.getpid()}'
+    try:
+        return tasks.run_worker(
+            worker, once=options['once'], batch_size=options['batch_size'],
+            poll_interval=options['poll_interval'], should_stop=lambda: bool(stopping),
+        )
+    finally:
+        connections.close_all()
+
+
+class Command(BaseCommand):
+    help = (
+        "Run background task workers. SIGTERM/SIGINT finish the running task, "
+        "put the rest of the claimed batch back and exit."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help='Worker processes to start.')
+        parser.add_argument('--once', action='store_true', help='Exit when no task is due.')
+        parser.add_argument('--batch-size', type=int, default=10, help='Tasks claimed per round trip.')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds to wait when the queue is empty.')
+
+    def handle(self, *args, **options):
+        if options['processes'] <= 1:
+            processed = _work(options)
+            self.stdout.write(f'Processed {processed} tasks')
+            return
+
+        # Children must not share the parent's database connections
+        connections.close_all()
+        context = multiprocessing.get_context('fork')
+        workers = [context.Process(target=_work, args=(options, True)) for _ in range(options['processes'])]
+        for process in workers:
+            process.start()
+
+        def forward(signum, frame):
+            for process in workers:
+                if process.is_alive():
+                    os.kill(process.pid, signal.SIGTERM)
+
+        signal.signal(signal.SIGTERM, forward)
+        signal.signal(signal.SIGINT, forward)
+        for process in workers:
+            process.join()
+        self.stdout.write(f'{len(workers)} workers stopped')
@@ -0,0 +1,61 @@
+import json
+import os
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from backend import startup
+
+
+class Command(BaseCommand):
+    help = (
+        "Boot Django in a fresh interpreter the way a worker does and break "
+        "down start-up time and resident memory: settings, per-app import and "
+        "ready(), middleware, URLconf and the slowest imports."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3, help='Boot this many times and report the fastest.')
+        parser.add_argument('--top', type=int, default=15, help='Number of packages and modules to list.')
+        parser.add_argument('--api-only', action='store_true', help='Boot with API_ONLY=1.')
+
+    def handle(self, *args, **options):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE)
+        if options['api_only']:
+            env['API_ONLY'] = '1'
+        command = [sys.executable, '-X', 'importtime', '-c', 'from backend.startup import measure; measure()']
+
+        best = None
+        for _ in range(max(1, options['runs'])):
+            process = subprocess.run(command, cwd=settings.BASE_DIR, env=env, capture_output=True, text=True)
+            if process.returncode:
+                raise CommandError(f'The measured interpreter failed:\n{process.stderr[-2000:]}')
+            report = json.loads(process.stdout.strip().splitlines()[-1])
+            if best is None or report['total'] < best[0]['total']:
+                best = report, startup.parse_importtime(process.stderr)
+        report, imports = best
+
+        self.stdout.write(f"{report['settings']} on Python {report['python']}, {report['modules']} modules loaded")
+        self.stdout.write(f"{'phase':16} {'ms':>8} {'RSS MiB':>8}")
+        for name, seconds, rss in report['phases']:
+            self.stdout.write(f'{name:16} {seconds * 1000:8.1f} {rss / 1024:8.1f}')
+        self.stdout.write(f"{'total':16} {report['total'] * 1000:8.1f}")
+
+        self.stdout.write(f"\n{'app':36} {'import ms':>9} {'models ms':>9} {'ready ms':>9}")
+        for label, create, models, ready in report['apps']:
+            self.stdout.write(f'{label:36} {create * 1000:9.1f} {models * 1000:9.1f} {ready * 1000:9.1f}')
+
+        packages = defaultdict(float)
+        for module, own, _, _ in imports:
+            packages[module.partition('.')[0]] += own
+        self.stdout.write(f"\n{'package':36} {'import ms':>9}")
+        for package, seconds in sorted(packages.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f'{package:36} {seconds * 1000:9.1f}')
+
+        self.stdout.write(f"\n{'module (cumulative)':60} {'ms':>8}")
+        first_party = [row for row in imports if row[0].partition('.')[0] in ('authapp', 'backend', 'api', 'accounts')]
+        for module, _, cumulative, _ in sorted(first_party, key=lambda row: -row[2])[:options['top']]:
+            self.stdout.write(f'{module:60} {cumulative * 1000:8.1f}')
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from authapp.signals import refresh_all_display_fields
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalized BD/developer display columns on jobs and interview schedules."
+
+    def handle(self, *args, **options):
+        jobs, interviews = refresh_all_display_fields()
+        self.stdout.write(self.style.SUCCESS(
+            f'Refreshed display fields on {jobs} job applications and {interviews} interview schedules.'
+        ))
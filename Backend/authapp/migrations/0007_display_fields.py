@@ -0,0 +1,74 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:05
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Concat
+
+
+def fill_display_fields(apps, schema_editor):
+    BD = apps.get_model('authapp', 'BD')
+    Developer_data = apps.get_model('authapp', 'Developer_data')
+    JobApplication = apps.get_model('authapp', 'JobApplication')
+    InterviewSchedule = apps.get_model('authapp', 'InterviewSchedule')
+
+    bd = BD.objects.filter(BD_id=OuterRef('bd_id'))
+    developer = Developer_data.objects.filter(office_id=OuterRef('dev_id')).annotate(
+        display_name=Concat('firstName', Value(' '), 'lastName')
+    )
+    bd_values = {
+        'bd_display_name': Subquery(bd.values('name')[:1]),
+        'bd_display_email': Subquery(bd.values('email')[:1]),
+    }
+    JobApplication.objects.update(**bd_values)
+    InterviewSchedule.objects.update(
+        dev_display_name=Subquery(developer.values('display_name')[:1]),
+        dev_display_email=Subquery(developer.values('email')[:1]),
+        dev_display_title=Subquery(developer.values('professionalTitle')[:1]),
+        **bd_values
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0006_interviewschedule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='interviewschedule',
+            name='bd_display_email',
+            field=models.EmailField(blank=True, default='', max_length=254),
+        ),
+        migrations.AddField(
+            model_name='interviewschedule',
+            name='bd_display_name',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='interviewschedule',
+            name='dev_display_email',
+            field=models.EmailField(blank=True, default='', max_length=254),
+        ),
+        migrations.AddField(
+            model_name='interviewschedule',
+            name='dev_display_name',
+            field=models.CharField(blank=True, default='', max_length=201),
+        ),
+        migrations.AddField(
+            model_name='interviewschedule',
+            name='dev_display_title',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='bd_display_email',
+            field=models.EmailField(blank=True, default='', max_length=254),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='bd_display_name',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.RunPython(fill_display_fields, migrations.RunPython.noop),
+    ]
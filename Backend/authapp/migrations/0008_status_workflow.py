@@ -0,0 +1,80 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:16
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import Count, F
+
+
+def backfill_status_log(apps, schema_editor):
+    """Start every existing job's history at its current status."""
+    JobApplication = apps.get_model('authapp', 'JobApplication')
+    JobStatusTransition = apps.get_model('authapp', 'JobStatusTransition')
+    JobStatusCounter = apps.get_model('authapp', 'JobStatusCounter')
+
+    JobApplication.objects.update(status_changed_at=F('created_at'))
+    jobs = JobApplication.objects.order_by('job_id').values_list('job_id', 'bd_id', 'application_status', 'created_at')
+    batch = []
+    for job_id, bd_id, application_status, created_at in jobs.iterator(chunk_size=2000):
+        batch.append(JobStatusTransition(
+            job_id_id=job_id, bd_id=bd_id, to_status=application_status, changed_at=created_at
+        ))
+        if len(batch) == 2000:
+            JobStatusTransition.objects.bulk_create(batch)
+            batch = []
+    JobStatusTransition.objects.bulk_create(batch)
+
+    totals = JobApplication.objects.order_by().values('bd_id', 'application_status').annotate(n=Count('pk'))
+    JobStatusCounter.objects.bulk_create(
+        JobStatusCounter(bd_id=item['bd_id'], status=item['application_status'], current=item['n'], entered=item['n'])
+        for item in totals
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0007_display_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='status_changed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='JobStatusCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bd_id', models.CharField(max_length=50)),
+                ('status', models.CharField(max_length=50)),
+                ('current', models.IntegerField(default=0)),
+                ('entered', models.IntegerField(default=0)),
+                ('exited', models.IntegerField(default=0)),
+                ('seconds_in_stage', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'job_status_counters',
+                'constraints': [models.UniqueConstraint(fields=('bd_id', 'status'), name='job_status_counter_unique')],
+            },
+        ),
+        migrations.CreateModel(
+            name='JobStatusTransition',
+            fields=[
+                ('transition_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('bd_id', models.CharField(max_length=50)),
+                ('from_status', models.CharField(blank=True, max_length=50, null=True)),
+                ('to_status', models.CharField(max_length=50)),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('seconds_in_previous', models.BigIntegerField(default=0)),
+                ('job_id', models.ForeignKey(db_column='job_id', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='status_transitions', to='authapp.jobapplication')),
+            ],
+            options={
+                'db_table': 'job_status_transitions',
+                'ordering': ['changed_at', 'transition_id'],
+                'indexes': [models.Index(fields=['job_id', 'changed_at'], name='job_transition_job_idx'), models.Index(fields=['bd_id', 'changed_at'], name='job_transition_bd_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_status_log, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0008_status_workflow'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobApplicationRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('basis', models.CharField(choices=[('applied_date', 'applied_date'), ('created_at', 'created_at')], max_length=20)),
+                ('day', models.DateField()),
+                ('bd_id', models.CharField(max_length=50)),
+                ('platform', models.CharField(max_length=50)),
+                ('application_status', models.CharField(max_length=50)),
+                ('job_type', models.CharField(blank=True, default='', max_length=50)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'job_application_rollups',
+            },
+        ),
+        migrations.CreateModel(
+            name='JobRollupDirtyDay',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('basis', models.CharField(max_length=20)),
+                ('day', models.DateField()),
+            ],
+            options={
+                'db_table': 'job_rollup_dirty_days',
+            },
+        ),
+        migrations.CreateModel(
+            name='RollupState',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('watermark', models.DateTimeField(blank=True, null=True)),
+                ('refreshed_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'rollup_state',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['updated_at'], name='jobs_updated_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplicationrollup',
+            index=models.Index(fields=['basis', 'day'], name='job_rollup_basis_day_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobrollupdirtyday',
+            constraint=models.UniqueConstraint(fields=('basis', 'day'), name='job_rollup_dirty_day_unique'),
+        ),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:21
+
+import hashlib
+import re
+import unicodedata
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+from django.db import migrations, models
+
+# A copy of authapp.dedup.job_fingerprint as of this migration, so later
+# changes to the live module cannot change what this migration computes.
+TRACKING_PARAMS = frozenset({
+    'gclid', 'fbclid', 'msclkid', 'dclid', 'mc_cid', 'mc_eid', '_hsenc', '_hsmi',
+    'ref', 'refid', 'ref_src', 'referrer', 'src', 'source', 'from',
+    'trk', 'trkinfo', 'trackingid', 'tracking_id', 'lipi', 'gh_src',
+    'vjs', 'tk', 'sid', 'session_id',
+})
+TRACKING_PREFIXES = ('utm_',)
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+_NON_WORD = re.compile(r'[\W_]+')
+_ASCII_NON_WORD = str.maketrans({
+    chr(code): ' ' for code in range(128) if not chr(code).isalnum()
+})
+
+
+def normalize_text(value):
+    if not value:
+        return ''
+    if value.isascii():
+        return ' '.join(value.lower().translate(_ASCII_NON_WORD).split())
+    value = unicodedata.normalize('NFKC', value).casefold()
+    return _NON_WORD.sub(' ', value).strip()
+
+
+def canonical_url(url):
+    if not url:
+        return ''
+    try:
+        parts = urlsplit(url.strip())
+        port = parts.port
+    except ValueError:
+        return url.strip().casefold()
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    for prefix in ('www.', 'm.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    if port is not None and str(port) != DEFAULT_PORTS.get(scheme):
+        host = f'{host}:{port}'
+
+    path = re.sub(r'/{2,}', '/', parts.path).rstrip('/')
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PREFIXES)
+    )
+    return f'{host}{path}?{urlencode(query)}' if query else f'{host}{path}'
+
+
+def job_fingerprint(company, job_title, job_url):
+    key = '\x1f'.join((normalize_text(company), normalize_text(job_title), canonical_url(job_url)))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+
+def backfill_fingerprints(apps, schema_editor):
+    """Fingerprint existing jobs; duplicates are left for collapse_duplicate_jobs."""
+    JobApplication = apps.get_model('authapp', 'JobApplication')
+    jobs = JobApplication.objects.order_by('job_id').only('job_id', 'company', 'job_title', 'job_url')
+    batch = []
+    for job in jobs.iterator(chunk_size=2000):
+        job.dedup_fingerprint = job_fingerprint(job.company, job.job_title, job.job_url)
+        batch.append(job)
+        if len(batch) == 2000:
+            JobApplication.objects.bulk_update(batch, ['dedup_fingerprint'])
+            batch = []
+    JobApplication.objects.bulk_update(batch, ['dedup_fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0009_analytics_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='dedup_fingerprint',
+            field=models.CharField(blank=True, default='', editable=False, max_length=40),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['bd_id', 'dedup_fingerprint'], name='jobs_bd_fingerprint_idx'),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+    ]
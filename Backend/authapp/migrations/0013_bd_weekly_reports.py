@@ -0,0 +1,56 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0012_background_tasks'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BDReportRun',
+            fields=[
+                ('run_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('week_start', models.DateField()),
+                ('week_end', models.DateField()),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('total_bds', models.IntegerField(default=0)),
+                ('completed_bds', models.IntegerField(default=0)),
+                ('error', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'bd_report_runs',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='BDWeeklyReport',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bd_id', models.CharField(max_length=50)),
+                ('bd_name', models.CharField(blank=True, default='', max_length=100)),
+                ('week_start', models.DateField()),
+                ('jobs_total', models.IntegerField(default=0)),
+                ('jobs_by_status', models.JSONField(default=dict)),
+                ('transitions_by_status', models.JSONField(default=dict)),
+                ('interviews_scheduled', models.IntegerField(default=0)),
+                ('conversion', models.JSONField(default=dict)),
+                ('top_skills', models.JSONField(default=list)),
+                ('generated_at', models.DateTimeField(auto_now_add=True)),
+                ('run', models.ForeignKey(db_column='run_id', on_delete=django.db.models.deletion.CASCADE, related_name='reports', to='authapp.bdreportrun')),
+            ],
+            options={
+                'db_table': 'bd_weekly_reports',
+                'ordering': ['bd_id'],
+                'indexes': [models.Index(fields=['bd_id', 'week_start'], name='bd_weekly_report_bd_idx')],
+                'constraints': [models.UniqueConstraint(fields=('run', 'bd_id'), name='bd_weekly_report_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0013_bd_weekly_reports'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='developer_data',
+            index=models.Index(fields=['updated_at'], name='developer_updated_at_idx'),
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:34
+
+from django.db import migrations, models
+
+
+def backfill_experience_years(apps, schema_editor):
+    from authapp.experience import experience_years
+
+    for model_name in ('BD', 'Developer_data'):
+        model = apps.get_model('authapp', model_name)
+        rows = model.objects.order_by('pk').only('pk', 'experience')
+        batch = []
+        for row in rows.iterator(chunk_size=2000):
+            row.experience_min_years, row.experience_max_years = experience_years(row.experience)
+            batch.append(row)
+            if len(batch) == 2000:
+                model.objects.bulk_update(batch, ['experience_min_years', 'experience_max_years'])
+                batch = []
+        model.objects.bulk_update(batch, ['experience_min_years', 'experience_max_years'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0014_developer_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bd',
+            name='experience_max_years',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='bd',
+            name='experience_min_years',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='developer_data',
+            name='experience_max_years',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='developer_data',
+            name='experience_min_years',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='bd',
+            index=models.Index(fields=['experience_min_years'], name='bd_exp_min_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bd',
+            index=models.Index(fields=['experience_max_years'], name='bd_exp_max_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bd',
+            index=models.Index(fields=['availability'], name='bd_availability_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='developer_data',
+            index=models.Index(fields=['experience_min_years'], name='developer_exp_min_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='developer_data',
+            index=models.Index(fields=['experience_max_years'], name='developer_exp_max_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='developer_data',
+            index=models.Index(fields=['availability'], name='developer_availability_idx'),
+        ),
+        migrations.RunPython(backfill_experience_years, migrations.RunPython.noop),
+    ]
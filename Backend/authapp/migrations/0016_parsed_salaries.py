@@ -0,0 +1,112 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:37
+
+from django.db import migrations, models
+
+
+def backfill_salaries(apps, schema_editor):
+    from authapp.compensation import parse_salary, salary_values
+
+    for model_name, text_field in (('Developer_data', 'Salary'), ('BD', 'salary'), ('JobApplication', 'salary_range')):
+        model = apps.get_model('authapp', model_name)
+        # Updated per distinct parse result; salary texts repeat a lot
+        changes = {}
+        for pk, text in model.objects.order_by('pk').values_list('pk', text_field).iterator(chunk_size=2000):
+            changes.setdefault(parse_salary(text), []).append(pk)
+        for salary, pks in changes.items():
+            for start in range(0, len(pks), 2000):
+                model.objects.filter(pk__in=pks[start:start + 2000]).update(**salary_values(salary))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0015_experience_years'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bd',
+            name='salary_currency',
+            field=models.CharField(blank=True, default='', editable=False, max_length=3),
+        ),
+        migrations.AddField(
+            model_name='bd',
+            name='salary_max',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='bd',
+            name='salary_min',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='bd',
+            name='salary_period',
+            field=models.CharField(blank=True, editable=False, max_length=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='developer_data',
+            name='salary_currency',
+            field=models.CharField(blank=True, default='', editable=False, max_length=3),
+        ),
+        migrations.AddField(
+            model_name='developer_data',
+            name='salary_max',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='developer_data',
+            name='salary_min',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='developer_data',
+            name='salary_period',
+            field=models.CharField(blank=True, editable=False, max_length=5, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='salary_currency',
+            field=models.CharField(blank=True, default='', editable=False, max_length=3),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='salary_max',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='salary_min',
+            field=models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True),
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='salary_period',
+            field=models.CharField(blank=True, editable=False, max_length=5, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='bd',
+            index=models.Index(fields=['salary_period', 'salary_currency', 'salary_min'], name='bd_salary_min_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bd',
+            index=models.Index(fields=['salary_period', 'salary_currency', 'salary_max'], name='bd_salary_max_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='developer_data',
+            index=models.Index(fields=['salary_period', 'salary_currency', 'salary_min'], name='developer_salary_min_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='developer_data',
+            index=models.Index(fields=['salary_period', 'salary_currency', 'salary_max'], name='developer_salary_max_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['salary_period', 'salary_currency', 'salary_min'], name='jobs_salary_min_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['salary_period', 'salary_currency', 'salary_max'], name='jobs_salary_max_idx'),
+        ),
+        migrations.RunPython(backfill_salaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0016_parsed_salaries'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['project_deadline', 'client_id'], name='client_deadline_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.5 on 2026-10-19 12:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0018_idempotency_records'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='developer_data',
+            index=models.Index(fields=['created_at', '-office_id'], name='developer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['created_at'], name='jobs_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['bd_id', 'created_at'], name='jobs_bd_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['application_status', 'created_at'], name='jobs_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['platform'], name='jobs_platform_idx'),
+        ),
+    ]
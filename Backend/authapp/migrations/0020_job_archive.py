@@ -0,0 +1,157 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:12
+
+import authapp.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+from authapp.archive import create_views, drop_views
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0019_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InterviewScheduleWithArchive',
+            fields=[
+                ('company_name', models.CharField(max_length=200)),
+                ('role', models.CharField(max_length=150)),
+                ('interview_date', models.DateField()),
+                ('interview_time', models.TimeField()),
+                ('company_url', models.URLField(blank=True, max_length=500, null=True)),
+                ('bd_display_name', models.CharField(blank=True, default='', max_length=100)),
+                ('bd_display_email', models.EmailField(blank=True, default='', max_length=254)),
+                ('dev_display_name', models.CharField(blank=True, default='', max_length=201)),
+                ('dev_display_email', models.EmailField(blank=True, default='', max_length=254)),
+                ('dev_display_title', models.CharField(blank=True, default='', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('interview_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'interview_schedules_with_archive',
+                'ordering': ['-created_at'],
+                'managed': False,
+            },
+            bases=(authapp.models.ReadOnlyView, models.Model),
+        ),
+        migrations.CreateModel(
+            name='JobApplicationWithArchive',
+            fields=[
+                ('job_title', models.CharField(max_length=200)),
+                ('company', models.CharField(max_length=200)),
+                ('location', models.CharField(blank=True, max_length=200, null=True)),
+                ('salary_range', models.CharField(blank=True, max_length=100, null=True)),
+                ('salary_min', models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True)),
+                ('salary_max', models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True)),
+                ('salary_currency', models.CharField(blank=True, default='', editable=False, max_length=3)),
+                ('salary_period', models.CharField(blank=True, editable=False, max_length=5, null=True)),
+                ('job_type', models.CharField(blank=True, choices=[('Full-time', 'Full-time'), ('Part-time', 'Part-time'), ('Contract', 'Contract'), ('Freelance', 'Freelance'), ('Internship', 'Internship'), ('Remote', 'Remote'), ('Hybrid', 'Hybrid')], max_length=50, null=True)),
+                ('experience_level', models.CharField(blank=True, choices=[('Entry Level', 'Entry Level'), ('Junior (1-2 years)', 'Junior (1-2 years)'), ('Mid-Level (3-5 years)', 'Mid-Level (3-5 years)'), ('Senior (5+ years)', 'Senior (5+ years)'), ('Lead/Principal', 'Lead/Principal'), ('Executive', 'Executive')], max_length=50, null=True)),
+                ('platform', models.CharField(choices=[('LinkedIn', 'LinkedIn'), ('Indeed', 'Indeed'), ('Glassdoor', 'Glassdoor'), ('AngelList', 'AngelList'), ('Stack Overflow Jobs', 'Stack Overflow Jobs'), ('GitHub Jobs', 'GitHub Jobs'), ('Company Website', 'Company Website'), ('Referral', 'Referral'), ('Other', 'Other')], max_length=50)),
+                ('job_url', models.URLField(blank=True, null=True)),
+                ('skills', models.JSONField(default=list, help_text='List of required skills')),
+                ('job_description', models.TextField(blank=True, null=True)),
+                ('key_requirements', models.TextField(blank=True, null=True)),
+                ('personal_notes', models.TextField(blank=True, null=True)),
+                ('application_status', models.CharField(choices=[('Applied', 'Applied'), ('Under Review', 'Under Review'), ('Interview Scheduled', 'Interview Scheduled'), ('Interview Completed', 'Interview Completed'), ('Offer Received', 'Offer Received'), ('Rejected', 'Rejected'), ('Withdrawn', 'Withdrawn'), ('Accepted', 'Accepted')], default='Applied', max_length=50)),
+                ('status_changed_at', models.DateTimeField(blank=True, null=True)),
+                ('bd_display_name', models.CharField(blank=True, default='', max_length=100)),
+                ('bd_display_email', models.EmailField(blank=True, default='', max_length=254)),
+                ('dedup_fingerprint', models.CharField(blank=True, default='', editable=False, max_length=40)),
+                ('cluster_id', models.IntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('applied_date', models.DateField(auto_now_add=True)),
+                ('job_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('archived_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'jobs_with_archive',
+                'ordering': ['-created_at'],
+                'managed': False,
+            },
+            bases=(authapp.models.ReadOnlyView, models.Model),
+        ),
+        migrations.AlterField(
+            model_name='jobstatustransition',
+            name='job_id',
+            field=models.ForeignKey(db_column='job_id', db_constraint=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='status_transitions', to='authapp.jobapplication'),
+        ),
+        migrations.CreateModel(
+            name='ArchivedJobApplication',
+            fields=[
+                ('job_title', models.CharField(max_length=200)),
+                ('company', models.CharField(max_length=200)),
+                ('location', models.CharField(blank=True, max_length=200, null=True)),
+                ('salary_range', models.CharField(blank=True, max_length=100, null=True)),
+                ('salary_min', models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True)),
+                ('salary_max', models.DecimalField(blank=True, decimal_places=2, editable=False, max_digits=14, null=True)),
+                ('salary_currency', models.CharField(blank=True, default='', editable=False, max_length=3)),
+                ('salary_period', models.CharField(blank=True, editable=False, max_length=5, null=True)),
+                ('job_type', models.CharField(blank=True, choices=[('Full-time', 'Full-time'), ('Part-time', 'Part-time'), ('Contract', 'Contract'), ('Freelance', 'Freelance'), ('Internship', 'Internship'), ('Remote', 'Remote'), ('Hybrid', 'Hybrid')], max_length=50, null=True)),
+                ('experience_level', models.CharField(blank=True, choices=[('Entry Level', 'Entry Level'), ('Junior (1-2 years)', 'Junior (1-2 years)'), ('Mid-Level (3-5 years)', 'Mid-Level (3-5 years)'), ('Senior (5+ years)', 'Senior (5+ years)'), ('Lead/Principal', 'Lead/Principal'), ('Executive', 'Executive')], max_length=50, null=True)),
+                ('platform', models.CharField(choices=[('LinkedIn', 'LinkedIn'), ('Indeed', 'Indeed'), ('Glassdoor', 'Glassdoor'), ('AngelList', 'AngelList'), ('Stack Overflow Jobs', 'Stack Overflow Jobs'), ('GitHub Jobs', 'GitHub Jobs'), ('Company Website', 'Company Website'), ('Referral', 'Referral'), ('Other', 'Other')], max_length=50)),
+                ('job_url', models.URLField(blank=True, null=True)),
+                ('skills', models.JSONField(default=list, help_text='List of required skills')),
+                ('job_description', models.TextField(blank=True, null=True)),
+                ('key_requirements', models.TextField(blank=True, null=True)),
+                ('personal_notes', models.TextField(blank=True, null=True)),
+                ('application_status', models.CharField(choices=[('Applied', 'Applied'), ('Under Review', 'Under Review'), ('Interview Scheduled', 'Interview Scheduled'), ('Interview Completed', 'Interview Completed'), ('Offer Received', 'Offer Received'), ('Rejected', 'Rejected'), ('Withdrawn', 'Withdrawn'), ('Accepted', 'Accepted')], default='Applied', max_length=50)),
+                ('status_changed_at', models.DateTimeField(blank=True, null=True)),
+                ('bd_display_name', models.CharField(blank=True, default='', max_length=100)),
+                ('bd_display_email', models.EmailField(blank=True, default='', max_length=254)),
+                ('dedup_fingerprint', models.CharField(blank=True, default='', editable=False, max_length=40)),
+                ('cluster_id', models.IntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('applied_date', models.DateField(auto_now_add=True)),
+                ('job_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('archived_at', models.DateTimeField()),
+                ('bd_id', models.ForeignKey(db_column='bd_id', on_delete=django.db.models.deletion.CASCADE, to='authapp.bd')),
+            ],
+            options={
+                'db_table': 'jobs_archive',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedInterviewSchedule',
+            fields=[
+                ('company_name', models.CharField(max_length=200)),
+                ('role', models.CharField(max_length=150)),
+                ('interview_date', models.DateField()),
+                ('interview_time', models.TimeField()),
+                ('company_url', models.URLField(blank=True, max_length=500, null=True)),
+                ('bd_display_name', models.CharField(blank=True, default='', max_length=100)),
+                ('bd_display_email', models.EmailField(blank=True, default='', max_length=254)),
+                ('dev_display_name', models.CharField(blank=True, default='', max_length=201)),
+                ('dev_display_email', models.EmailField(blank=True, default='', max_length=254)),
+                ('dev_display_title', models.CharField(blank=True, default='', max_length=100)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('interview_id', models.IntegerField(primary_key=True, serialize=False)),
+                ('archived_at', models.DateTimeField()),
+                ('bd_id', models.ForeignKey(db_column='bd_id', on_delete=django.db.models.deletion.CASCADE, to='authapp.bd')),
+                ('dev_id', models.ForeignKey(db_column='dev_id', on_delete=django.db.models.deletion.CASCADE, to='authapp.developer_data')),
+                ('job_id', models.ForeignKey(db_column='job_id', on_delete=django.db.models.deletion.CASCADE, to='authapp.archivedjobapplication')),
+            ],
+            options={
+                'db_table': 'interview_schedules_archive',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='archivedjobapplication',
+            index=models.Index(fields=['created_at'], name='jobs_archive_created_at_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='archivedjobapplication',
+            index=models.Index(fields=['bd_id', 'created_at'], name='jobs_archive_bd_created_idx'),
+        ),
+        migrations.RunPython(create_views, drop_views),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-19 13:58
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authapp', '0020_job_archive'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='developer_data',
+            name='developer_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='jobapplication',
+            name='jobs_created_at_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='jobapplication',
+            name='jobs_status_created_idx',
+        ),
+    ]
@@ -1,4 +1,7 @@
-from django.db import models
+from django.db import models, router, transaction
+from django.utils import timezone
+
+from .partitioning import PartitionedQuerySet
 
 class BaseUser(models.Model):
     full_name = models.CharField(max_length=100)
@@ -26,6 +29,12 @@ class Client(models.Model):
     project_deadline = models.DateField()
     project_name = models.CharField(max_length=100)
 
+    class Meta:
+        indexes = [
+            # Deadline feed: range filters and keyset pagination (authapp.portfolio)
+            models.Index(fields=['project_deadline', 'client_id'], name='client_deadline_idx'),
+        ]
+
     def __str__(self):
         return f"{self.client_name} - {self.project_name}"
 
@@ -72,6 +81,16 @@ class Developer_data(models.Model):
     experience = models.CharField(max_length=20, choices=EXPERIENCE_CHOICES)
     Salary = models.CharField(max_length=100, help_text="Salary information")
     availability = models.CharField(max_length=20, choices=AVAILABILITY_CHOICES, default='Full-time')
+
+    # Bounds of `experience` in years (authapp.experience); max is NULL for 'N+ years'
+    experience_min_years = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    experience_max_years = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+
+    # Parsed from `Salary` (authapp.compensation)
+    salary_min = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    salary_max = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    salary_currency = models.CharField(max_length=3, blank=True, default='', editable=False)
+    salary_period = models.CharField(max_length=5, blank=True, null=True, editable=False)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -81,6 +100,16 @@ class Developer_data(models.Model):
         db_table = 'developer_data'
         verbose_name = 'Developer Data'
         verbose_name_plural = 'Developer Data'
+        indexes = [
+            # Incremental refresh of the roster snapshot (authapp.roster)
+            models.Index(fields=['updated_at'], name='developer_updated_at_idx'),
+            # ?min_experience= / ?max_experience= / ?availability= searches
+            models.Index(fields=['experience_min_years'], name='developer_exp_min_idx'),
+            models.Index(fields=['experience_max_years'], name='developer_exp_max_idx'),
+            models.Index(fields=['availability'], name='developer_availability_idx'),
+            models.Index(fields=['salary_period', 'salary_currency', 'salary_min'], name='developer_salary_min_idx'),
+            models.Index(fields=['salary_period', 'salary_currency', 'salary_max'], name='developer_salary_max_idx'),
+        ]
 
     def __str__(self):
         return f"{self.firstName} {self.lastName} - {self.office_id}"
@@ -123,6 +152,16 @@ class BD(models.Model):
     education = models.CharField(max_length=200, help_text="Educational background")
     experience = models.CharField(max_length=20, choices=EXPERIENCE_CHOICES)
     availability = models.CharField(max_length=20, choices=AVAILABILITY_CHOICES, default='Full-time')
+
+    # Bounds of `experience` in years (authapp.experience); max is NULL for 'N+ years'
+    experience_min_years = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    experience_max_years = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+
+    # Parsed from `salary` (authapp.compensation)
+    salary_min = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    salary_max = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    salary_currency = models.CharField(max_length=3, blank=True, default='', editable=False)
+    salary_period = models.CharField(max_length=5, blank=True, null=True, editable=False)
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
@@ -132,6 +171,13 @@ class BD(models.Model):
         db_table = 'bd_data'
         verbose_name = 'Business Development'
         verbose_name_plural = 'Business Development'
+        indexes = [
+            models.Index(fields=['experience_min_years'], name='bd_exp_min_idx'),
+            models.Index(fields=['experience_max_years'], name='bd_exp_max_idx'),
+            models.Index(fields=['availability'], name='bd_availability_idx'),
+            models.Index(fields=['salary_period', 'salary_currency', 'salary_min'], name='bd_salary_min_idx'),
+            models.Index(fields=['salary_period', 'salary_currency', 'salary_max'], name='bd_salary_max_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} - {self.BD_id}"
@@ -143,7 +189,11 @@ class BD(models.Model):
 
 # Add this JobApplication model to your existing models.py file
 
-class JobApplication(models.Model):
+class JobApplicationFields(models.Model):
+    """
+    The columns of a job application, shared by the live table, its archive
+    and the view over both (authapp.archive).
+    """
     JOB_TYPE_CHOICES = [
         ('Full-time', 'Full-time'),
         ('Part-time', 'Part-time'),
@@ -197,6 +247,11 @@ class JobApplication(models.Model):
     company = models.CharField(max_length=200)
     location = models.CharField(max_length=200, blank=True, null=True)
     salary_range = models.CharField(max_length=100, blank=True, null=True)
+    # Parsed from `salary_range` (authapp.compensation)
+    salary_min = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    salary_max = models.DecimalField(max_digits=14, decimal_places=2, null=True, blank=True, editable=False)
+    salary_currency = models.CharField(max_length=3, blank=True, default='', editable=False)
+    salary_period = models.CharField(max_length=5, blank=True, null=True, editable=False)
     job_type = models.CharField(max_length=50, choices=JOB_TYPE_CHOICES, blank=True, null=True)
     experience_level = models.CharField(max_length=50, choices=EXPERIENCE_LEVEL_CHOICES, blank=True, null=True)
     
@@ -217,16 +272,32 @@ class JobApplication(models.Model):
         default='Applied'
     )
     
+    # When application_status last changed, maintained by authapp.signals
+    status_changed_at = models.DateTimeField(blank=True, null=True)
+    
+    # Denormalized BD display fields, kept in sync by authapp.signals
+    bd_display_name = models.CharField(max_length=100, blank=True, default='')
+    bd_display_email = models.EmailField(blank=True, default='')
+    
+    # Normalized company/title/URL hash, kept up to date by authapp.signals
+    # (see authapp.dedup)
+    dedup_fingerprint = models.CharField(max_length=40, blank=True, default='', editable=False)
+    
+    # job_id of the oldest job with a near-identical description, NULL when
+    # there is none or the description changed since the last clustering run
+    # (authapp.clustering)
+    cluster_id = models.IntegerField(blank=True, null=True)
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     applied_date = models.DateField(auto_now_add=True)
 
+    # for_bd() / created_between(): filters that prune partitions (authapp.partitioning)
+    objects = PartitionedQuerySet.as_manager()
+
     class Meta:
-        db_table = 'jobs'
-        verbose_name = 'Job Application'
-        verbose_name_plural = 'Job Applications'
-        ordering = ['-created_at']
+        abstract = True
 
     def __str__(self):
         return f"{self.job_title} at {self.company} - {self.bd_id.name}"
@@ -236,12 +307,175 @@ class JobApplication(models.Model):
         """Return skills as a comma-separated string for display"""
         if isinstance(self.skills, list):
             return ', '.join(self.skills)
-        return self.skills or ''        
+        return self.skills or ''
 
 
-class InterviewSchedule(models.Model):
+class JobApplication(JobApplicationFields):
+    class Meta:
+        db_table = 'jobs'
+        verbose_name = 'Job Application'
+        verbose_name_plural = 'Job Applications'
+        ordering = ['-created_at']
+        indexes = [
+            # Incremental analytics rollup refresh (authapp.analytics)
+            models.Index(fields=['updated_at'], name='jobs_updated_at_idx'),
+            # Duplicate check on create (authapp.dedup)
+            models.Index(fields=['bd_id', 'dedup_fingerprint'], name='jobs_bd_fingerprint_idx'),
+            models.Index(fields=['cluster_id'], name='jobs_cluster_idx'),
+            models.Index(fields=['salary_period', 'salary_currency', 'salary_min'], name='jobs_salary_min_idx'),
+            models.Index(fields=['salary_period', 'salary_currency', 'salary_max'], name='jobs_salary_max_idx'),
+            # One BD's jobs, newest first
+            models.Index(fields=['bd_id', 'created_at'], name='jobs_bd_created_idx'),
+            # Platform breakdown in the stats endpoint
+            models.Index(fields=['platform'], name='jobs_platform_idx'),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the loaded status/BD so a save can log what changed, and
+        # the description so a save can tell whether its cluster still holds
+        instance._loaded_status = instance.__dict__.get('application_status')
+        instance._loaded_bd_id = instance.__dict__.get('bd_id_id')
+        if 'job_description' in instance.__dict__:
+            instance._loaded_description = instance.__dict__['job_description']
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Status transitions and counters are written by authapp.signals;
+        # keep them in the same transaction as the row itself.
+        using = kwargs.get('using') or router.db_for_write(type(self), instance=self)
+        with transaction.atomic(using=using):
+            super().save(*args, **kwargs)
+
+
+class JobStatusTransition(models.Model):
+    """
+    Append-only log of application_status changes, written by authapp.signals.
+    The first row of a job has no from_status and records its creation.
+    """
+    transition_id = models.BigAutoField(primary_key=True)
+    
+    # Kept when the job is deleted so history and reports stay intact, and
+    # left pointing at the id of an archived job (no database constraint)
+    job_id = models.ForeignKey(
+        JobApplication, on_delete=models.SET_NULL, to_field='job_id', db_column='job_id',
+        null=True, related_name='status_transitions', db_constraint=False
+    )
+    bd_id = models.CharField(max_length=50)
+    
+    from_status = models.CharField(max_length=50, blank=True, null=True)
+    to_status = models.CharField(max_length=50)
+    changed_at = models.DateTimeField(default=timezone.now)
+    
+    # Time spent in from_status before this transition
+    seconds_in_previous = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'job_status_transitions'
+        ordering = ['changed_at', 'transition_id']
+        indexes = [
+            models.Index(fields=['job_id', 'changed_at'], name='job_transition_job_idx'),
+            models.Index(fields=['bd_id', 'changed_at'], name='job_transition_bd_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id_id}: {self.from_status} -> {self.to_status}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Job status transitions are append-only.")
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        raise ValueError("Job status transitions are append-only.")
+
+
+class JobStatusCounter(models.Model):
     """
-    InterviewSchedule model to store interview assignments between developers and companies
+    Running totals per BD and status, updated with every transition so the
+    stats, funnel and time-in-stage reports read a few rows instead of
+    scanning jobs.
+    """
+    bd_id = models.CharField(max_length=50)
+    status = models.CharField(max_length=50)
+    
+    # Live (not archived) jobs currently in this status
+    current = models.IntegerField(default=0)
+    # Transitions into and out of this status
+    entered = models.IntegerField(default=0)
+    exited = models.IntegerField(default=0)
+    # Total seconds spent in this status by the transitions that exited it
+    seconds_in_stage = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'job_status_counters'
+        constraints = [
+            models.UniqueConstraint(fields=['bd_id', 'status'], name='job_status_counter_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.bd_id} {self.status}: {self.current}"
+
+
+class JobApplicationRollup(models.Model):
+    """
+    Daily job application counts per BD, platform, status and job type,
+    bucketed by applied_date or by the date of created_at. Maintained by
+    authapp.analytics; the time-series endpoint reads only this table.
+    """
+    BASIS_CHOICES = [
+        ('applied_date', 'applied_date'),
+        ('created_at', 'created_at'),
+    ]
+
+    basis = models.CharField(max_length=20, choices=BASIS_CHOICES)
+    day = models.DateField()
+    bd_id = models.CharField(max_length=50)
+    platform = models.CharField(max_length=50)
+    application_status = models.CharField(max_length=50)
+    job_type = models.CharField(max_length=50, blank=True, default='')
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'job_application_rollups'
+        indexes = [
+            models.Index(fields=['basis', 'day'], name='job_rollup_basis_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.basis} {self.day} {self.bd_id}/{self.platform}: {self.count}"
+
+
+class JobRollupDirtyDay(models.Model):
+    """Days whose rollup rows must be recomputed because a job was deleted."""
+    basis = models.CharField(max_length=20)
+    day = models.DateField()
+
+    class Meta:
+        db_table = 'job_rollup_dirty_days'
+        constraints = [
+            models.UniqueConstraint(fields=['basis', 'day'], name='job_rollup_dirty_day_unique'),
+        ]
+
+
+class RollupState(models.Model):
+    """Refresh watermark of an incrementally maintained rollup."""
+    name = models.CharField(max_length=50, primary_key=True)
+    watermark = models.DateTimeField(blank=True, null=True)
+    refreshed_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'rollup_state'
+
+    def __str__(self):
+        return f"{self.name} @ {self.watermark}"
+
+
+class InterviewScheduleFields(models.Model):
+    """
+    InterviewSchedule model to store interview assignments between developers and companies.
+    The columns are shared by the live table, its archive and the view over both.
     """
     
     # Primary key - Auto incrementing integer
@@ -265,14 +499,260 @@ class InterviewSchedule(models.Model):
     # Company URL - optional field
     company_url = models.URLField(max_length=500, blank=True, null=True)
     
+    # Denormalized BD and developer display fields, kept in sync by authapp.signals
+    bd_display_name = models.CharField(max_length=100, blank=True, default='')
+    bd_display_email = models.EmailField(blank=True, default='')
+    dev_display_name = models.CharField(max_length=201, blank=True, default='')
+    dev_display_email = models.EmailField(blank=True, default='')
+    dev_display_title = models.CharField(max_length=100, blank=True, default='')
+    
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PartitionedQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def __str__(self):
+        return f"{self.company_name} - {self.role} ({self.interview_date})"
+
+
+class InterviewSchedule(InterviewScheduleFields):
     class Meta:
         db_table = 'interview_schedules'
         ordering = ['-created_at']
 
+
+# -------- Archive (authapp.archive) --------
+class ArchivedJobApplication(JobApplicationFields):
+    """
+    A closed job application moved out of ``jobs`` by ``manage.py archive_jobs``,
+    with its original id and timestamps.
+    """
+    job_id = models.IntegerField(primary_key=True)
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'jobs_archive'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='jobs_archive_created_at_idx'),
+            models.Index(fields=['bd_id', 'created_at'], name='jobs_archive_bd_created_idx'),
+        ]
+
+
+class ArchivedInterviewSchedule(InterviewScheduleFields):
+    """An interview of an archived job, archived along with it."""
+    interview_id = models.IntegerField(primary_key=True)
+    job_id = models.ForeignKey(ArchivedJobApplication, on_delete=models.CASCADE, to_field='job_id', db_column='job_id')
+    archived_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'interview_schedules_archive'
+        ordering = ['-created_at']
+
+
+class ReadOnlyView:
+    """Rows of a database view, which can be read but not written."""
+
+    def save(self, *args, **kwargs):
+        raise ValueError(f"{type(self).__name__} is a read-only view.")
+
+    def delete(self, *args, **kwargs):
+        raise ValueError(f"{type(self).__name__} is a read-only view.")
+
+
+class JobApplicationWithArchive(ReadOnlyView, JobApplicationFields):
+    """
+    Live and archived job applications (the ``jobs_with_archive`` view created
+    by the migrations). ``archived_at`` is null for live rows.
+    """
+    job_id = models.IntegerField(primary_key=True)
+    bd_id = models.ForeignKey(
+        BD, on_delete=models.DO_NOTHING, to_field='BD_id', db_column='bd_id',
+        db_constraint=False, related_name='+'
+    )
+    archived_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        managed = False
+        db_table = 'jobs_with_archive'
+        ordering = ['-created_at']
+
+
+class InterviewScheduleWithArchive(ReadOnlyView, InterviewScheduleFields):
+    """Live and archived interviews (the ``interview_schedules_with_archive`` view)."""
+    interview_id = models.IntegerField(primary_key=True)
+    bd_id = models.ForeignKey(
+        BD, on_delete=models.DO_NOTHING, to_field='BD_id', db_column='bd_id',
+        db_constraint=False, related_name='+'
+    )
+    dev_id = models.ForeignKey(
+        Developer_data, on_delete=models.DO_NOTHING, to_field='office_id', db_column='dev_id',
+        db_constraint=False, related_name='+'
+    )
+    job_id = models.ForeignKey(
+        JobApplicationWithArchive, on_delete=models.DO_NOTHING, to_field='job_id', db_column='job_id',
+        db_constraint=False, related_name='+'
+    )
+    archived_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        managed = False
+        db_table = 'interview_schedules_with_archive'
+        ordering = ['-created_at']
+
+
+
+class BackgroundTask(models.Model):
+    """
+    Queued follow-up work, run by the run_task_worker command (see
+    authapp.tasks). Rows are claimed by updating their status, so any number
+    of workers can share the table.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    task_id = models.BigAutoField(primary_key=True)
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    
+    # Enqueueing the same key again returns the existing task
+    idempotency_key = models.CharField(max_length=200, unique=True, blank=True, null=True)
+    
+    # Retries
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True, default='')
+    
+    # Worker holding the task while it runs
+    locked_by = models.CharField(max_length=100, blank=True, default='')
+    locked_at = models.DateTimeField(blank=True, null=True)
+    
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'background_tasks'
+        ordering = ['run_at', 'task_id']
+        indexes = [
+            models.Index(fields=['status', 'run_at'], name='background_task_due_idx'),
+        ]
+
     def __str__(self):
-        return f"{self.company_name} - {self.role} ({self.interview_date})"
+        return f"{self.name} #{self.task_id} ({self.status})"
+
+
+class BDReportRun(models.Model):
+    """One generation of the weekly per-BD reports (authapp.reports)."""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    run_id = models.BigAutoField(primary_key=True)
+    
+    # Monday to Sunday, inclusive
+    week_start = models.DateField()
+    week_end = models.DateField()
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    
+    # Progress
+    total_bds = models.IntegerField(default=0)
+    completed_bds = models.IntegerField(default=0)
+    error = models.TextField(blank=True, default='')
+    
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'bd_report_runs'
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"BD report {self.week_start} ({self.status})"
+
 
+class BDWeeklyReport(models.Model):
+    """One BD's figures for the week of a report run."""
+    run = models.ForeignKey(BDReportRun, on_delete=models.CASCADE, related_name='reports', db_column='run_id')
+    bd_id = models.CharField(max_length=50)
+    bd_name = models.CharField(max_length=100, blank=True, default='')
+    week_start = models.DateField()
+    
+    # Applications added in the week, by their current status
+    jobs_total = models.IntegerField(default=0)
+    jobs_by_status = models.JSONField(default=dict)
+    # Status changes made in the week, by new status
+    transitions_by_status = models.JSONField(default=dict)
+    interviews_scheduled = models.IntegerField(default=0)
+    conversion = models.JSONField(default=dict)
+    top_skills = models.JSONField(default=list)
+    
+    generated_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'bd_weekly_reports'
+        ordering = ['bd_id']
+        constraints = [
+            models.UniqueConstraint(fields=['run', 'bd_id'], name='bd_weekly_report_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['bd_id', 'week_start'], name='bd_weekly_report_bd_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.bd_id} week of {self.week_start}"
+
+
+class IdempotencyRecord(models.Model):
+    """
+    A POST made with an ``Idempotency-Key`` header and the response it got,
+    replayed to retries with the same key (see authapp.idempotency).
+    """
+    STATUS_CHOICES = [
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+    ]
+
+    record_id = models.BigAutoField(primary_key=True)
+    # sha256 of the caller and the request path; keys are only unique per scope
+    scope = models.CharField(max_length=64)
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='processing')
+
+    # The stored response
+    response_status = models.PositiveSmallIntegerField(blank=True, null=True)
+    response_body = models.BinaryField(blank=True, default=b'')
+    content_type = models.CharField(max_length=100, blank=True, default='')
+
+    # Timestamps
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'idempotency_records'
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='idempotency_scope_key_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at'], name='idempotency_expires_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.key} ({self.status})"
@@ -0,0 +1,489 @@
+"""
+Optional PostgreSQL declarative partitioning of ``jobs`` and
+``interview_schedules``.
+
+Both tables are created unpartitioned by the migrations, and stay that way
+unless ``manage.py partition_tables --scheme ...`` converts them:
+
+* ``hash``: ``PARTITION_HASH_PARTITIONS`` partitions on ``bd_id``
+  (``jobs_p0`` ...). A BD-scoped query (``bd_id = ...``) reads one
+  partition and its indexes instead of every BD's rows.
+* ``range``: one partition per calendar month (UTC) of ``created_at``
+  (``jobs_y2025m01`` ...) plus a default partition for rows outside them.
+  Date-bounded queries and "latest first" pages read the months they need,
+  and old months can be detached (``manage.py detach_partitions``) instead
+  of deleted row by row. ``manage.py create_partitions`` keeps
+  ``PARTITION_MONTHS_AHEAD`` months created ahead; rows that landed in the
+  default partition meanwhile are moved into the new month.
+
+The conversion copies the table into a partitioned one in a single
+transaction, holding an ACCESS EXCLUSIVE lock meanwhile, and recreates its
+indexes (same names, so later migrations still find them), outgoing
+foreign keys, id sequence and the view over it and its archive
+(authapp.archive). PostgreSQL requires the partition key in the
+primary key, so the primary key becomes ``(id, key)`` and nothing can
+reference the id alone: the foreign key from ``interview_schedules`` to
+``jobs`` is dropped. Django's
+``on_delete`` cascades run in Python and are not affected; deletes issued
+in raw SQL no longer cascade.
+
+Pruning needs a condition on the raw key column the planner can compare
+with the partition bounds. :class:`PartitionedQuerySet` (the models'
+default manager) provides those filters; they are ordinary filters on an
+unpartitioned table. Lookups by id alone still work but probe every
+partition's primary key index.
+
+``manage.py bench_partitioning`` copies a table into unpartitioned and
+partitioned scratch tables (rolled back afterwards) and times the usual
+queries against both.
+"""
+import json
+import re
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from typing import NamedTuple
+
+from django.apps import apps
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+TABLES = ('jobs', 'interview_schedules')
+KEYS = {'hash': 'bd_id', 'range': 'created_at'}
+_STRATEGIES = {'h': 'hash', 'r': 'range', 'l': 'list'}
+_RANGE_BOUND = re.compile(r"FROM \('([^']+)'\) TO \('([^']+)'\)")
+
+
+class PartitionError(Exception):
+    pass
+
+
+# -------- Partition-aware querysets --------
+class PartitionedQuerySet(models.QuerySet):
+    """Filters PostgreSQL can prune partitions with; plain filters on an unpartitioned table."""
+
+    def for_bd(self, bd_id):
+        """Rows of one BD (instance or BD_id), compared on the raw ``bd_id`` column."""
+        return self.filter(bd_id=getattr(bd_id, 'pk', bd_id))
+
+    def created_between(self, start, end):
+        """
+        ``created_at`` in ``[start, end)``; dates are midnights in the current
+        time zone. Prunes range partitions, unlike ``created_at__date``,
+        which compares an expression.
+        """
+        return self.filter(created_at__gte=_moment(start), created_at__lt=_moment(end))
+
+
+def _moment(value):
+    if isinstance(value, datetime):
+        return value
+    return timezone.make_aware(datetime.combine(value, datetime.min.time()))
+
+
+# -------- Layout --------
+class Partition(NamedTuple):
+    name: str
+    bound: str  # 'FOR VALUES ...' or 'DEFAULT'
+    rows: int  # planner estimate
+
+
+class Layout(NamedTuple):
+    table: str
+    scheme: str  # '' when the table is not partitioned
+    key: str
+    partitions: list
+
+
+def check_supported():
+    if connection.vendor != 'postgresql':
+        raise PartitionError(f'Partitioning needs PostgreSQL, not {connection.vendor}.')
+
+
+def _quote(name):
+    return connection.ops.quote_name(name)
+
+
+def _model(table):
+    for model in apps.get_models():
+        if model._meta.db_table == table:
+            return model
+    raise PartitionError(f'No model uses the table {table!r}.')
+
+
+def layout(table):
+    """How ``table`` is partitioned, with its partitions (none when it is not)."""
+    check_supported()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT p.partstrat, a.attname FROM pg_partitioned_table p "
+            "JOIN pg_attribute a ON a.attrelid = p.partrelid AND a.attnum = p.partattrs[0] "
+            "WHERE p.partrelid = %s::regclass",
+            [table],
+        )
+        row = cursor.fetchone()
+        if row is None:
+            return Layout(table, '', '', [])
+        cursor.execute(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), GREATEST(c.reltuples, 0)::bigint "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = %s::regclass ORDER BY c.relname",
+            [table],
+        )
+        partitions = [Partition(*partition) for partition in cursor.fetchall()]
+    return Layout(table, _STRATEGIES.get(row[0], row[0]), row[1], partitions)
+
+
+def range_bounds(partition):
+    """(start, end) datetimes of a range partition, None for the default partition."""
+    match = _RANGE_BOUND.search(partition.bound)
+    if not match:
+        return None
+    return tuple(datetime.fromisoformat(value) for value in match.groups())
+
+
+def month_start(moment):
+    return datetime(moment.year, moment.month, 1, tzinfo=dt_timezone.utc)
+
+
+def next_month(moment):
+    return month_start(moment + timedelta(days=32))
+
+
+def month_partition_name(table, start):
+    return f'{table}_y{start.year}m{start.month:02d}'
+
+
+def _month_bound(start):
+    return f"FROM ('{start.isoformat()}') TO ('{next_month(start).isoformat()}')"
+
+
+# -------- Conversion --------
+def _indexes(cursor, table):
+    """[(name, definition, unique)] of the table's indexes that do not back a constraint."""
+    cursor.execute(
+        "SELECT i.relname, pg_get_indexdef(i.oid), x.indisunique FROM pg_index x "
+        "JOIN pg_class i ON i.oid = x.indexrelid "
+        "WHERE x.indrelid = %s::regclass AND NOT EXISTS "
+        "(SELECT 1 FROM pg_constraint c WHERE c.conindid = x.indexrelid) ORDER BY i.relname",
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def _index_sql(definition, name, table):
+    """``definition`` (pg_get_indexdef output) rebuilt as index ``name`` on ``table``."""
+    head, _, rest = definition.partition(' USING ')
+    unique = 'UNIQUE ' if head.startswith('CREATE UNIQUE') else ''
+    return f'CREATE {unique}INDEX {_quote(name)} ON {_quote(table)} USING {rest}'
+
+
+def _foreign_keys(cursor, table):
+    """(outgoing [(name, definition, referenced table)], incoming [(name, referencing table)])."""
+    cursor.execute(
+        "SELECT conname, pg_get_constraintdef(oid), confrelid::regclass::text FROM pg_constraint "
+        "WHERE conrelid = %s::regclass AND contype = 'f' ORDER BY conname",
+        [table],
+    )
+    outgoing = cursor.fetchall()
+    cursor.execute(
+        "SELECT conname, conrelid::regclass::text FROM pg_constraint "
+        "WHERE confrelid = %s::regclass AND conrelid <> confrelid AND contype = 'f' ORDER BY conname",
+        [table],
+    )
+    return outgoing, cursor.fetchall()
+
+
+def _partitioned(cursor, table):
+    cursor.execute("SELECT 1 FROM pg_partitioned_table WHERE partrelid = %s::regclass", [table])
+    return cursor.fetchone() is not None
+
+
+def partitioned_table_sql(source, target, scheme, partitions, first_month=None, last_month=None, prefix=None):
+    """
+    Statements creating ``target`` shaped like ``source`` (columns, defaults,
+    checks; no indexes) and partitioned by ``scheme``, with its partitions
+    (named after ``prefix``, by default ``target``).
+    """
+    key = KEYS[scheme]
+    prefix = prefix or target
+    statements = [
+        f'CREATE TABLE {_quote(target)} (LIKE {_quote(source)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS '
+        f'INCLUDING GENERATED INCLUDING STORAGE INCLUDING COMMENTS) PARTITION BY {scheme.upper()} ({_quote(key)})'
+    ]
+    if scheme == 'hash':
+        for remainder in range(partitions):
+            statements.append(
+                f'CREATE TABLE {_quote(f"{prefix}_p{remainder}")} PARTITION OF {_quote(target)} '
+                f'FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})'
+            )
+    else:
+        start = first_month
+        while start <= last_month:
+            statements.append(
+                f'CREATE TABLE {_quote(month_partition_name(prefix, start))} PARTITION OF {_quote(target)} '
+                f'FOR VALUES {_month_bound(start)}'
+            )
+            start = next_month(start)
+        statements.append(f'CREATE TABLE {_quote(f"{prefix}_default")} PARTITION OF {_quote(target)} DEFAULT')
+    return statements
+
+
+def _month_range(cursor, table, months_ahead):
+    cursor.execute(f'SELECT MIN(created_at) FROM {_quote(table)}')
+    oldest = cursor.fetchone()[0]
+    this_month = month_start(timezone.now())
+    last_month = this_month
+    for _ in range(months_ahead):
+        last_month = next_month(last_month)
+    return month_start(oldest) if oldest and oldest < this_month else this_month, last_month
+
+
+def conversion_sql(table, scheme, partitions=16, months_ahead=3):
+    """
+    The statements converting ``table`` in place, and the foreign keys they
+    drop as ``[(constraint, table)]``. Raises PartitionError when the table
+    is already partitioned or has a unique index without the key.
+    """
+    check_supported()
+    if table not in TABLES:
+        raise PartitionError(f"Only {', '.join(TABLES)} can be partitioned.")
+    if scheme not in KEYS:
+        raise PartitionError(f"Unknown scheme {scheme!r}; use {' or '.join(KEYS)}.")
+    key = KEYS[scheme]
+    pk = _model(table)._meta.pk.column
+    staging = f'{table}_partitioned'
+    sequence = f'{table}_{pk}_seq'
+
+    with connection.cursor() as cursor:
+        if _partitioned(cursor, table):
+            raise PartitionError(f'{table} is already partitioned.')
+        indexes = _indexes(cursor, table)
+        unique = [name for name, _, is_unique in indexes if is_unique]
+        if unique:
+            raise PartitionError(f"{table} has unique indexes PostgreSQL cannot keep once it is partitioned: {', '.join(unique)}")
+        outgoing, incoming = _foreign_keys(cursor, table)
+        kept = [
+            (name, definition) for name, definition, referenced in outgoing
+            if referenced.strip('"') != table and not _partitioned(cursor, referenced)
+        ]
+        dropped = list(incoming) + [(name, table) for name, _, _ in outgoing if name not in dict(kept)]
+        first_month = last_month = None
+        if scheme == 'range':
+            first_month, last_month = _month_range(cursor, table, months_ahead)
+
+    # The live-plus-archive view (authapp.archive) reads the table
+    from . import archive
+    drop_views, create_views = archive.views_over(table)
+
+    statements = [f'LOCK TABLE {_quote(table)} IN ACCESS EXCLUSIVE MODE']
+    for name, referencing in incoming:
+        statements.append(f'ALTER TABLE {referencing} DROP CONSTRAINT {_quote(name)}')
+    statements += partitioned_table_sql(table, staging, scheme, partitions, first_month, last_month, prefix=table)
+    statements += [f'INSERT INTO {_quote(staging)} SELECT * FROM {_quote(table)}', *drop_views]
+    statements += [
+        f'DROP TABLE {_quote(table)}',
+        f'ALTER TABLE {_quote(staging)} RENAME TO {_quote(table)}',
+        f'ALTER TABLE {_quote(table)} ADD CONSTRAINT {_quote(f"{table}_pkey")} PRIMARY KEY ({_quote(pk)}, {_quote(key)})',
+        *create_views,
+    ]
+    statements += [_index_sql(definition, name, table) for name, definition, _ in indexes]
+    statements += [f'ALTER TABLE {_quote(table)} ADD CONSTRAINT {_quote(name)} {definition}' for name, definition in kept]
+    statements += [
+        f'CREATE SEQUENCE {_quote(sequence)} OWNED BY {_quote(table)}.{_quote(pk)}',
+        f"ALTER TABLE {_quote(table)} ALTER COLUMN {_quote(pk)} SET DEFAULT nextval('{sequence}')",
+        f"SELECT setval('{sequence}', COALESCE((SELECT MAX({_quote(pk)}) FROM {_quote(table)}), 0) + 1, false)",
+        f'ANALYZE {_quote(table)}',
+    ]
+    return statements, dropped
+
+
+def convert(table, scheme, partitions=16, months_ahead=3):
+    """Convert ``table`` in one transaction; returns ``(statements, dropped foreign keys)``."""
+    with transaction.atomic():
+        statements, dropped = conversion_sql(table, scheme, partitions, months_ahead)
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+    return statements, dropped
+
+
+# -------- Maintenance --------
+def _range_layout(table):
+    current = layout(table)
+    if current.scheme != 'range':
+        raise PartitionError(f'{table} is not range partitioned.')
+    return current
+
+
+def create_month_partitions(table, months_ahead=3, today=None):
+    """
+    Create the monthly partitions of ``table`` from the current month through
+    ``months_ahead`` months ahead that do not exist yet. Rows already in the
+    default partition for a new month are moved into it. Returns the names
+    of the partitions created.
+    """
+    current = _range_layout(table)
+    existing = {bounds[0] for bounds in map(range_bounds, current.partitions) if bounds}
+    default = next((partition.name for partition in current.partitions if partition.bound == 'DEFAULT'), None)
+    start = month_start(today or timezone.now())
+    created = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        for _ in range(months_ahead + 1):
+            if start not in existing:
+                name = month_partition_name(table, start)
+                moved = 0
+                if default:
+                    cursor.execute(
+                        f'SELECT COUNT(*) FROM {_quote(default)} WHERE created_at >= %s AND created_at < %s',
+                        [start, next_month(start)],
+                    )
+                    moved = cursor.fetchone()[0]
+                if moved:
+                    # Attaching validates the default partition, so its rows for the month move first
+                    cursor.execute(f'LOCK TABLE {_quote(table)} IN ACCESS EXCLUSIVE MODE')
+                    cursor.execute(
+                        f'CREATE TABLE {_quote(name)} (LIKE {_quote(table)} INCLUDING DEFAULTS '
+                        f'INCLUDING CONSTRAINTS INCLUDING GENERATED INCLUDING STORAGE)'
+                    )
+                    cursor.execute(
+                        f'WITH moved AS (DELETE FROM {_quote(default)} WHERE created_at >= %s AND created_at < %s '
+                        f'RETURNING *) INSERT INTO {_quote(name)} SELECT * FROM moved',
+                        [start, next_month(start)],
+                    )
+                    cursor.execute(f'ALTER TABLE {_quote(table)} ATTACH PARTITION {_quote(name)} FOR VALUES {_month_bound(start)}')
+                else:
+                    cursor.execute(f'CREATE TABLE {_quote(name)} PARTITION OF {_quote(table)} FOR VALUES {_month_bound(start)}')
+                created.append(name)
+            start = next_month(start)
+    return created
+
+
+def partitions_before(table, before):
+    """Monthly partitions of ``table`` holding only rows created before ``before``."""
+    before = _moment(before)
+    names = []
+    for partition in _range_layout(table).partitions:
+        bounds = range_bounds(partition)
+        if bounds and bounds[1] <= before:
+            names.append(partition.name)
+    return names
+
+
+def detach(table, names, drop=False):
+    """
+    Detach partitions ``names`` from ``table``; they stay as standalone
+    tables unless ``drop``. (``DETACH ... CONCURRENTLY`` is not an option:
+    PostgreSQL refuses it while the table has a default partition.)
+    """
+    check_supported()
+    attached = {partition.name for partition in layout(table).partitions}
+    unknown = [name for name in names if name not in attached]
+    if unknown:
+        raise PartitionError(f"Not partitions of {table}: {', '.join(unknown)}")
+    with transaction.atomic(), connection.cursor() as cursor:
+        for name in names:
+            cursor.execute(f'ALTER TABLE {_quote(table)} DETACH PARTITION {_quote(name)}')
+            if drop:
+                cursor.execute(f'DROP TABLE {_quote(name)}')
+
+
+# -------- Benchmark --------
+class BenchQuery(NamedTuple):
+    name: str
+    sql: str  # {table}, {pk} and {key} placeholders
+    params: str  # which sampled values it runs with: 'bd', 'id', 'month' or ''
+
+
+BENCH_QUERIES = (
+    BenchQuery('bd latest page', 'SELECT * FROM {table} WHERE bd_id = %s ORDER BY created_at DESC LIMIT 50', 'bd'),
+    BenchQuery('bd count', 'SELECT COUNT(*) FROM {table} WHERE bd_id = %s', 'bd'),
+    BenchQuery('by id', 'SELECT * FROM {table} WHERE {pk} = %s', 'id'),
+    BenchQuery('month count', 'SELECT COUNT(*) FROM {table} WHERE created_at >= %s AND created_at < %s', 'month'),
+    BenchQuery('latest page', 'SELECT * FROM {table} ORDER BY created_at DESC LIMIT 50', ''),
+)
+
+
+class BenchResult(NamedTuple):
+    query: BenchQuery
+    flat_seconds: float
+    partitioned_seconds: float
+    flat_relations: int  # tables and partitions the plan reads
+    partitioned_relations: int
+
+
+def _samples(cursor, table, pk):
+    cursor.execute(f'SELECT bd_id FROM {_quote(table)} GROUP BY bd_id ORDER BY md5(bd_id) LIMIT 5')
+    bds = [[row[0]] for row in cursor.fetchall()]
+    cursor.execute(f'SELECT {_quote(pk)} FROM {_quote(table)} ORDER BY md5({_quote(pk)}::text) LIMIT 20')
+    ids = [[row[0]] for row in cursor.fetchall()]
+    cursor.execute(f'SELECT MAX(created_at) FROM {_quote(table)}')
+    latest = cursor.fetchone()[0]
+    months = [[month_start(latest), next_month(latest)]] if latest else []
+    return {'bd': bds, 'id': ids, 'month': months, '': [[]]}
+
+
+def _relations(cursor, sql, params):
+    cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+    plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    found = set()
+
+    def walk(node):
+        if node.get('Relation Name'):
+            found.add(node['Relation Name'])
+        for child in node.get('Plans', ()):
+            walk(child)
+
+    walk(plan[0]['Plan'])
+    return len(found)
+
+
+def _time(cursor, sql, param_sets, repeat):
+    """Best total wall time over ``repeat`` runs of ``sql`` with each parameter set."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for params in param_sets:
+            cursor.execute(sql, params)
+            cursor.fetchall()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def benchmark(table, scheme, partitions=16, repeat=5):
+    """
+    Copy ``table`` into an unpartitioned and a ``scheme``-partitioned scratch
+    table with the same indexes and time :data:`BENCH_QUERIES` on both.
+    Everything happens in a transaction that is rolled back.
+    """
+    check_supported()
+    pk = _model(table)._meta.pk.column
+    flat, split = f'{table}_bench_flat', f'{table}_bench_part'
+    results = []
+    with transaction.atomic(), connection.cursor() as cursor:
+        indexes = _indexes(cursor, table)
+        first_month, last_month = _month_range(cursor, table, 1)
+        cursor.execute(f'CREATE TABLE {_quote(flat)} (LIKE {_quote(table)} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)')
+        for sql in partitioned_table_sql(table, split, scheme, partitions, first_month, last_month):
+            cursor.execute(sql)
+        for target, key_columns in ((flat, [pk]), (split, [pk, KEYS[scheme]])):
+            cursor.execute(f'INSERT INTO {_quote(target)} SELECT * FROM {_quote(table)}')
+            cursor.execute(f"ALTER TABLE {_quote(target)} ADD PRIMARY KEY ({', '.join(map(_quote, key_columns))})")
+            for number, (name, definition, _) in enumerate(indexes):
+                cursor.execute(_index_sql(definition, f'{target}_{number}', target))
+            cursor.execute(f'ANALYZE {_quote(target)}')
+
+        samples = _samples(cursor, table, pk)
+        for query in BENCH_QUERIES:
+            param_sets = samples[query.params]
+            if not param_sets:
+                continue
+            timings = []
+            for target in (flat, split):
+                sql = query.sql.format(table=_quote(target), pk=_quote(pk), key=_quote(KEYS[scheme]))
+                timings.append((_time(cursor, sql, param_sets, repeat), _relations(cursor, sql, param_sets[0])))
+            results.append(BenchResult(query, timings[0][0], timings[1][0], timings[0][1], timings[1][1]))
+        transaction.set_rollback(True)
+    return results
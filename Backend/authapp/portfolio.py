@@ -0,0 +1,220 @@
+"""
+Client portfolio rollup: projected revenue, deadline buckets and per-company
+totals for the Client dashboard.
+
+Projected revenue is the billable time left until each project's deadline:
+``hourly_rate * CLIENT_BILLABLE_HOURS_PER_DAY * working days`` from today
+through the deadline (Monday to Friday, both ends included; nothing for
+overdue projects).
+
+The database does the grouping: clients are summed per (company, deadline),
+which leaves one row per distinct deadline and company however many clients
+there are. Working days are then counted once per row here. Money is
+``Decimal`` throughout and returned as strings with two decimals, so totals
+are exact rather than float sums done in the browser.
+
+The deadline feed pages through clients in ``(project_deadline, client_id)``
+order with keyset pagination on the matching index: each page continues
+after the last row of the previous one, so a page costs the same at any
+depth, and ``due_within`` / ``overdue`` are ranges on the same index.
+
+The rollup is cached (Django's cache) for ``CLIENT_ANALYTICS_CACHE_SECONDS``
+under a version key that Client saves and deletes bump (authapp.signals).
+Bulk ``QuerySet.update()`` calls and other processes' writes to a per-process
+cache are only picked up when the entry expires, or on the next day.
+"""
+import base64
+import binascii
+import uuid
+from datetime import date, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from .models import Client
+
+CENTS = Decimal('0.01')
+BUCKETS = ('overdue', 'this_week', 'this_month', 'later')
+VERSION_KEY = 'client-portfolio:version'
+
+# Deadline feed: page sizes and the windows counted in its summary (days)
+FEED_PAGE_SIZE = 50
+FEED_MAX_PAGE_SIZE = 500
+SUMMARY_WINDOWS = (7, 14, 30, 90)
+
+
+def invalidate():
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def _version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        version = uuid.uuid4().hex
+        # Another process may have set it meanwhile; use whichever won
+        cache.add(VERSION_KEY, version, None)
+        version = cache.get(VERSION_KEY, version)
+    return version
+
+
+def _money(value):
+    return str(Decimal(value or 0).quantize(CENTS, ROUND_HALF_UP))
+
+
+def working_days(start, end):
+    """Monday-to-Friday days from ``start`` through ``end``; 0 when ``end`` is before ``start``."""
+    if end < start:
+        return 0
+    days = (end - start).days + 1
+    full_weeks, rest = divmod(days, 7)
+    weekday = start.weekday()
+    return full_weeks * 5 + sum(1 for offset in range(rest) if (weekday + offset) % 7 < 5)
+
+
+def deadline_bounds(today):
+    """Last day of this week (Sunday) and of this month."""
+    week_end = today + timedelta(days=6 - today.weekday())
+    month_end = (today.replace(day=28) + timedelta(days=4)).replace(day=1) - timedelta(days=1)
+    return week_end, month_end
+
+
+def compute(today=None):
+    today = today or timezone.localdate()
+    hours_per_day = Decimal(getattr(settings, 'CLIENT_BILLABLE_HOURS_PER_DAY', 8))
+    week_end, month_end = deadline_bounds(today)
+    clients = Client.objects.order_by()
+
+    # Deadline buckets, one query
+    bucket_filters = {
+        'overdue': Q(project_deadline__lt=today),
+        'this_week': Q(project_deadline__gte=today, project_deadline__lte=week_end),
+        'this_month': Q(project_deadline__gt=week_end, project_deadline__lte=month_end),
+        'later': Q(project_deadline__gt=max(week_end, month_end)),
+    }
+    aggregates = {}
+    for name, condition in bucket_filters.items():
+        aggregates[f'{name}_count'] = Count('pk', filter=condition)
+        aggregates[f'{name}_rate'] = Sum('hourly_rate', filter=condition)
+    totals = clients.aggregate(**aggregates)
+    deadlines = {
+        name: {'count': totals[f'{name}_count'], 'total_hourly_rate': _money(totals[f'{name}_rate'])}
+        for name in BUCKETS
+    }
+
+    # Per company and deadline, finished into per-company totals
+    companies = {}
+    rows = clients.values_list('company_name', 'project_deadline').annotate(n=Count('pk'), rate=Sum('hourly_rate'))
+    for company, deadline, count, rate in rows:
+        company_totals = companies.setdefault(company, {
+            'company_name': company,
+            'clients': 0,
+            'total_hourly_rate': Decimal(0),
+            'projected_revenue': Decimal(0),
+            'overdue': 0,
+            'next_deadline': None,
+        })
+        rate = Decimal(rate or 0).quantize(CENTS, ROUND_HALF_UP)
+        company_totals['clients'] += count
+        company_totals['total_hourly_rate'] += rate
+        company_totals['projected_revenue'] += rate * hours_per_day * working_days(today, deadline)
+        if deadline < today:
+            company_totals['overdue'] += count
+        elif company_totals['next_deadline'] is None or deadline < company_totals['next_deadline']:
+            company_totals['next_deadline'] = deadline
+
+    company_rows = sorted(companies.values(), key=lambda row: (-row['projected_revenue'], row['company_name']))
+    projected = sum((row['projected_revenue'] for row in company_rows), Decimal(0))
+    hourly = sum((row['total_hourly_rate'] for row in company_rows), Decimal(0))
+    for row in company_rows:
+        row['total_hourly_rate'] = _money(row['total_hourly_rate'])
+        row['projected_revenue'] = _money(row['projected_revenue'])
+        row['next_deadline'] = row['next_deadline'] and row['next_deadline'].isoformat()
+
+    return {
+        'as_of': today.isoformat(),
+        'billable_hours_per_day': str(hours_per_day),
+        'totals': {
+            'clients': sum(row['clients'] for row in company_rows),
+            'total_hourly_rate': _money(hourly),
+            'projected_revenue': _money(projected),
+        },
+        'deadlines': deadlines,
+        'companies': company_rows,
+    }
+
+
+def portfolio():
+    """The rollup for today, from the cache when a current one is there."""
+    today = timezone.localdate()
+    key = f'client-portfolio:{_version()}:{today.isoformat()}'
+    result = cache.get(key)
+    if result is None:
+        result = compute(today)
+        cache.set(key, result, getattr(settings, 'CLIENT_ANALYTICS_CACHE_SECONDS', 300))
+    return result
+
+
+# -------- Deadline feed --------
+def encode_cursor(client):
+    raw = f'{client.project_deadline.isoformat()}:{client.client_id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """(deadline, client_id) after which the next page starts. Raises ValueError for a malformed cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        deadline, client_id = raw.split(':')
+        return date.fromisoformat(deadline), int(client_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("Invalid 'cursor'.")
+
+
+def deadline_feed(today=None, due_within=None, overdue=False, after=None, limit=FEED_PAGE_SIZE):
+    """
+    One page of clients by deadline and the cursor of the next one (None
+    on the last page). ``due_within`` keeps deadlines from today through
+    today + N days (earlier ones too when ``overdue`` is set); ``overdue``
+    alone keeps the ones already past.
+    """
+    today = today or timezone.localdate()
+    clients = Client.objects.order_by('project_deadline', 'client_id')
+    if due_within is not None:
+        clients = clients.filter(project_deadline__lte=today + timedelta(days=due_within))
+        if not overdue:
+            clients = clients.filter(project_deadline__gte=today)
+    elif overdue:
+        clients = clients.filter(project_deadline__lt=today)
+    if after is not None:
+        deadline, client_id = after
+        clients = clients.filter(
+            Q(project_deadline__gt=deadline) | Q(project_deadline=deadline, client_id__gt=client_id)
+        )
+    page = list(clients[:limit + 1])
+    next_cursor = encode_cursor(page[limit - 1]) if len(page) > limit else None
+    return page[:limit], next_cursor
+
+
+def deadline_summary(today=None):
+    """Overdue clients and clients due within each of ``SUMMARY_WINDOWS`` days, in one range scan."""
+    today = today or timezone.localdate()
+    windows = {
+        str(days): Count('pk', filter=Q(project_deadline__gte=today, project_deadline__lte=today + timedelta(days=days)))
+        for days in SUMMARY_WINDOWS
+    }
+    counts = Client.objects.order_by().filter(
+        project_deadline__lte=today + timedelta(days=max(SUMMARY_WINDOWS))
+    ).aggregate(
+        overdue=Count('pk', filter=Q(project_deadline__lt=today)),
+        due_today=Count('pk', filter=Q(project_deadline=today)),
+        **windows
+    )
+    return {
+        'as_of': today.isoformat(),
+        'overdue': counts['overdue'],
+        'due_today': counts['due_today'],
+        'due_within_days': {days: counts[days] for days in windows},
+    }
@@ -0,0 +1,396 @@
+"""
+Query plan regression guard.
+
+Runs the read endpoints in ``CASES`` through the test client, EXPLAINs every
+SELECT they issue and reduces each plan to its table accesses, e.g.
+
+    SEARCH jobs USING INDEX jobs_bd_id_a6a8a4e5 (bd_id=?)
+    SCAN developer_data
+
+Two checks are made on the result:
+
+* a sequential scan (SQLite ``SCAN`` without an index, PostgreSQL ``Seq
+  Scan``) of a table holding more than ``QUERY_PLAN_SEQ_SCAN_ROWS`` rows is
+  flagged, unless the case lists the table in ``allow_seq_scan`` because the
+  endpoint reads the whole table by design;
+* each case's plans are fingerprinted and compared with the snapshot in
+  ``QUERY_PLAN_SNAPSHOT`` (one section per database vendor), so a change
+  that stops a query from using an index fails authapp.tests until the new
+  plans are reviewed and recorded with ``manage.py check_query_plans
+  --update``. The snapshot holds SQLite plans only: on PostgreSQL the
+  comparison is skipped, and only the sequential scan check applies, until
+  a postgresql section is recorded with ``--update``.
+
+Only table accesses are kept. Join strategies and sorts follow PostgreSQL's
+statistics and would make fingerprints flaky. Literals are stripped and a
+statement repeated in a loop is kept once, so the fingerprints do not depend
+on how much data was seeded. SQLite plans do not depend on the data at all
+as long as no ANALYZE has been run.
+"""
+import hashlib
+import json
+import random
+import re
+from datetime import time, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.db import connection, reset_queries
+from django.test import Client as TestClient
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from . import portfolio
+from .models import (
+    BD,
+    Client,
+    Developer_data,
+    InterviewSchedule,
+    InterviewScheduleWithArchive,
+    JobApplication,
+    JobApplicationWithArchive,
+    JobStatusCounter,
+)
+
+
+class Case(NamedTuple):
+    name: str
+    url_name: str
+    params: Optional[dict] = None
+    # Returns the URL kwargs of a detail endpoint, None when there is no row to use
+    kwargs: Optional[Callable] = None
+    allow_seq_scan: tuple = ()
+    before: Optional[Callable] = None
+
+
+def _first(model, field):
+    pk = model.objects.order_by('pk').values_list('pk', flat=True).first()
+    return None if pk is None else {field: pk}
+
+
+CLIENTS, DEVELOPERS, BDS, JOBS, INTERVIEWS, COUNTERS = (
+    model._meta.db_table for model in (Client, Developer_data, BD, JobApplication, InterviewSchedule, JobStatusCounter)
+)
+JOBS_WITH_ARCHIVE, INTERVIEWS_WITH_ARCHIVE = (
+    model._meta.db_table for model in (JobApplicationWithArchive, InterviewScheduleWithArchive)
+)
+
+# Whole-table reads: the list endpoints return every row, the analytics
+# endpoints aggregate over all of them (the first time series request
+# builds the rollup from every job, archived ones included), and the status
+# counters hold one small row per BD and status.
+CASES = [
+    Case('clients', 'client-list-create', allow_seq_scan=(CLIENTS,)),
+    Case('client-portfolio', 'client-portfolio', allow_seq_scan=(CLIENTS,), before=portfolio.invalidate),
+    Case('client-deadlines-due', 'client-deadlines', {'due_within': '30'}),
+    Case('client-deadlines-overdue', 'client-deadlines', {'overdue': 'true'}),
+    Case('client-detail', 'client-detail', kwargs=lambda: _first(Client, 'client_id')),
+
+    Case('developers', 'developer-list-create', allow_seq_scan=(DEVELOPERS,)),
+    Case('developer-detail', 'developer-detail', kwargs=lambda: _first(Developer_data, 'office_id')),
+    Case('developer-search', 'developer-search', allow_seq_scan=(DEVELOPERS,)),
+    # Substring matches on names, locations and skills cannot use a b-tree index
+    Case('developer-search-name', 'developer-search', {'name': 'an'}, allow_seq_scan=(DEVELOPERS,)),
+    Case('developer-search-location', 'developer-search', {'location': 'lahore'}, allow_seq_scan=(DEVELOPERS,)),
+    Case('developer-search-skills', 'developer-search', {'skills': 'Python'}, allow_seq_scan=(DEVELOPERS,)),
+    Case('developer-search-experience', 'developer-search', {'min_experience': '3', 'max_experience': '5'}),
+    Case('developer-search-availability', 'developer-search', {'availability': 'Contract'}),
+    Case('developer-search-salary', 'developer-search', {'min_salary': '50000', 'max_salary': '90000'}),
+
+    Case('bds', 'bd-list-create', allow_seq_scan=(BDS,)),
+    Case('bd-detail', 'bd-detail', kwargs=lambda: _first(BD, 'bd_id')),
+    Case('bd-search-name', 'bd-search', {'name': 'an'}, allow_seq_scan=(BDS,)),
+    Case('bd-search-experience', 'bd-search', {'min_experience': '2'}),
+
+    Case('jobs', 'job-application-list-create', allow_seq_scan=(JOBS,)),
+    Case(
+        'jobs-with-archived', 'job-application-list-create', {'include_archived': '1'},
+        allow_seq_scan=(JOBS, JOBS_WITH_ARCHIVE),
+    ),
+    Case('jobs-by-bd-id', 'job-application-list-create', {'bd_id': 'QP-BD-0001'}),
+    # A handful of statuses: an index measured x1.1 (manage.py bench_indexes)
+    Case('jobs-by-status', 'job-application-list-create', {'status': 'Applied'}, allow_seq_scan=(JOBS,)),
+    Case('jobs-by-company', 'job-application-list-create', {'company': 'labs'}, allow_seq_scan=(JOBS,)),
+    Case('jobs-collapsed', 'job-application-list-create', {'collapse': 'clusters'}, allow_seq_scan=(JOBS,)),
+    Case('job-detail', 'job-application-detail', kwargs=lambda: _first(JobApplication, 'job_id')),
+    Case('job-search', 'job-application-search', {'bd_id': 'QP-BD-0001', 'status': 'Applied'}),
+    Case('job-search-salary', 'job-application-search', {'min_salary': '60000'}),
+    Case('jobs-grouped-by-bd', 'job-applications-by-bd', allow_seq_scan=(BDS,)),
+    Case('job-stats', 'job-application-stats', allow_seq_scan=(JOBS, COUNTERS)),
+    Case('job-funnel', 'job-application-funnel', allow_seq_scan=(COUNTERS,)),
+    Case('job-time-in-stage', 'job-application-time-in-stage', allow_seq_scan=(COUNTERS,)),
+    Case('job-timeseries', 'job-application-timeseries', allow_seq_scan=(JOBS, JOBS_WITH_ARCHIVE)),
+    Case('compensation-developers', 'compensation-stats', {'source': 'developers', 'group_by': 'location'}),
+    Case('compensation-jobs', 'compensation-stats', {'source': 'jobs', 'group_by': 'skill'}),
+
+    Case('interviews', 'interview-schedule-list-create', allow_seq_scan=(INTERVIEWS,)),
+    Case(
+        'interviews-with-archived', 'interview-schedule-list-create', {'include_archived': '1'},
+        allow_seq_scan=(INTERVIEWS, INTERVIEWS_WITH_ARCHIVE),
+    ),
+    Case('interviews-by-developer', 'interview-schedules-by-developer', kwargs=lambda: {'dev_id': 'QP-DEV-0001'}),
+    Case('interviews-by-bd', 'interview-schedules-by-bd', kwargs=lambda: {'bd_id': 'QP-BD-0001'}),
+]
+
+
+# -------- Seed data --------
+_FIRST_NAMES = ('Ali', 'Sana', 'Hamza', 'Ayesha', 'Bilal', 'Zainab', 'Omar', 'Fatima', 'Daniel', 'Maria')
+_LAST_NAMES = ('Khan', 'Ahmed', 'Malik', 'Hussain', 'Qureshi', 'Smith', 'Garcia', 'Chaudhry')
+_LOCATIONS = ('Lahore', 'Karachi', 'Islamabad', 'Remote', 'Dubai', 'London')
+_SKILLS = ('Python', 'Django', 'React', 'TypeScript', 'Go', 'AWS', 'PostgreSQL', 'Docker', 'Flutter')
+_SALARIES = ('80k-100k', '$50/hr', 'PKR 150,000 per month', '60000', '120k+', '45k-70k USD', 'Negotiable')
+_COMPANIES = ('Acme Labs', 'Northwind', 'Globex', 'Initech Labs', 'Umbrella', 'Hooli', 'Stark Systems')
+
+
+def seeded():
+    """Whether the database already holds rows from :func:`seed` (committed by an earlier run)."""
+    return (
+        BD.objects.filter(BD_id__startswith='QP-').exists()
+        or Developer_data.objects.filter(office_id__startswith='QP-').exists()
+    )
+
+
+def seed(rows=500):
+    """
+    Deterministic data for the cases: ``rows`` developers, jobs and clients,
+    ``rows // 4`` BDs and ``rows // 2`` interviews, saved one by one so the
+    derived columns are filled as in production. Raises ValueError when the
+    database already holds seeded rows, whose keys a second seed would reuse.
+    """
+    if seeded():
+        raise ValueError('The database already holds seeded rows (QP-... ids).')
+    rng = random.Random(0)
+    today = timezone.localdate()
+    experience = [value for value, _ in Developer_data.EXPERIENCE_CHOICES]
+    availability = [value for value, _ in Developer_data.AVAILABILITY_CHOICES]
+
+    bds = []
+    for n in range(1, max(1, rows // 4) + 1):
+        bds.append(BD.objects.create(
+            BD_id=f'QP-BD-{n:04d}', email=f'qp-bd-{n}@example.com', name=f'{rng.choice(_FIRST_NAMES)} {rng.choice(_LAST_NAMES)}',
+            password='!', salary=rng.choice(_SALARIES), phone='N/A', location=rng.choice(_LOCATIONS),
+            education='N/A', experience=rng.choice(experience), availability=rng.choice(availability),
+        ))
+
+    developers, jobs = [], []
+    for n in range(1, rows + 1):
+        developers.append(Developer_data.objects.create(
+            office_id=f'QP-DEV-{n:04d}', firstName=rng.choice(_FIRST_NAMES), lastName=rng.choice(_LAST_NAMES),
+            email=f'qp-dev-{n}@example.com', phone='N/A', location=rng.choice(_LOCATIONS),
+            professionalTitle='Software Engineer', degree='BS', university='N/A', graduationYear='2020',
+            technicalSkills=rng.sample(_SKILLS, 3), languages=['English'], experience=rng.choice(experience),
+            Salary=rng.choice(_SALARIES), availability=rng.choice(availability),
+        ))
+        jobs.append(JobApplication.objects.create(
+            bd_id=rng.choice(bds), job_title=f'Engineer {n}', company=rng.choice(_COMPANIES),
+            location=rng.choice(_LOCATIONS), salary_range=rng.choice(_SALARIES),
+            platform=rng.choice(JobApplication.PLATFORM_CHOICES)[0], skills=rng.sample(_SKILLS, 3),
+            job_url=f'https://jobs.example.com/{n}', job_description=f'Role {n}',
+            application_status=rng.choice(JobApplication.APPLICATION_STATUS_CHOICES)[0],
+        ))
+        Client.objects.create(
+            client_name=f'Client {n}', company_name=rng.choice(_COMPANIES), email=f'qp-client-{n}@example.com',
+            hourly_rate=Decimal(rng.randint(20, 150)), project_deadline=today + timedelta(days=rng.randint(-30, 120)),
+            project_name=f'Project {n}',
+        )
+
+    for n in range(rows // 2):
+        job = jobs[n]
+        InterviewSchedule.objects.create(
+            bd_id=job.bd_id, dev_id=developers[n], job_id=job, company_name=job.company, role=job.job_title,
+            interview_date=today + timedelta(days=n % 30), interview_time=time(10 + n % 8),
+        )
+
+    if connection.vendor == 'postgresql':
+        # Give the planner real row counts instead of its defaults for fresh tables
+        with connection.cursor() as cursor:
+            for model in (BD, Developer_data, JobApplication, InterviewSchedule, Client):
+                cursor.execute(f'ANALYZE {connection.ops.quote_name(model._meta.db_table)}')
+
+
+# -------- Plans --------
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r'\(\?(?:,\s*\?)*\)')
+_ALIASES = re.compile(r'(?:FROM|JOIN)\s+"(\w+)"\s+(?:AS\s+)?"?(\w+)"?', re.IGNORECASE)
+
+
+def normalize(sql):
+    return _IN_LISTS.sub('(?)', _LITERALS.sub('?', sql))
+
+
+def _sqlite_plan(sql):
+    aliases = {alias: table for table, alias in _ALIASES.findall(sql)}
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+        details = [row[-1] for row in cursor.fetchall()]
+    accesses = []
+    for detail in details:
+        action, _, rest = detail.partition(' ')
+        if action not in ('SCAN', 'SEARCH'):
+            continue
+        name, _, how = rest.partition(' ')
+        table = aliases.get(name, name)
+        accesses.append((f'{action} {table} {how}'.strip(), table if action == 'SCAN' and 'USING' not in how else None))
+    return accesses
+
+
+def _postgresql_plan(sql):
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    accesses = []
+
+    def walk(node):
+        table = node.get('Relation Name')
+        index = node.get('Index Name')
+        if table or index:
+            access = ' '.join(filter(None, (node['Node Type'], table, index and f'USING {index}')))
+            accesses.append((access, table if node['Node Type'] == 'Seq Scan' else None))
+        for child in node.get('Plans', ()):
+            walk(child)
+
+    walk(plan[0]['Plan'])
+    return accesses
+
+
+def explain(sql):
+    """[(access, table when it is a sequential scan else None)] for one SELECT."""
+    if connection.vendor == 'postgresql':
+        return _postgresql_plan(sql)
+    if connection.vendor == 'sqlite':
+        return _sqlite_plan(sql)
+    raise NotImplementedError(f'No plan reader for {connection.vendor}')
+
+
+def fingerprint(plans):
+    return hashlib.sha1(json.dumps(plans).encode()).hexdigest()[:16]
+
+
+class CaseResult(NamedTuple):
+    case: Case
+    path: str
+    status_code: int
+    queries: int
+    statements: list  # distinct SELECTs, in the order they ran
+    plans: list  # table accesses of each statement
+    seq_scans: dict  # table -> rows, for scans over the threshold that are not allowed
+
+    @property
+    def fingerprint(self):
+        return fingerprint(self.plans)
+
+
+def run_case(case, client, table_rows):
+    kwargs = case.kwargs() if case.kwargs else None
+    if case.kwargs and kwargs is None:
+        return None
+    path = reverse(case.url_name, kwargs=kwargs)
+    if case.params:
+        path = f'{path}?{urlencode(case.params)}'
+    if case.before:
+        case.before()
+
+    # With DEBUG on, a log already at its size limit (after seeding) would
+    # leave the context nothing to capture
+    reset_queries()
+    with CaptureQueriesContext(connection) as captured:
+        response = client.get(path)
+
+    threshold = getattr(settings, 'QUERY_PLAN_SEQ_SCAN_ROWS', 1000)
+    statements, plans, seen, seq_scans = [], [], set(), {}
+    for query in captured.captured_queries:
+        sql = query['sql']
+        if not sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+            continue
+        key = normalize(sql)
+        if key in seen:
+            continue
+        seen.add(key)
+        statements.append(sql)
+        accesses = explain(sql)
+        plans.append([access for access, _ in accesses])
+        for _, table in accesses:
+            if table and table not in case.allow_seq_scan and table_rows(table) > threshold:
+                seq_scans[table] = table_rows(table)
+    return CaseResult(case, path, response.status_code, len(captured.captured_queries), statements, plans, seq_scans)
+
+
+def capture(cases=CASES):
+    """Run ``cases`` against the current database; detail cases without a row to use are skipped."""
+    counts = {}
+
+    def table_rows(table):
+        if table not in counts:
+            with connection.cursor() as cursor:
+                cursor.execute(f'SELECT COUNT(*) FROM {connection.ops.quote_name(table)}')
+                counts[table] = cursor.fetchone()[0]
+        return counts[table]
+
+    client = TestClient()
+    results = []
+    # Everything on the primary, through the database rather than the roster
+    # snapshot, and without rate limits
+    with override_settings(
+        ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+        DATABASE_REPLICAS=[], ROSTER_SNAPSHOT=False, THROTTLE_ENABLED=False,
+    ):
+        for case in cases:
+            result = run_case(case, client, table_rows)
+            if result is not None:
+                results.append(result)
+    return results
+
+
+# -------- Snapshot --------
+def snapshot_path():
+    return Path(getattr(settings, 'QUERY_PLAN_SNAPSHOT', Path(__file__).with_name('query_plans.json')))
+
+
+def load_snapshot():
+    path = snapshot_path()
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())
+
+
+def save_snapshot(results, vendor=None):
+    """Record ``results`` as the accepted plans of ``vendor`` (the current database's by default)."""
+    snapshot = load_snapshot()
+    snapshot[vendor or connection.vendor] = {
+        result.case.name: {'fingerprint': result.fingerprint, 'plans': result.plans}
+        for result in results
+    }
+    snapshot_path().write_text(json.dumps(snapshot, indent=2, sort_keys=True) + '\n')
+
+
+def problems(results, accepted):
+    """
+    Messages for every flagged scan, failed request and plan change.
+    ``accepted`` is the vendor's section of the snapshot; None skips the
+    fingerprint comparison.
+    """
+    messages = []
+    for result in results:
+        name = result.case.name
+        if result.status_code >= 400:
+            messages.append(f'{name}: GET {result.path} returned {result.status_code}')
+        for table, rows in result.seq_scans.items():
+            messages.append(f'{name}: sequential scan of {table} ({rows} rows)')
+        if accepted is None:
+            continue
+        expected = accepted.get(name)
+        if expected is None:
+            messages.append(f'{name}: no plans recorded')
+        elif expected['fingerprint'] != result.fingerprint:
+            was = sorted({access for plan in expected['plans'] for access in plan})
+            now = sorted({access for plan in result.plans for access in plan})
+            removed = [access for access in was if access not in now]
+            added = [access for access in now if access not in was]
+            messages.append(f'{name}: plans changed (removed {removed}, added {added})')
+    return messages
@@ -0,0 +1,231 @@
+"""
+Weekly per-BD performance reports.
+
+A report run covers one Monday-to-Sunday week and writes one
+``BDWeeklyReport`` row per BD: the applications added that week by current
+status, the status changes made that week, interviews scheduled, cohort
+conversion rates and the most requested skills.
+
+BDs are independent, so the work is fanned out per BD over a
+``ProcessPoolExecutor`` (``REPORT_PROCESSES`` workers, default one per CPU).
+Each worker streams its BD's jobs with ``QuerySet.iterator()``, which reads
+through a server-side cursor on PostgreSQL, so no BD's rows are ever held in
+memory at once. Workers only read; the parent stores each BD's result as it
+arrives and bumps ``BDReportRun.completed_bds``, which is what the API's
+progress polling reads.
+
+Runs are started by ``manage.py generate_bd_reports`` or queued from the API
+as the ``generate_bd_weekly_reports`` background task (authapp.tasks). The
+API only accepts runs while the task queue is enabled, since an inline run
+would fork the pool and do the whole report inside the request.
+"""
+import logging
+import multiprocessing
+import os
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import Count, F
+from django.utils import timezone
+
+from . import tasks
+from .models import (
+    BD,
+    BDReportRun,
+    BDWeeklyReport,
+    InterviewScheduleWithArchive,
+    JobApplicationWithArchive,
+    JobStatusTransition,
+)
+
+logger = logging.getLogger(__name__)
+
+TOP_SKILLS = 10
+STREAM_CHUNK = 2000
+
+# Statuses counted as reached by a job once it entered them at any point
+MILESTONES = ('Interview Scheduled', 'Offer Received', 'Accepted')
+
+
+def week_bounds(day=None):
+    """Monday and Sunday of the week containing ``day``; by default the last complete week."""
+    if day is None:
+        day = timezone.localdate() - timedelta(days=7)
+    start = day - timedelta(days=day.weekday())
+    return start, start + timedelta(days=6)
+
+
+def _rate(numerator, denominator):
+    return round(numerator / denominator, 4) if denominator else None
+
+
+def compute_bd_report(bd_id, week_start, week_end):
+    """One BD's figures for the week, as ``BDWeeklyReport`` field values. Archived jobs still count."""
+    cohort = JobApplicationWithArchive.objects.for_bd(bd_id).filter(applied_date__range=(week_start, week_end)).order_by()
+
+    statuses = Counter()
+    skills = Counter()
+    for application_status, job_skills in cohort.values_list('application_status', 'skills').iterator(chunk_size=STREAM_CHUNK):
+        statuses[application_status] += 1
+        if isinstance(job_skills, list):
+            skills.update({skill.strip() for skill in job_skills if isinstance(skill, str) and skill.strip()})
+    jobs_total = sum(statuses.values())
+
+    period_start = timezone.make_aware(datetime.combine(week_start, time.min))
+    period_end = timezone.make_aware(datetime.combine(week_end + timedelta(days=1), time.min))
+    transitions = dict(
+        JobStatusTransition.objects.order_by()
+        .filter(bd_id=bd_id, changed_at__gte=period_start, changed_at__lt=period_end)
+        .exclude(from_status=None)
+        .values_list('to_status')
+        .annotate(n=Count('pk'))
+    )
+    reached = dict(
+        JobStatusTransition.objects.order_by()
+        .filter(job_id__in=cohort.values('job_id'), to_status__in=MILESTONES)
+        .values_list('to_status')
+        .annotate(n=Count('job_id', distinct=True))
+    )
+    interviews = InterviewScheduleWithArchive.objects.for_bd(bd_id).filter(interview_date__range=(week_start, week_end)).count()
+
+    return {
+        'jobs_total': jobs_total,
+        'jobs_by_status': dict(statuses),
+        'transitions_by_status': transitions,
+        'interviews_scheduled': interviews,
+        'conversion': {
+            'interview_rate': _rate(reached.get('Interview Scheduled', 0), jobs_total),
+            'offer_rate': _rate(reached.get('Offer Received', 0), jobs_total),
+            'acceptance_rate': _rate(reached.get('Accepted', 0), reached.get('Offer Received', 0)),
+            'rejection_rate': _rate(statuses.get('Rejected', 0), jobs_total),
+        },
+        'top_skills': [
+            {'skill': skill, 'count': count}
+            for skill, count in sorted(skills.items(), key=lambda item: (-item[1], item[0]))[:TOP_SKILLS]
+        ],
+    }
+
+
+def store_bd_report(run, bd_id, values):
+    """Save one BD's report and count it towards the run's progress."""
+    values = dict(values, week_start=run.week_start)
+    values['bd_name'] = BD.objects.filter(pk=bd_id).values_list('name', flat=True).first() or ''
+    BDWeeklyReport.objects.update_or_create(run_id=run.pk, bd_id=bd_id, defaults=values)
+    BDReportRun.objects.filter(pk=run.pk).update(completed_bds=F('completed_bds') + 1)
+
+
+def _init_pool_worker():
+    # Spawned workers start without Django; forked ones must not reuse the
+    # parent's connections (closed before forking) and have no log listener
+    # thread (see backend.log.use_plain_handlers)
+    import django
+    from django.apps import apps
+    from backend.log import use_plain_handlers
+    if not apps.ready:
+        django.setup()
+    connections.close_all()
+    use_plain_handlers()
+
+
+def _pool_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('fork' if 'fork' in methods else 'spawn')
+
+
+def report_processes():
+    return getattr(settings, 'REPORT_PROCESSES', 0) or os.cpu_count() or 1
+
+
+def run_report(run, processes=None):
+    """Generate every BD's report for ``run``. Returns the run, reloaded."""
+    bd_ids = list(BD.objects.order_by('BD_id').values_list('BD_id', flat=True))
+    BDReportRun.objects.filter(pk=run.pk).update(
+        status='running', started_at=timezone.now(), total_bds=len(bd_ids), completed_bds=0, error='',
+    )
+    processes = min(processes or report_processes(), max(len(bd_ids), 1))
+    failures = {}
+
+    # Workers only read; results are written here as they come in
+    if processes <= 1:
+        for bd_id in bd_ids:
+            try:
+                store_bd_report(run, bd_id, compute_bd_report(bd_id, run.week_start, run.week_end))
+            except Exception as e:
+                logger.exception("Report for BD %s failed", bd_id)
+                failures[bd_id] = repr(e)
+    else:
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=processes, mp_context=_pool_context(), initializer=_init_pool_worker) as pool:
+            futures = {
+                pool.submit(compute_bd_report, bd_id, run.week_start, run.week_end): bd_id
+                for bd_id in bd_ids
+            }
+            for future in as_completed(futures):
+                bd_id = futures[future]
+                try:
+                    store_bd_report(run, bd_id, future.result())
+                except Exception as e:
+                    logger.error("Report for BD %s failed: %r", bd_id, e)
+                    failures[bd_id] = repr(e)
+
+    BDReportRun.objects.filter(pk=run.pk).update(
+        status='failed' if failures else 'done',
+        finished_at=timezone.now(),
+        error='\n'.join(f'{bd_id}: {error}' for bd_id, error in sorted(failures.items())),
+    )
+    run.refresh_from_db()
+    logger.info(
+        "BD report run %s for week %s: %d/%d BDs in %d processes",
+        run.pk, run.week_start, run.completed_bds, run.total_bds, processes,
+    )
+    return run
+
+
+@tasks.task(name='generate_bd_weekly_reports', max_attempts=1)
+def generate_report_task(run_id):
+    run_report(BDReportRun.objects.get(pk=run_id))
+
+
+def start_report(week_start=None):
+    """
+    Create a run for the week containing ``week_start`` and queue it. Returns
+    the run. With the task queue disabled the run happens inline, so callers
+    serving a request check ``tasks.enabled()`` first.
+    """
+    week_start, week_end = week_bounds(week_start)
+    run = BDReportRun.objects.create(week_start=week_start, week_end=week_end)
+    tasks.enqueue('generate_bd_weekly_reports', {'run_id': run.pk})
+    run.refresh_from_db()
+    return run
+
+
+def progress(run):
+    return {
+        'completed_bds': run.completed_bds,
+        'total_bds': run.total_bds,
+        'percent': round(100 * run.completed_bds / run.total_bds, 1) if run.total_bds else (100.0 if run.status == 'done' else 0.0),
+    }
+
+
+def run_summary(run):
+    return {
+        'run_id': run.run_id,
+        'week_start': run.week_start.isoformat(),
+        'week_end': run.week_end.isoformat(),
+        'status': run.status,
+        'progress': progress(run),
+        'error': run.error or None,
+        'created_at': run.created_at.isoformat(),
+        'started_at': run.started_at.isoformat() if run.started_at else None,
+        'finished_at': run.finished_at.isoformat() if run.finished_at else None,
+    }
+
+
+def report_rows(run):
+    return list(run.reports.values(
+        'bd_id', 'bd_name', 'jobs_total', 'jobs_by_status', 'transitions_by_status',
+        'interviews_scheduled', 'conversion', 'top_skills',
+    ))
@@ -0,0 +1,284 @@
+"""
+In-process snapshot of the developer roster for the developer list and
+search endpoints.
+
+The roster is small and read far more often than it changes, so each
+process keeps it in memory: every developer's serialized representation
+plus NumPy columns to filter on.
+
+* experience, availability and location are small-int codes into
+  per-column vocabularies, and the experience bounds in years are int
+  columns (-1 for an open-ended max);
+* first/last names are fixed-width lower-cased string arrays;
+* skills are a sparse bitmap in CSR form: for skill ``s``,
+  ``skill_rows[skill_ptr[s]:skill_ptr[s + 1]]`` are the rows that list it.
+
+A search ANDs boolean masks over those columns, so it never touches the
+database or the serializer. Substring criteria (location, skills, name)
+are matched against the vocabularies first, and those are far smaller
+than the roster.
+
+Freshness: the snapshot remembers the roster's ``(max(updated_at),
+count)``. That pair is re-read at most every ``ROSTER_SNAPSHOT_CHECK_SECONDS``
+and immediately after a local write (authapp.signals). When it changed,
+only rows updated since the snapshot's watermark are reloaded. Deleted rows
+are found by comparing primary keys when the count disagrees. While one
+thread refreshes, other requests read from the database rather than wait or
+serve stale rows. A refresh builds a new snapshot and publishes it with one
+assignment; a published snapshot is never modified, so requests still
+reading the previous one see consistent columns.
+
+Requires NumPy and ``ROSTER_SNAPSHOT``; otherwise, or for a query the
+snapshot cannot answer exactly, callers use the database.
+"""
+import logging
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Max
+
+from backend.startup import optional_import
+
+from .fast_serializers import serialize_list
+from .fieldsets import prune_representation, resolve_fieldset
+from .models import Developer_data
+from .serializers import DeveloperDataSerializer
+
+# NumPy, imported by enabled(): workers with the snapshot off never load it
+np = None
+
+logger = logging.getLogger(__name__)
+
+# Same order as the list endpoint's queryset
+ORDERING = ('-created_at', 'office_id')
+
+# Rows committed by transactions that started before the last refresh can
+# carry an updated_at older than the watermark; reloading a short overlap
+# picks them up.
+WATERMARK_OVERLAP = timedelta(minutes=1)
+
+# Skill text the snapshot cannot match the way the database's icontains on
+# the JSON column text does (it spans list items or hits escaping)
+_JSON_SYNTAX = frozenset('",[]\\')
+
+
+def enabled():
+    global np
+    if not getattr(settings, 'ROSTER_SNAPSHOT', False):
+        return False
+    np = optional_import('numpy')
+    return np is not None
+
+
+def db_version():
+    state = Developer_data.objects.aggregate(latest=Max('updated_at'), total=Count('pk'))
+    return state['latest'], state['total']
+
+
+def _load(queryset):
+    """{office_id: record} for ``queryset``; a record is what the snapshot keeps per developer."""
+    queryset = queryset.order_by(*ORDERING)
+    created = dict(queryset.values_list('office_id', 'created_at'))
+    records = {}
+    for representation in serialize_list(queryset, DeveloperDataSerializer):
+        skills = representation.get('technicalSkills')
+        if isinstance(skills, str):
+            skills = [skills] if skills else []
+        elif not isinstance(skills, list):
+            skills = []
+        office_id = representation['office_id']
+        records[office_id] = {
+            'representation': representation,
+            'created_at': created[office_id],
+            'experience': representation.get('experience') or '',
+            'min_years': representation.get('experience_min_years'),
+            'max_years': representation.get('experience_max_years'),
+            'availability': representation.get('availability') or '',
+            'location': representation.get('location') or '',
+            'first_name': (representation.get('firstName') or '').casefold(),
+            'last_name': (representation.get('lastName') or '').casefold(),
+            'skills': [skill for skill in skills if isinstance(skill, str)],
+        }
+    return records
+
+
+def _years(value):
+    # NULL bounds never satisfy a range filter in the database either
+    return -1 if value is None else value
+
+
+def _encode(values):
+    """Small-int codes for ``values`` and the vocabulary they index."""
+    vocabulary = sorted(set(values))
+    index = {value: code for code, value in enumerate(vocabulary)}
+    dtype = np.int16 if len(vocabulary) < 2 ** 15 else np.int32
+    return np.fromiter((index[value] for value in values), dtype=dtype, count=len(values)), vocabulary
+
+
+class RosterSnapshot:
+    """Immutable once built: :meth:`refresh` returns a new snapshot."""
+
+    def __init__(self, records, version):
+        self.records = records
+        self.version = version
+        self.watermark = version[0]
+        self._materialize()
+
+    # -------- Building --------
+    def _materialize(self):
+        """Rebuild the NumPy columns from ``records`` (in list order)."""
+        ordered = sorted(self.records.values(), key=lambda record: record['representation']['office_id'])
+        ordered.sort(key=lambda record: record['created_at'], reverse=True)
+        self.representations = [record['representation'] for record in ordered]
+        self.experience, self.experience_values = _encode([record['experience'] for record in ordered])
+        self.availability, self.availability_values = _encode([record['availability'] for record in ordered])
+        self.location, self.location_values = _encode([record['location'] for record in ordered])
+        self.min_years = np.array([_years(record['min_years']) for record in ordered], dtype=np.int16)
+        self.max_years = np.array([_years(record['max_years']) for record in ordered], dtype=np.int16)
+        self.first_names = np.array([record['first_name'] for record in ordered], dtype=str)
+        self.last_names = np.array([record['last_name'] for record in ordered], dtype=str)
+
+        # CSR sparse bitmap: rows grouped by skill id
+        skill_lists = [record['skills'] for record in ordered]
+        self.skill_values = sorted({skill for skills in skill_lists for skill in skills})
+        index = {skill: code for code, skill in enumerate(self.skill_values)}
+        lengths = np.fromiter((len(set(skills)) for skills in skill_lists), dtype=np.int64, count=len(skill_lists))
+        skill_ids = np.fromiter(
+            (index[skill] for skills in skill_lists for skill in dict.fromkeys(skills)),
+            dtype=np.int32, count=int(lengths.sum()),
+        )
+        rows = np.repeat(np.arange(len(ordered), dtype=np.int32), lengths)
+        order = np.argsort(skill_ids, kind='stable')
+        self.skill_rows = rows[order]
+        self.skill_ptr = np.concatenate(([0], np.cumsum(np.bincount(skill_ids, minlength=len(self.skill_values)))))
+
+    @classmethod
+    def build(cls):
+        version = db_version()
+        return cls(_load(Developer_data.objects.all()), version)
+
+    def refresh(self, version):
+        """A new snapshot with the rows changed since the watermark reloaded and deleted ones dropped."""
+        records = dict(self.records)
+        changed = Developer_data.objects.all()
+        if self.watermark is not None:
+            changed = changed.filter(updated_at__gte=self.watermark - WATERMARK_OVERLAP)
+        records.update(_load(changed))
+        if len(records) != version[1]:
+            alive = set(Developer_data.objects.values_list('office_id', flat=True))
+            for office_id in set(records) - alive:
+                del records[office_id]
+            missing = alive - set(records)
+            if missing:
+                records.update(_load(Developer_data.objects.filter(office_id__in=missing)))
+        return RosterSnapshot(records, version)
+
+    # -------- Querying --------
+    @staticmethod
+    def _matching_codes(vocabulary, text):
+        text = text.casefold()
+        return [code for code, value in enumerate(vocabulary) if text in value.casefold()]
+
+    def search(self, name=None, experience=None, availability=None, location=None, skills=None,
+               min_years=None, max_years=None):
+        """Representations matching every given criterion, in list order."""
+        mask = np.ones(len(self.representations), dtype=bool)
+        if min_years is not None:
+            mask &= self.min_years >= min_years
+        if max_years is not None:
+            mask &= (self.max_years >= 0) & (self.max_years <= max_years)
+        if experience:
+            if experience not in self.experience_values:
+                return []
+            mask &= self.experience == self.experience_values.index(experience)
+        if availability:
+            if availability not in self.availability_values:
+                return []
+            mask &= self.availability == self.availability_values.index(availability)
+        if location:
+            mask &= np.isin(self.location, self._matching_codes(self.location_values, location))
+        if skills:
+            with_skill = np.zeros(len(self.representations), dtype=bool)
+            for code in self._matching_codes(self.skill_values, skills):
+                with_skill[self.skill_rows[self.skill_ptr[code]:self.skill_ptr[code + 1]]] = True
+            mask &= with_skill
+        if name:
+            name = name.casefold()
+            mask &= (np.char.find(self.first_names, name) >= 0) | (np.char.find(self.last_names, name) >= 0)
+        return [self.representations[row] for row in np.flatnonzero(mask)]
+
+
+class _State:
+    def __init__(self):
+        self.snapshot = None
+        self.checked_at = 0.0
+        self.stale = False
+        self.lock = threading.Lock()
+
+
+_state = _State()
+
+
+def mark_stale():
+    """Make the next read re-check the database; called after local writes."""
+    _state.stale = True
+
+
+def current_snapshot():
+    """A snapshot matching the database, or None when the caller should query it directly."""
+    if not enabled():
+        return None
+    snapshot = _state.snapshot
+    check_seconds = getattr(settings, 'ROSTER_SNAPSHOT_CHECK_SECONDS', 1)
+    if snapshot is not None and not _state.stale and time.monotonic() - _state.checked_at < check_seconds:
+        return snapshot
+
+    if not _state.lock.acquire(blocking=False):
+        # Another thread is refreshing; the database is always current
+        return None
+    try:
+        _state.stale = False
+        version = db_version()
+        if snapshot is None:
+            snapshot = RosterSnapshot.build()
+        elif snapshot.version != version:
+            snapshot = snapshot.refresh(version)
+        # Readers holding the previous snapshot keep using it unchanged
+        _state.snapshot = snapshot
+        _state.checked_at = time.monotonic()
+        return snapshot
+    except Exception:
+        logger.exception("Could not refresh the developer roster snapshot")
+        _state.snapshot = None
+        return None
+    finally:
+        _state.lock.release()
+
+
+def search(params, min_years=None, max_years=None):
+    """
+    Developer representations for the search/list query ``params`` (and the
+    parsed experience range), or None when the database has to answer
+    (snapshot off or stale, or a criterion it cannot evaluate exactly).
+    """
+    skills = params.get('skills')
+    if skills and _JSON_SYNTAX.intersection(skills):
+        return None
+    snapshot = current_snapshot()
+    if snapshot is None:
+        return None
+    rows = snapshot.search(
+        name=params.get('name'),
+        experience=params.get('experience'),
+        availability=params.get('availability'),
+        location=params.get('location'),
+        skills=skills,
+        min_years=min_years,
+        max_years=max_years,
+    )
+    fieldset = resolve_fieldset(DeveloperDataSerializer, params.get('fields'))
+    if fieldset is not None:
+        rows = [prune_representation(row, fieldset) for row in rows]
+    return rows
@@ -2,9 +2,14 @@ from rest_framework import serializers
 from django.contrib.auth.hashers import make_password, check_password
 from rest_framework_simplejwt.tokens import RefreshToken
 from .models import Admin, Developer, Client, Developer_data, BD,JobApplication,InterviewSchedule
+from .workflow import InvalidTransition, validate_transition
+from django.conf import settings
 from django.utils import timezone
+import logging
 import re
 
+logger = logging.getLogger(__name__)
+
 ROLE_MODEL_MAP = {
     'admin': Admin,
     'developer': Developer,
@@ -12,6 +17,48 @@ ROLE_MODEL_MAP = {
     'bd': BD,  # Added BD to role model mapping
 }
 
+def use_display_fields():
+    """True when list payloads read BD/developer info from the denormalized columns."""
+    return getattr(settings, 'DENORMALIZED_DISPLAY_FIELDS', False)
+
+
+def bd_info(instance):
+    """
+    BD summary embedded in job and interview payloads.
+
+    Reads the denormalized copy when enabled so no join is needed, falling back
+    to the related BD for rows that were never filled.
+    """
+    if use_display_fields() and instance.bd_display_name:
+        return {
+            'bd_id': instance.bd_id_id,
+            'name': instance.bd_display_name,
+            'email': instance.bd_display_email
+        }
+    return {
+        'bd_id': instance.bd_id.BD_id,
+        'name': instance.bd_id.name,
+        'email': instance.bd_id.email
+    }
+
+
+def developer_info(instance):
+    """Developer summary embedded in interview payloads, see :func:`bd_info`."""
+    if use_display_fields() and instance.dev_display_name:
+        return {
+            'office_id': instance.dev_id_id,
+            'name': instance.dev_display_name,
+            'email': instance.dev_display_email,
+            'title': instance.dev_display_title
+        }
+    return {
+        'office_id': instance.dev_id.office_id,
+        'name': instance.dev_id.full_name,
+        'email': instance.dev_id.email,
+        'title': instance.dev_id.professionalTitle
+    }
+
+
 def get_tokens_for_user(user, role):
     refresh = RefreshToken.for_user(user)
     refresh['role'] = role
@@ -329,28 +376,18 @@ class BDSerializer(serializers.ModelSerializer):
         """
         Validate experience field
         """
-        if not value:
-            return "0-1 years"  # Default value
-            
-        # Check if the value is in the allowed choices
         valid_choices = [choice[0] for choice in BD.EXPERIENCE_CHOICES]
         if value not in valid_choices:
-            return "0-1 years"  # Default to first choice if invalid
-            
+            raise serializers.ValidationError(f"Invalid experience. Must be one of: {', '.join(valid_choices)}")
         return value
 
     def validate_availability(self, value):
         """
         Validate availability field
         """
-        if not value:
-            return "Full-time"  # Default value
-            
-        # Check if the value is in the allowed choices
         valid_choices = [choice[0] for choice in BD.AVAILABILITY_CHOICES]
         if value not in valid_choices:
-            return "Full-time"  # Default to first choice if invalid
-            
+            raise serializers.ValidationError(f"Invalid availability. Must be one of: {', '.join(valid_choices)}")
         return value
 
     def create(self, validated_data):
@@ -376,7 +413,7 @@ class BDSerializer(serializers.ModelSerializer):
                 
             return super().create(validated_data)
         except Exception as e:
-            print(f"Error creating BD: {str(e)}")  # For debugging
+            logger.exception("Error creating BD")
             raise serializers.ValidationError(f"Error creating BD: {str(e)}")
 
     def update(self, instance, validated_data):
@@ -397,7 +434,7 @@ class BDSerializer(serializers.ModelSerializer):
             instance.save()
             return instance
         except Exception as e:
-            print(f"Error updating BD: {str(e)}")  # For debugging
+            logger.exception("Error updating BD")
             raise serializers.ValidationError(f"Error updating BD: {str(e)}")
 
     def to_representation(self, instance):
@@ -556,13 +593,16 @@ class DeveloperDataSerializer(serializers.ModelSerializer):
 
 class JobApplicationSerializer(serializers.ModelSerializer):
     # Add read-only fields for better data representation
-    bd_name = serializers.CharField(source='bd_id.name', read_only=True)
+    bd_name = serializers.SerializerMethodField()
     skills_display = serializers.CharField(source='skills_list', read_only=True)
     
     class Meta:
         model = JobApplication
-        fields = '__all__'
-        read_only_fields = ('job_id', 'created_at', 'updated_at', 'applied_date')
+        exclude = ('bd_display_name', 'bd_display_email', 'dedup_fingerprint')
+        read_only_fields = ('job_id', 'status_changed_at', 'cluster_id', 'created_at', 'updated_at', 'applied_date')
+
+    def get_bd_name(self, instance):
+        return bd_info(instance)['name']
 
     def validate_bd_id(self, value):
         """
@@ -655,6 +695,12 @@ class JobApplicationSerializer(serializers.ModelSerializer):
             valid_statuses = [choice[0] for choice in JobApplication.APPLICATION_STATUS_CHOICES]
             if value not in valid_statuses:
                 raise serializers.ValidationError(f"Invalid application status. Must be one of: {', '.join(valid_statuses)}")
+            # Existing applications must follow the status workflow
+            if self.instance is not None:
+                try:
+                    validate_transition(self.instance.application_status, value)
+                except InvalidTransition as e:
+                    raise serializers.ValidationError(str(e))
         return value
 
     def to_representation(self, instance):
@@ -672,11 +718,7 @@ class JobApplicationSerializer(serializers.ModelSerializer):
             representation['applied_date'] = instance.applied_date.isoformat()
             
         # Add BD information
-        representation['bd_info'] = {
-            'bd_id': instance.bd_id.BD_id,
-            'name': instance.bd_id.name,
-            'email': instance.bd_id.email
-        }
+        representation['bd_info'] = bd_info(instance)
         
         return representation
 
@@ -708,7 +750,7 @@ class JobApplicationSerializer(serializers.ModelSerializer):
 
 # Optional: Create a simplified serializer for listing jobs
 class JobApplicationListSerializer(serializers.ModelSerializer):
-    bd_name = serializers.CharField(source='bd_id.name', read_only=True)
+    bd_name = serializers.SerializerMethodField()
     skills_display = serializers.CharField(source='skills_list', read_only=True)
     
     class Meta:
@@ -717,20 +759,19 @@ class JobApplicationListSerializer(serializers.ModelSerializer):
             'job_id', 'job_title', 'company', 'location', 'salary_range',
             'job_type', 'experience_level', 'platform', 'job_url', 'skills',
             'job_description', 'key_requirements', 'personal_notes', 
-            'application_status', 'bd_name', 'skills_display', 'applied_date', 
+            'application_status', 'cluster_id', 'bd_name', 'skills_display', 'applied_date', 
             'created_at', 'updated_at'
         ]
-        read_only_fields = ('job_id', 'created_at', 'updated_at', 'applied_date')
+        read_only_fields = ('job_id', 'cluster_id', 'created_at', 'updated_at', 'applied_date')
+
+    def get_bd_name(self, instance):
+        return bd_info(instance)['name']
 
     def to_representation(self, instance):
         representation = super().to_representation(instance)
         
         # Add BD information
-        representation['bd_info'] = {
-            'bd_id': instance.bd_id.BD_id,
-            'name': instance.bd_id.name,
-            'email': instance.bd_id.email
-        }
+        representation['bd_info'] = bd_info(instance)
         
         # Ensure skills is always an array
         if isinstance(instance.skills, str):
@@ -752,13 +793,22 @@ class JobApplicationListSerializer(serializers.ModelSerializer):
 
 class InterviewScheduleSerializer(serializers.ModelSerializer):
     # Read-only fields for displaying related data
-    bd_name = serializers.CharField(source='bd_id.name', read_only=True)
-    developer_name = serializers.CharField(source='dev_id.full_name', read_only=True)
+    bd_name = serializers.SerializerMethodField()
+    developer_name = serializers.SerializerMethodField()
     
     class Meta:
         model = InterviewSchedule
-        fields = '__all__'
+        exclude = (
+            'bd_display_name', 'bd_display_email',
+            'dev_display_name', 'dev_display_email', 'dev_display_title',
+        )
         read_only_fields = ('interview_id', 'created_at', 'updated_at')
+
+    def get_bd_name(self, instance):
+        return bd_info(instance)['name']
+
+    def get_developer_name(self, instance):
+        return developer_info(instance)['name']
     
     def validate_company_name(self, value):
         if len(value.strip()) < 2:
@@ -779,18 +829,9 @@ class InterviewScheduleSerializer(serializers.ModelSerializer):
         representation = super().to_representation(instance)
         
         # Add BD information
-        representation['bd_info'] = {
-            'bd_id': instance.bd_id.BD_id,
-            'name': instance.bd_id.name,
-            'email': instance.bd_id.email
-        }
+        representation['bd_info'] = bd_info(instance)
         
         # Add Developer information
-        representation['developer_info'] = {
-            'office_id': instance.dev_id.office_id,
-            'name': instance.dev_id.full_name,
-            'email': instance.dev_id.email,
-            'title': instance.dev_id.professionalTitle
-        }
+        representation['developer_info'] = developer_info(instance)
         
         return representation
\ No newline at end of file
@@ -0,0 +1,242 @@
+from django.db.models import OuterRef, Q, Subquery, Value
+from django.db.models.functions import Concat
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import analytics, clustering, compensation, dedup, portfolio, roster, tasks, workflow
+from .experience import experience_years
+from .models import (
+    ArchivedInterviewSchedule,
+    ArchivedJobApplication,
+    BD,
+    Client,
+    Developer_data,
+    InterviewSchedule,
+    JobApplication,
+)
+
+
+# -------- Denormalized display fields --------
+def propagate_bd_display(bd):
+    """Copy a BD's name/email onto every job and interview row, archived or not, that references it."""
+    stale = ~(Q(bd_display_name=bd.name) & Q(bd_display_email=bd.email))
+    values = {'bd_display_name': bd.name, 'bd_display_email': bd.email}
+    return sum(
+        model.objects.filter(bd_id=bd.pk).filter(stale).update(**values)
+        for model in (JobApplication, InterviewSchedule, ArchivedJobApplication, ArchivedInterviewSchedule)
+    )
+
+
+def propagate_developer_display(developer):
+    """Copy a developer's name/email/title onto every interview row, archived or not, that references it."""
+    values = {
+        'dev_display_name': developer.full_name,
+        'dev_display_email': developer.email,
+        'dev_display_title': developer.professionalTitle,
+    }
+    stale = ~Q(**values)
+    return sum(
+        model.objects.filter(dev_id=developer.pk).filter(stale).update(**values)
+        for model in (InterviewSchedule, ArchivedInterviewSchedule)
+    )
+
+
+@tasks.task(name='propagate_bd_display')
+def propagate_bd_display_task(bd_id):
+    bd = BD.objects.filter(pk=bd_id).first()
+    if bd is not None:
+        propagate_bd_display(bd)
+
+
+@tasks.task(name='propagate_developer_display')
+def propagate_developer_display_task(office_id):
+    developer = Developer_data.objects.filter(pk=office_id).first()
+    if developer is not None:
+        propagate_developer_display(developer)
+
+
+def refresh_all_display_fields():
+    """Recompute every denormalized display column with set-based updates."""
+    bd = BD.objects.filter(BD_id=OuterRef('bd_id'))
+    developer = Developer_data.objects.filter(office_id=OuterRef('dev_id')).annotate(
+        display_name=Concat('firstName', Value(' '), 'lastName')
+    )
+    bd_values = {
+        'bd_display_name': Subquery(bd.values('name')[:1]),
+        'bd_display_email': Subquery(bd.values('email')[:1]),
+    }
+    interview_values = {
+        'dev_display_name': Subquery(developer.values('display_name')[:1]),
+        'dev_display_email': Subquery(developer.values('email')[:1]),
+        'dev_display_title': Subquery(developer.values('professionalTitle')[:1]),
+        **bd_values,
+    }
+    jobs = JobApplication.objects.update(**bd_values) + ArchivedJobApplication.objects.update(**bd_values)
+    interviews = (
+        InterviewSchedule.objects.update(**interview_values)
+        + ArchivedInterviewSchedule.objects.update(**interview_values)
+    )
+    return jobs, interviews
+
+
+@receiver(pre_save, sender=JobApplication)
+def fill_job_display_fields(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bd = instance.bd_id
+    instance.bd_display_name = bd.name
+    instance.bd_display_email = bd.email
+
+
+@receiver(pre_save, sender=InterviewSchedule)
+def fill_interview_display_fields(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    bd = instance.bd_id
+    developer = instance.dev_id
+    instance.bd_display_name = bd.name
+    instance.bd_display_email = bd.email
+    instance.dev_display_name = developer.full_name
+    instance.dev_display_email = developer.email
+    instance.dev_display_title = developer.professionalTitle
+
+
+@receiver(post_save, sender=BD)
+def bd_display_changed(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        # Can touch every job and interview of the BD; a worker does it
+        # after the request when the task queue is enabled
+        tasks.enqueue('propagate_bd_display', {'bd_id': instance.pk})
+
+
+@receiver(post_save, sender=Developer_data)
+def developer_display_changed(sender, instance, created, raw=False, **kwargs):
+    if not created and not raw:
+        tasks.enqueue('propagate_developer_display', {'office_id': instance.pk})
+
+
+# -------- Experience bounds --------
+@receiver(pre_save, sender=BD)
+@receiver(pre_save, sender=Developer_data)
+def fill_experience_years(sender, instance, **kwargs):
+    # Derived from the row itself, so fixtures (raw saves) get it too
+    instance.experience_min_years, instance.experience_max_years = experience_years(instance.experience)
+
+
+# -------- Parsed salaries --------
+@receiver(pre_save, sender=Developer_data)
+def fill_developer_salary(sender, instance, **kwargs):
+    compensation.fill_salary_fields(instance, instance.Salary)
+
+
+@receiver(pre_save, sender=BD)
+def fill_bd_salary(sender, instance, **kwargs):
+    compensation.fill_salary_fields(instance, instance.salary)
+
+
+@receiver(pre_save, sender=JobApplication)
+def fill_job_salary(sender, instance, **kwargs):
+    compensation.fill_salary_fields(instance, instance.salary_range)
+
+
+# -------- Duplicate detection --------
+@receiver(pre_save, sender=JobApplication)
+def fill_dedup_fingerprint(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    instance.dedup_fingerprint = dedup.fingerprint_of(instance)
+
+
+# -------- Description clusters --------
+@receiver(pre_save, sender=JobApplication)
+def track_description_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._description_changed = False
+    if raw:
+        return
+    if instance._state.adding:
+        instance._description_changed = bool(instance.job_description)
+        return
+    if update_fields is not None and 'job_description' not in update_fields:
+        return
+    if hasattr(instance, '_loaded_description'):
+        previous = instance._loaded_description
+    else:
+        previous = sender.objects.filter(pk=instance.pk).values_list('job_description', flat=True).first()
+    instance._description_changed = previous != instance.job_description
+
+
+@receiver(post_save, sender=JobApplication)
+def recluster_changed_description(sender, instance, raw=False, **kwargs):
+    if raw or not instance._description_changed:
+        return
+    # Its old cluster no longer holds; the next clustering run assigns a new one
+    if instance.cluster_id is not None:
+        sender.objects.filter(pk=instance.pk).update(cluster_id=None)
+        instance.cluster_id = None
+    instance._loaded_description = instance.job_description
+    clustering.schedule_clustering()
+
+
+# -------- Status workflow --------
+@receiver(pre_save, sender=JobApplication)
+def track_status_change(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    if instance._state.adding:
+        instance._previous = None
+        instance.status_changed_at = instance.status_changed_at or timezone.now()
+        return
+    if hasattr(instance, '_loaded_status') and instance._loaded_status is not None:
+        previous = (instance._loaded_status, instance._loaded_bd_id)
+    else:
+        previous = sender.objects.filter(pk=instance.pk).values_list('application_status', 'bd_id').first()
+    previous_changed_at = instance.status_changed_at
+    instance._previous = previous and (previous[0], previous[1], previous_changed_at)
+    if previous and previous[0] != instance.application_status:
+        instance.status_changed_at = timezone.now()
+
+
+@receiver(post_save, sender=JobApplication)
+def log_status_change(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    previous = getattr(instance, '_previous', None)
+    if created:
+        workflow.record_created(instance)
+    elif previous:
+        from_status, from_bd_id, previous_changed_at = previous
+        if from_status != instance.application_status:
+            workflow.record_transition(
+                instance, from_status, from_bd_id, previous_changed_at or instance.created_at
+            )
+        elif from_bd_id != instance.bd_id_id:
+            workflow.record_reassigned(instance, from_bd_id)
+    instance._loaded_status = instance.application_status
+    instance._loaded_bd_id = instance.bd_id_id
+    instance._previous = None
+
+
+@receiver(post_delete, sender=JobApplication)
+def count_deleted_job(sender, instance, **kwargs):
+    workflow.record_deleted(instance.bd_id_id, instance.application_status)
+
+
+# -------- Analytics rollup --------
+@receiver(post_delete, sender=JobApplication)
+def mark_rollup_days_dirty(sender, instance, **kwargs):
+    analytics.mark_days_dirty(instance)
+
+
+# -------- Developer roster snapshot --------
+@receiver(post_save, sender=Developer_data)
+@receiver(post_delete, sender=Developer_data)
+def mark_roster_stale(sender, **kwargs):
+    roster.mark_stale()
+
+
+# -------- Client portfolio rollup --------
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+def invalidate_client_portfolio(sender, **kwargs):
+    portfolio.invalidate()
@@ -0,0 +1,207 @@
+"""
+Database-backed background task queue.
+
+Follow-up work that does not have to finish inside the request is registered
+with :func:`task` and queued with :func:`enqueue`; the task row is written in
+the caller's transaction, so it only becomes visible to workers once the data
+it refers to is committed. ``manage.py run_task_worker`` runs the workers.
+
+* Claiming is a conditional ``UPDATE ... WHERE status = 'queued'`` (after a
+  ``SELECT ... FOR UPDATE SKIP LOCKED`` where the database has it), so any
+  number of worker processes can share the table.
+* A failed task is retried ``max_attempts`` times with exponential backoff
+  and jitter, then left as ``failed`` with its traceback.
+* A task whose worker died is queued again once its lease
+  (``TASK_LEASE_SECONDS``) runs out.
+* ``idempotency_key`` is unique: enqueueing an existing key returns the
+  existing task instead of adding one, until finished tasks are purged
+  after ``TASK_RETENTION_DAYS``.
+
+With ``TASK_QUEUE_ENABLED`` off (the default) :func:`enqueue` runs the task
+inline, so deployments without a worker behave as before.
+"""
+import logging
+import random
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import BackgroundTask
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_SECONDS = 3600
+
+
+@dataclass(frozen=True)
+class TaskSpec:
+    func: object
+    max_attempts: int
+    retry_delay: int
+
+
+REGISTRY = {}
+
+
+def task(name=None, max_attempts=5, retry_delay=10):
+    """Register a function as a task; it is called with the payload as keyword arguments."""
+    def register(func):
+        REGISTRY[name or func.__name__] = TaskSpec(func, max_attempts, retry_delay)
+        return func
+    return register
+
+
+def enabled():
+    return getattr(settings, 'TASK_QUEUE_ENABLED', False)
+
+
+def window_key(name, seconds):
+    """Idempotency key shared by every enqueue of ``name`` in the same ``seconds`` window."""
+    return f'{name}:{int(time.time() // seconds)}'
+
+
+def enqueue(name, payload=None, idempotency_key=None, delay=0):
+    """
+    Queue task ``name``. Returns the ``BackgroundTask`` (an existing one when
+    ``idempotency_key`` was used before), or None when the queue is disabled
+    and the task ran inline.
+    """
+    if name not in REGISTRY:
+        raise ValueError(f"Unknown task '{name}'.")
+    spec = REGISTRY[name]
+    payload = payload or {}
+    if not enabled():
+        spec.func(**payload)
+        return None
+
+    values = {
+        'name': name,
+        'payload': payload,
+        'max_attempts': spec.max_attempts,
+        'run_at': timezone.now() + timedelta(seconds=delay),
+    }
+    if idempotency_key is None:
+        return BackgroundTask.objects.create(**values)
+    try:
+        with transaction.atomic():
+            return BackgroundTask.objects.create(idempotency_key=idempotency_key, **values)
+    except IntegrityError:
+        return BackgroundTask.objects.get(idempotency_key=idempotency_key)
+
+
+def backoff_seconds(retry_delay, attempts):
+    """Exponential backoff with +-20% jitter so failed tasks do not retry in lockstep."""
+    delay = min(retry_delay * 2 ** max(attempts - 1, 0), MAX_BACKOFF_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+# -------- Worker side --------
+def claim(worker, limit=10):
+    """Mark up to ``limit`` due tasks as running for ``worker`` and return them."""
+    now = timezone.now()
+    due = BackgroundTask.objects.filter(status='queued', run_at__lte=now).order_by('run_at', 'task_id')
+    if connection.features.has_select_for_update_skip_locked:
+        due = due.select_for_update(skip_locked=True)
+    claimed = []
+    with transaction.atomic():
+        for task_id in list(due.values_list('task_id', flat=True)[:limit]):
+            # Conditional update: another worker may have taken it meanwhile
+            taken = BackgroundTask.objects.filter(task_id=task_id, status='queued').update(
+                status='running', locked_by=worker, locked_at=now, attempts=F('attempts') + 1,
+            )
+            if taken:
+                claimed.append(task_id)
+    return list(BackgroundTask.objects.filter(task_id__in=claimed).order_by('run_at', 'task_id'))
+
+
+def execute(task_row, worker):
+    """Run a claimed task and record the outcome. Returns True when it succeeded."""
+    spec = REGISTRY.get(task_row.name)
+    mine = BackgroundTask.objects.filter(task_id=task_row.task_id, status='running', locked_by=worker)
+    start = time.perf_counter()
+    try:
+        if spec is None:
+            raise LookupError(f"Unknown task '{task_row.name}'")
+        spec.func(**task_row.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if spec is not None and task_row.attempts < task_row.max_attempts:
+            delay = backoff_seconds(spec.retry_delay, task_row.attempts)
+            mine.update(status='queued', run_at=timezone.now() + timedelta(seconds=delay), last_error=error, locked_by='')
+            logger.warning(
+                "Task %s #%s failed (attempt %d/%d), retrying in %.0fs",
+                task_row.name, task_row.task_id, task_row.attempts, task_row.max_attempts, delay,
+                exc_info=True,
+            )
+        else:
+            mine.update(status='failed', finished_at=timezone.now(), last_error=error, locked_by='')
+            logger.error("Task %s #%s failed permanently", task_row.name, task_row.task_id, exc_info=True)
+        return False
+    mine.update(status='done', finished_at=timezone.now(), last_error='', locked_by='')
+    logger.debug("Task %s #%s done in %.3fs", task_row.name, task_row.task_id, time.perf_counter() - start)
+    return True
+
+
+def release(task_rows, worker):
+    """Put claimed tasks that were not started back in the queue."""
+    for task_row in task_rows:
+        BackgroundTask.objects.filter(task_id=task_row.task_id, status='running', locked_by=worker).update(
+            status='queued', locked_by='', attempts=F('attempts') - 1,
+        )
+
+
+def requeue_expired():
+    """Queue again tasks whose worker stopped without finishing them. Returns the count."""
+    lease = getattr(settings, 'TASK_LEASE_SECONDS', 300)
+    expired = BackgroundTask.objects.filter(status='running', locked_at__lt=timezone.now() - timedelta(seconds=lease))
+    failed = expired.filter(attempts__gte=F('max_attempts')).update(
+        status='failed', finished_at=timezone.now(), last_error='Lease expired', locked_by='',
+    )
+    return failed + expired.update(status='queued', locked_by='')
+
+
+def purge_finished():
+    """Delete done tasks older than ``TASK_RETENTION_DAYS``; failed ones are kept."""
+    cutoff = timezone.now() - timedelta(days=getattr(settings, 'TASK_RETENTION_DAYS', 7))
+    deleted, _ = BackgroundTask.objects.filter(status='done', finished_at__lt=cutoff).delete()
+    return deleted
+
+
+def run_worker(worker, once=False, batch_size=10, poll_interval=1.0, should_stop=lambda: False):
+    """
+    Process tasks until ``should_stop()`` returns True, or until the queue is
+    empty when ``once`` is set. Returns the number of tasks run.
+    """
+    processed = 0
+    last_maintenance = 0.0
+    while not should_stop():
+        try:
+            if time.monotonic() - last_maintenance > 60:
+                requeue_expired()
+                purge_finished()
+                last_maintenance = time.monotonic()
+            batch = claim(worker, batch_size)
+        except DatabaseError:
+            # Lock timeouts and dropped connections: back off and try again
+            logger.warning("Worker %s could not claim tasks", worker, exc_info=True)
+            connection.close_if_unusable_or_obsolete()
+            time.sleep(poll_interval)
+            continue
+        if not batch:
+            if once:
+                break
+            time.sleep(poll_interval)
+            continue
+        for position, task_row in enumerate(batch):
+            if should_stop():
+                release(batch[position:], worker)
+                break
+            execute(task_row, worker)
+            processed += 1
+    return processed
@@ -1,3 +1,691 @@
-from django.test import TestCase
+import io
+import json
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import connection, connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+from backend import routers, throttling
+from backend.startup import optional_import
+from backend.renderers import ORJSONParser, ORJSONRenderer
+
+from . import archive, checks, clustering, compensation, dedup, experience, queryplans, roster, tasks, workflow
+from .fast_serializers import serialize_list
+from .models import (
+    ArchivedInterviewSchedule,
+    ArchivedJobApplication,
+    BackgroundTask,
+    BD,
+    BDReportRun,
+    BDWeeklyReport,
+    Client,
+    Developer_data,
+    IdempotencyRecord,
+    InterviewSchedule,
+    JobApplication,
+    JobApplicationWithArchive,
+    JobStatusCounter,
+    JobStatusTransition,
+)
+from .serializers import BDSerializer, DeveloperDataSerializer, InterviewScheduleSerializer, JobApplicationListSerializer
+
+
+def make_bd(n=1):
+    return BD.objects.create(
+        BD_id=f'T-BD-{n}', email=f't-bd-{n}@example.com', name=f'BD {n}', password='!', salary='$50,000',
+        phone='N/A', location='Remote', education='N/A', experience='1-2 years', availability='Full-time',
+    )
+
+
+def make_developer(n=1):
+    return Developer_data.objects.create(
+        office_id=f'T-DEV-{n}', firstName='Jane', lastName=f'Doe {n}', email=f't-dev-{n}@example.com',
+        phone='N/A', location='Remote', professionalTitle='Software Engineer', degree='BS', university='N/A',
+        graduationYear='2020', technicalSkills=['Python'], languages=['English'], experience='1-2 years',
+        Salary='$60,000', availability='Full-time',
+    )
+
+
+def make_job(bd, **fields):
+    fields = {
+        'job_title': 'Back-end Developer', 'company': 'Acme', 'platform': 'LinkedIn', 'skills': ['Python'],
+        'job_url': 'https://jobs.example.com/1', **fields,
+    }
+    return JobApplication.objects.create(bd_id=bd, **fields)
+
+
+def make_interview(job, developer):
+    return InterviewSchedule.objects.create(
+        bd_id=job.bd_id, dev_id=developer, job_id=job, company_name=job.company, role=job.job_title,
+        interview_date=date(2026, 1, 5), interview_time=time(10),
+    )
+
+
+def counter_rows():
+    return sorted(JobStatusCounter.objects.values_list('bd_id', 'status', 'current', 'entered', 'exited'))
+
+
+class WorkflowTests(TestCase):
+    """Status transitions, their log and the status counters (authapp.workflow)."""
+
+    def test_transitions_are_logged_and_counted(self):
+        bd = make_bd()
+        job = make_job(bd)
+        workflow.transition(job.job_id, 'Under Review')
+        workflow.transition(job.job_id, 'Interview Scheduled')
+
+        log = list(JobStatusTransition.objects.filter(job_id=job.job_id).values_list('from_status', 'to_status'))
+        self.assertEqual(log, [(None, 'Applied'), ('Applied', 'Under Review'), ('Under Review', 'Interview Scheduled')])
+        totals = workflow.status_totals(bd.pk)
+        self.assertEqual(totals['Applied'], {'current': 0, 'entered': 1, 'exited': 1, 'seconds_in_stage': 0})
+        self.assertEqual(totals['Interview Scheduled']['current'], 1)
+
+    def test_invalid_transition_changes_nothing(self):
+        job = make_job(make_bd(), application_status='Rejected')
+        before = counter_rows()
+        with self.assertRaises(workflow.InvalidTransition):
+            workflow.transition(job.job_id, 'Applied')
+        job.refresh_from_db()
+        self.assertEqual(job.application_status, 'Rejected')
+        self.assertEqual(counter_rows(), before)
+
+    def test_counters_match_a_rebuild(self):
+        first, second = make_bd(1), make_bd(2)
+        job = make_job(first)
+        workflow.transition(job.job_id, 'Under Review')
+        moved = make_job(first, job_url='https://jobs.example.com/2')
+        moved.bd_id = second
+        moved.save()
+        make_job(second, job_url='https://jobs.example.com/3').delete()
+
+        kept = counter_rows()
+        workflow.rebuild_counters()
+        self.assertEqual(counter_rows(), kept)
+
+
+@override_settings(TASK_QUEUE_ENABLED=True, TASK_LEASE_SECONDS=60)
+class TaskQueueTests(TestCase):
+    """Claiming, retrying and leases of background tasks (authapp.tasks)."""
+
+    def setUp(self):
+        self.calls = []
+        self.failures = 0
+
+        def record(**payload):
+            self.calls.append(payload)
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError('flaky')
+
+        tasks.task('tests.record', max_attempts=2, retry_delay=30)(record)
+        self.addCleanup(tasks.REGISTRY.pop, 'tests.record')
+
+    def test_a_task_is_claimed_once(self):
+        queued = tasks.enqueue('tests.record', {'n': 1})
+        self.assertEqual([row.task_id for row in tasks.claim('worker-1')], [queued.task_id])
+        self.assertEqual(tasks.claim('worker-2'), [])
+
+    def test_idempotency_key_returns_the_existing_task(self):
+        first = tasks.enqueue('tests.record', idempotency_key='once')
+        self.assertEqual(tasks.enqueue('tests.record', idempotency_key='once').task_id, first.task_id)
+        self.assertEqual(BackgroundTask.objects.count(), 1)
+
+    def test_failed_task_is_retried_with_backoff_then_failed(self):
+        self.failures = 2
+        queued = tasks.enqueue('tests.record', {'n': 1})
+        [row] = tasks.claim('worker-1')
+        self.assertFalse(tasks.execute(row, 'worker-1'))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('queued', 1))
+        self.assertGreater(queued.run_at, timezone.now())
+        self.assertEqual(tasks.claim('worker-1'), [])  # not due yet
+
+        BackgroundTask.objects.filter(pk=queued.pk).update(run_at=timezone.now())
+        [row] = tasks.claim('worker-1')
+        self.assertFalse(tasks.execute(row, 'worker-1'))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('failed', 2))
+        self.assertIn('flaky', queued.last_error)
+
+    def test_expired_lease_is_queued_again(self):
+        queued = tasks.enqueue('tests.record', {'n': 1})
+        tasks.claim('dead-worker')
+        self.assertEqual(tasks.requeue_expired(), 0)
+        BackgroundTask.objects.filter(pk=queued.pk).update(locked_at=timezone.now() - timedelta(seconds=61))
+        self.assertEqual(tasks.requeue_expired(), 1)
+        [row] = tasks.claim('worker-2')
+        self.assertTrue(tasks.execute(row, 'worker-2'))
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), ('done', 2))
+        self.assertEqual(self.calls, [{'n': 1}])
+
+
+class FastSerializerTests(TestCase):
+    """The compiled list serializers give DRF's output byte for byte (authapp.fast_serializers)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        bd, other = make_bd(1), make_bd(2)
+        developer = make_developer(1)
+        Developer_data.objects.filter(pk=make_developer(2).pk).update(technicalSkills='Python', experience='10+ years')
+        job = make_job(bd, salary_range='$85,000 - $95,000 per year', skills=['Python', 'Vue3'], personal_notes=None)
+        make_job(other, job_url='https://jobs.example.com/2', application_status='Under Review', skills=[])
+        make_interview(job, developer)
+        # Display columns left blank fall back to the related rows
+        InterviewSchedule.objects.update(bd_display_name='', dev_display_name='')
+
+    def assertSameOutput(self, queryset, serializer_class, fields=None):
+        with self.settings(FAST_LIST_SERIALIZERS=False):
+            expected = json.dumps(serialize_list(queryset, serializer_class, fields), cls=JSONEncoder)
+        with self.settings(FAST_LIST_SERIALIZERS=True):
+            compiled = json.dumps(serialize_list(queryset, serializer_class, fields), cls=JSONEncoder)
+        self.assertEqual(compiled, expected)
+
+    def test_compiled_output_matches_drf(self):
+        cases = [
+            (JobApplication.objects.order_by('job_id'), JobApplicationListSerializer),
+            (Developer_data.objects.order_by('office_id'), DeveloperDataSerializer),
+            (BD.objects.order_by('BD_id'), BDSerializer),
+            (InterviewSchedule.objects.order_by('interview_id'), InterviewScheduleSerializer),
+        ]
+        for display_fields in (False, True):
+            for queryset, serializer_class in cases:
+                with self.subTest(serializer_class.__name__, display_fields=display_fields):
+                    with self.settings(DENORMALIZED_DISPLAY_FIELDS=display_fields):
+                        self.assertSameOutput(queryset, serializer_class)
+
+    def test_compiled_output_matches_drf_for_a_fieldset(self):
+        self.assertSameOutput(JobApplication.objects.order_by('job_id'), JobApplicationListSerializer, 'job_id,company,bd_info')
+        self.assertSameOutput(Developer_data.objects.order_by('office_id'), DeveloperDataSerializer, 'office_id,technicalSkills')
+
+
+class JSONRendererTests(SimpleTestCase):
+    """The orjson renderer and parser give exactly DRF's bytes and values (backend.renderers)."""
+
+    payload = {
+        'job_title': 'Senior Vue3 Engineer - state-of-the-art e-commerce',
+        'email': 'jane-doe@example.com',
+        'created_at': datetime(2026, 1, 5, 9, 30, tzinfo=dt_timezone.utc),
+        'applied_date': date(2026, 1, 5),
+        'hourly_rate': Decimal('40.50'),
+        'skills': ['Python', 'e2e testing'],
+        'scores': [0.25, 1.5, -0.0, 123456.789],
+        'ids': (1, 2 ** 63 - 1, -2 ** 63),
+        'nested': {'notes': None, 'active': True, 'separator': '\u2028'},
+    }
+
+    def assertSameBytes(self, data):
+        self.assertEqual(ORJSONRenderer().render(data), JSONRenderer().render(data))
+
+    def test_render_matches_drf(self):
+        self.assertSameBytes(self.payload)
+        self.assertSameBytes([self.payload] * 3)
+
+    def test_render_matches_drf_for_floats_python_writes_differently(self):
+        for value in (1e-5, 2.5e-7, 1e16, 1.5e300):
+            with self.subTest(value=value):
+                self.assertSameBytes({'rows': [{'value': value}]})
+        # STRICT_JSON: DRF refuses NaN and infinity, and so must the orjson path
+        for value in (float('nan'), float('inf')):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                ORJSONRenderer().render({'rows': [{'value': value}]})
+
+    def test_render_matches_drf_for_integers_beyond_64_bits(self):
+        self.assertSameBytes({'big': 2 ** 64, 'small': -2 ** 63 - 1})
+
+    def parse(self, parser, body):
+        return parser.parse(io.BytesIO(body), 'application/json', {})
+
+    def test_parse_matches_drf(self):
+        bodies = [
+            json.dumps(self.payload, cls=JSONEncoder).encode(),
+            b'{"x": -9223372036854775809}',
+            b'{"x": 18446744073709551616, "y": 9223372036854775807}',
+            b'[0.1, 1e-05, 12345678901234567890.5]',
+            '{"name": "Zo\u00eb"}'.encode(),
+        ]
+        for body in bodies:
+            with self.subTest(body=body):
+                parsed = self.parse(ORJSONParser(), body)
+                expected = self.parse(JSONParser(), body)
+                self.assertEqual(parsed, expected)
+                self.assertEqual(json.dumps(parsed), json.dumps(expected))  # int vs float
+
+
+class SalaryParserTests(SimpleTestCase):
+    """Free-text salaries (authapp.compensation.parse_salary)."""
+
+    def assertParses(self, text, low, high, currency, period):
+        expected = compensation.Salary(
+            Decimal(low), None if high is None else Decimal(high), currency, period,
+        )
+        self.assertEqual(compensation.parse_salary(text), expected)
+
+    @override_settings(SALARY_DEFAULT_CURRENCY='', SALARY_DEFAULT_PERIOD='year')
+    def test_thousands_separators_with_decimals(self):
+        self.assertParses('$120,000.00', '120000', '120000', 'USD', 'year')
+        self.assertParses('$85,000.00 - $95,000.00 per year', '85000', '95000', 'USD', 'year')
+        self.assertParses('PKR 150,000.00/month', '150000', '150000', 'PKR', 'month')
+        self.assertParses('€1.234.567,8', '1234567.80', '1234567.80', 'EUR', 'year')
+
+    @override_settings(SALARY_DEFAULT_CURRENCY='', SALARY_DEFAULT_PERIOD='year')
+    def test_other_formats(self):
+        self.assertParses('80k-100k', '80000', '100000', '', 'year')
+        self.assertParses('80,000', '80000', '80000', '', 'year')
+        self.assertParses('1,5 lakh', '150000', '150000', '', 'year')
+        self.assertParses('$50/hr', '50', '50', 'USD', 'hour')
+        self.assertParses('80k+', '80000', None, '', 'year')
+
+    @override_settings(SALARY_DEFAULT_CURRENCY='', SALARY_DEFAULT_PERIOD='year')
+    def test_lakh_formats(self):
+        self.assertParses('2,50,000', '250000', '250000', '', 'year')
+        self.assertParses('PKR 12,50,000 per month', '1250000', '1250000', 'PKR', 'month')
+        self.assertParses('₹1,00,00,000.50', '10000000.50', '10000000.50', 'INR', 'year')
+        self.assertParses('5 LPA', '500000', '500000', '', 'year')
+        self.assertParses('5-7 lpa', '500000', '700000', '', 'year')
+        self.assertParses('6 lakh per annum', '600000', '600000', '', 'year')
+
+    def test_malformed_numbers(self):
+        self.assertEqual(compensation.parse_salary('1,2,3'), compensation.UNPARSED)
+        self.assertEqual(compensation.parse_salary('2,50,00'), compensation.UNPARSED)
+        self.assertEqual(compensation.parse_salary('1.000,000.00'), compensation.UNPARSED)
+        self.assertEqual(compensation.parse_salary('Negotiable'), compensation.UNPARSED)
+
+
+class ExperienceTests(TestCase):
+    """Experience labels as year ranges and the search filters on them (authapp.experience)."""
+
+    def test_labels(self):
+        cases = {
+            '0-1 years': (0, 1), '3-5 years': (3, 5), '5+ years': (5, None), '10+ years': (10, None),
+            ' 2 yrs ': (2, 2), '5 - 3 Years': (5, 5), 'Fresher': (None, None), '': (None, None), None: (None, None),
+        }
+        for label, expected in cases.items():
+            with self.subTest(label=label):
+                self.assertEqual(experience.experience_years(label), expected)
+
+    def test_range_params(self):
+        self.assertEqual(experience.experience_range_params({'min_experience': '3', 'max_experience': ''}), (3, None))
+        self.assertEqual(experience.experience_range_params({}), (None, None))
+        for value in ('-1', '2.5', 'three', '٣'):
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                experience.experience_range_params({'max_experience': value})
+
+    @override_settings(ROSTER_SNAPSHOT=False)
+    def test_search_filters_on_the_stored_bounds(self):
+        for n, label in enumerate(['0-1 years', '3-5 years', '5+ years'], 1):
+            developer = make_developer(n)
+            developer.experience = label
+            developer.save()
+        self.assertEqual(
+            list(Developer_data.objects.order_by('office_id').values_list('experience_min_years', 'experience_max_years')),
+            [(0, 1), (3, 5), (5, None)],
+        )
+
+        def found(query):
+            response = self.client.get(f'/api/developers/search/?{query}')
+            self.assertEqual(response.status_code, 200, response.content)
+            return sorted(row['office_id'] for row in response.json()['developers'])
+
+        self.assertEqual(found('min_experience=3'), ['T-DEV-2', 'T-DEV-3'])
+        self.assertEqual(found('max_experience=5'), ['T-DEV-1', 'T-DEV-2'])
+        self.assertEqual(found('min_experience=1&max_experience=5'), ['T-DEV-2'])
+        self.assertEqual(self.client.get('/api/developers/search/?min_experience=x').status_code, 400)
+
+
+@skipUnless(optional_import('numpy'), 'NumPy is not installed')
+@override_settings(ROSTER_SNAPSHOT_CHECK_SECONDS=0)
+class RosterSnapshotTests(TestCase):
+    """The in-process roster answers list and search queries as the database does (authapp.roster)."""
+
+    queries = {
+        '/api/developers/': ['', 'fields=office_id,firstName'],
+        '/api/developers/search/': [
+            '', 'name=doe 2', 'name=JANE', 'location=lahore', 'skills=python', 'skills=go',
+            'experience=3-5 years', 'availability=Part-time', 'min_experience=3', 'max_experience=2',
+            'skills=python&min_experience=1&location=re', 'fields=office_id,firstName', 'name=nobody',
+        ],
+    }
+
+    def setUp(self):
+        # Snapshots built by other tests describe rows since rolled back
+        roster._state.snapshot = None
+        self.addCleanup(setattr, roster._state, 'snapshot', None)
+        variants = [
+            ('Lahore', ['Python', 'Django'], '3-5 years', 'Full-time'),
+            ('Remote', ['Go'], '5+ years', 'Part-time'),
+            ('Lahore, PK', ['Python'], '0-1 years', 'Contract'),
+            ('Karachi', [], '1-2 years', 'Part-time'),
+        ]
+        for n, (location, skills, label, availability) in enumerate(variants, 1):
+            developer = make_developer(n)
+            developer.location, developer.technicalSkills = location, skills
+            developer.experience, developer.availability = label, availability
+            developer.save()
+
+    def assertSameAsDatabase(self):
+        for path, queries in self.queries.items():
+            for query in queries:
+                with self.subTest(path=path, query=query):
+                    with override_settings(ROSTER_SNAPSHOT=False):
+                        database = self.client.get(f'{path}?{query}').json()
+                    with override_settings(ROSTER_SNAPSHOT=True):
+                        snapshot = self.client.get(f'{path}?{query}').json()
+                    self.assertIsNotNone(roster._state.snapshot)
+                    self.assertEqual(snapshot, database)
+
+    def test_matches_the_database(self):
+        self.assertSameAsDatabase()
+
+    def test_matches_after_edits_and_deletes(self):
+        self.assertSameAsDatabase()
+        developer = Developer_data.objects.get(office_id='T-DEV-1')
+        developer.location, developer.experience = 'Islamabad', '10+ years'
+        developer.save()
+        Developer_data.objects.filter(office_id='T-DEV-2').delete()
+        make_developer(5)
+        self.assertSameAsDatabase()
+
+
+class DedupTests(TestCase):
+    """Collapsing duplicate job leads (authapp.dedup)."""
+
+    def test_collapse_keeps_interviews_and_status_log(self):
+        bd, developer = make_bd(), make_developer()
+        first = make_job(bd, skills=['Python'])
+        # Same posting: tracking parameters and case do not change the fingerprint
+        second = make_job(bd, company='ACME', job_url='https://www.jobs.example.com/1/?utm_source=x', skills=['Django'])
+        second.application_status = 'Under Review'
+        second.save()
+        interview = make_interview(second, developer)
+
+        survivor_id, removed = dedup.collapse_group(bd.pk, first.dedup_fingerprint)
+
+        # The copy furthest along the pipeline survives
+        self.assertEqual((survivor_id, removed), (second.job_id, [first.job_id]))
+        self.assertFalse(JobApplication.objects.filter(pk=first.job_id).exists())
+        survivor = JobApplication.objects.get(pk=survivor_id)
+        self.assertEqual(survivor.skills, ['Django', 'Python'])
+        interview.refresh_from_db()
+        self.assertEqual(interview.job_id_id, survivor_id)
+        # The log is not rewritten: the survivor keeps one chain of its own
+        self.assertEqual(
+            list(survivor.status_transitions.values_list('from_status', 'to_status')),
+            [(None, 'Applied'), ('Applied', 'Under Review')],
+        )
+        self.assertEqual(JobStatusTransition.objects.count(), 3)
+
+
+@override_settings(TASK_QUEUE_ENABLED=True)
+class ClusteringTests(TestCase):
+    """Cluster ids of new and edited jobs (authapp.clustering)."""
+
+    description = (
+        'Build state-of-the-art e-commerce services in Python and Django with a small '
+        'cross-functional team, owning features from design to production.'
+    )
+
+    def clustering_runs(self):
+        return BackgroundTask.objects.filter(name='cluster_job_descriptions')
+
+    def test_new_and_edited_descriptions_queue_one_run(self):
+        bd = make_bd()
+        job = make_job(bd, job_description=self.description)
+        make_job(bd, job_url='https://jobs.example.com/2', job_description=self.description + ' Remote.')
+        self.assertEqual(self.clustering_runs().count(), 1)
+        self.assertGreater(self.clustering_runs().get().run_at, timezone.now())
+
+        JobApplication.objects.filter(pk=job.pk).update(cluster_id=job.pk)
+        job = JobApplication.objects.get(pk=job.pk)
+        job.location = 'Remote'
+        job.save()
+        self.assertEqual(JobApplication.objects.get(pk=job.pk).cluster_id, job.pk)
+
+        job.job_description = 'A different role entirely.'
+        job.save(update_fields=['job_description', 'updated_at'])
+        self.assertIsNone(job.cluster_id)
+        self.assertIsNone(JobApplication.objects.get(pk=job.pk).cluster_id)
+
+    @skipUnless(clustering.available(), 'NumPy is not installed')
+    def test_queued_run_assigns_clusters(self):
+        bd = make_bd()
+        first = make_job(bd, job_description=self.description)
+        second = make_job(bd, job_url='https://jobs.example.com/2', job_description=self.description.upper())
+        other = make_job(bd, job_url='https://jobs.example.com/3', job_description='Data engineer for a logistics start-up, Spark and Airflow, on-call rotation shared.')
+        BackgroundTask.objects.update(run_at=timezone.now())
+        [run] = tasks.claim('worker-1')
+        self.assertTrue(tasks.execute(run, 'worker-1'))
+        clusters = dict(JobApplication.objects.values_list('job_id', 'cluster_id'))
+        self.assertEqual(clusters, {first.pk: first.pk, second.pk: first.pk, other.pk: None})
+
+
+class ReportRunTests(TestCase):
+    """Starting weekly BD report runs from the API (authapp.reports)."""
+
+    url = '/api/reports/bd-weekly/'
+
+    @override_settings(TASK_QUEUE_ENABLED=True)
+    def test_post_queues_the_run_and_returns(self):
+        make_job(make_bd())
+        response = self.client.post(self.url, {'week_start': '2026-10-12'}, content_type='application/json')
+        self.assertEqual(response.status_code, 202, response.content)
+        self.assertEqual(response.json()['run']['status'], 'queued')
+        self.assertEqual(BDReportRun.objects.get().status, 'queued')
+        self.assertFalse(BDWeeklyReport.objects.exists())
+        self.assertEqual(BackgroundTask.objects.get().name, 'generate_bd_weekly_reports')
+
+    def test_post_is_refused_without_the_task_queue(self):
+        make_bd()
+        response = self.client.post(self.url, {}, content_type='application/json')
+        self.assertEqual(response.status_code, 503)
+        self.assertFalse(BDReportRun.objects.exists())
+
+
+class LocalThrottleTests(SimpleTestCase):
+    """In-process token buckets (backend.throttling.LocalBackend)."""
+
+    def take(self, backend, key, at, rate=1, capacity=2):
+        with mock.patch('backend.throttling.time.monotonic', return_value=at):
+            return backend.take(key, rate, capacity)
+
+    def test_bucket_refills_at_the_rate(self):
+        backend = throttling.LocalBackend()
+        self.assertEqual(self.take(backend, 'a', 0), (True, 0.0))
+        self.assertEqual(self.take(backend, 'a', 0), (True, 0.0))
+        self.assertEqual(self.take(backend, 'a', 0.25), (False, 0.75))
+        self.assertEqual(self.take(backend, 'a', 1), (True, 0.0))
+
+    def test_idle_buckets_are_dropped_on_insertion(self):
+        backend = throttling.LocalBackend(max_buckets=2)
+        self.take(backend, 'a', 0)
+        self.take(backend, 'b', 0, rate=0.1)
+        # 'a' is full again at 1, 'b' only at 10; allowed requests prune too
+        self.assertEqual(self.take(backend, 'c', 5), (True, 0.0))
+        self.assertEqual(set(backend._buckets), {'b', 'c'})
+        for n in range(100):
+            self.take(backend, f'caller-{n}', 100 + n * 10)
+        self.assertLessEqual(len(backend._buckets), 4)
+
+
+class IdempotencyTests(TestCase):
+    """Idempotency-Key replays on POST (authapp.idempotency)."""
+
+    def post_job(self, key, bd_id='T-BD-1'):
+        return self.client.post(
+            '/api/job-applications/',
+            {'bd_id': bd_id, 'job_title': 'Back-end Developer', 'company': 'Acme', 'platform': 'LinkedIn', 'skills': ['Python']},
+            content_type='application/json', HTTP_IDEMPOTENCY_KEY=key,
+        )
+
+    def test_retry_replays_the_first_response(self):
+        make_bd()
+        first = self.post_job('key-1')
+        retry = self.post_job('key-1')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual((retry.status_code, retry.content), (first.status_code, first.content))
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(JobApplication.objects.count(), 1)
+
+    def test_key_reused_for_another_body_is_refused(self):
+        make_bd()
+        self.post_job('key-1')
+        self.assertEqual(self.post_job('key-1', bd_id='T-BD-2').status_code, 422)
+
+    def test_retry_during_the_first_attempt_is_told_to_wait(self):
+        make_bd()
+        self.post_job('key-1')
+        # As if the first attempt were still running
+        IdempotencyRecord.objects.update(status='processing')
+        retry = self.post_job('key-1')
+        self.assertEqual(retry.status_code, 409)
+        self.assertEqual(retry['Retry-After'], '1')
+        self.assertEqual(retry.json()['error'], 'Request in progress')
+        self.assertEqual(JobApplication.objects.count(), 1)
+        self.assertEqual(IdempotencyRecord.objects.get().status, 'processing')
+
+    def test_client_errors_are_not_replayed(self):
+        # The BD does not exist yet; once it does, the retry must reach the view
+        self.assertEqual(self.post_job('key-1').status_code, 400)
+        self.assertFalse(IdempotencyRecord.objects.exists())
+        make_bd()
+        self.assertEqual(self.post_job('key-1').status_code, 201)
+
+
+class ArchiveTests(TestCase):
+    """Moving closed jobs to the archive tables and back (authapp.archive)."""
+
+    def test_archive_and_restore_round_trip(self):
+        bd, developer = make_bd(), make_developer()
+        closed = make_job(bd, application_status='Rejected')
+        make_interview(closed, developer)
+        recent = make_job(bd, job_url='https://jobs.example.com/2', application_status='Rejected')
+        live = make_job(bd, job_url='https://jobs.example.com/3')
+        JobApplication.objects.filter(pk=closed.pk).update(status_changed_at=timezone.now() - timedelta(days=200))
+        before = JobApplication.objects.values().get(pk=closed.pk)
+        counters_before = counter_rows()
+
+        result = archive.archive_jobs(days=180)
+        self.assertEqual((result.jobs, result.interviews), (1, 1))
+        self.assertEqual(set(JobApplication.objects.values_list('pk', flat=True)), {recent.pk, live.pk})
+        self.assertFalse(InterviewSchedule.objects.exists())
+        self.assertEqual(ArchivedInterviewSchedule.objects.get().job_id_id, closed.pk)
+        self.assertEqual(archive.jobs(include=True).count(), 3)
+        self.assertEqual(archive.interviews(include=True).count(), 1)
+        self.assertEqual(workflow.status_totals(bd.pk)['Rejected']['current'], 1)
+        archived_counters = counter_rows()
+        workflow.rebuild_counters()
+        self.assertEqual(counter_rows(), archived_counters)
+
+        result = archive.restore_jobs(job_ids=[closed.pk])
+        self.assertEqual((result.jobs, result.interviews), (1, 1))
+        self.assertFalse(ArchivedJobApplication.objects.exists())
+        self.assertEqual(JobApplication.objects.values().get(pk=closed.pk), before)
+        self.assertEqual(InterviewSchedule.objects.get().job_id_id, closed.pk)
+        self.assertEqual(counter_rows(), counters_before)
+
+    def test_missing_view_is_reported_once_migrated(self):
+        self.assertEqual(checks.check_archive_views(None, databases=['default']), [])
+        view = JobApplicationWithArchive._meta.db_table
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP VIEW {connection.ops.quote_name(view)}')
+        [warning] = checks.check_archive_views(None, databases=['default'])
+        self.assertEqual((warning.id, warning.msg), ('authapp.W004', f"Database 'default': view {view} is missing."))
+        # Before migrate has created the views there is nothing to report
+        MigrationRecorder.Migration.objects.filter(app='authapp', name='0020_job_archive').delete()
+        self.assertEqual(checks.check_archive_views(None, databases=['default']), [])
+
+
+REPLICA = 'replica'
+
+
+@override_settings(DATABASE_REPLICAS=[REPLICA], REPLICA_STICKY_SECONDS=15)
+class ReplicaRoutingTests(TransactionTestCase):
+    """Reads on a replica alias, writes and the reads after them on the primary (backend.routers)."""
+
+    # Resolved in setUpClass, once the replica alias exists
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        # A second alias on the test database stands in for the replica
+        connections.settings[REPLICA] = {**connections.settings['default'], 'TEST': {'MIRROR': 'default'}}
+        cls.addClassCleanup(connections.settings.pop, REPLICA)
+        cls.addClassCleanup(connections.close_all)
+        super().setUpClass()
+
+    def setUp(self):
+        cache.clear()
+
+    def queries(self, method, path, **kwargs):
+        """Number of queries ``method path`` ran on the primary and on the replica."""
+        with CaptureQueriesContext(connections['default']) as primary, CaptureQueriesContext(connections[REPLICA]) as replica:
+            response = getattr(self.client, method)(path, content_type='application/json', **kwargs)
+        self.assertLess(response.status_code, 400, response.content)
+        return len(primary), len(replica)
+
+    def create_client(self):
+        return self.queries('post', '/api/clients/', data={
+            'client_name': 'Jane Doe', 'company_name': 'Acme', 'email': 'jane-doe@example.com',
+            'hourly_rate': '40.00', 'project_deadline': '2026-12-01', 'project_name': 'Portal',
+        })
+
+    def test_routed_read_goes_to_the_replica(self):
+        primary, replica = self.queries('get', '/api/clients/')
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_reads_after_a_write_stay_on_the_primary(self):
+        primary, replica = self.create_client()
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+        self.assertEqual(self.queries('get', '/api/clients/')[1], 0)
+        # Without the cookie (cross-origin fetch) the cache still pins the caller
+        self.client.cookies.clear()
+        self.assertEqual(self.queries('get', '/api/clients/')[1], 0)
+        cache.clear()
+        self.assertGreater(self.queries('get', '/api/clients/')[1], 0)
+
+    def test_a_write_pins_the_rest_of_the_request(self):
+        state, token = routers.begin_request()
+        self.addCleanup(routers.end_request, token)
+        router = routers.ReplicaRouter()
+        state.use_replica([REPLICA])
+        self.assertEqual(router.db_for_read(Client), REPLICA)
+        router.db_for_write(Client)
+        self.assertEqual(router.db_for_read(Client), routers.PRIMARY)
+        state.use_replica([REPLICA])
+        self.assertEqual(router.db_for_read(Client), routers.PRIMARY)
+
+    def test_replicas_need_a_shared_cache(self):
+        with self.settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            self.assertEqual([message.id for message in checks.check_replica_cache(None)], ['authapp.E001'])
+        with self.settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.db.DatabaseCache', 'LOCATION': 'cache'}}):
+            self.assertEqual(checks.check_replica_cache(None), [])
+
+
+class QueryPlanTests(TestCase):
+    """
+    Index regressions on the read endpoints (see authapp.queryplans).
+
+    Sequential scans are checked on every database. Plan fingerprints are
+    compared only where the snapshot has plans for the database, which is
+    SQLite for now: on PostgreSQL only the sequential scan check applies.
+    """
+
+    @override_settings(QUERY_PLAN_SEQ_SCAN_ROWS=50)
+    def test_endpoint_query_plans(self):
+        queryplans.seed(200)
+        results = queryplans.capture()
+        # None for databases without recorded plans: problems() then skips the fingerprints
+        accepted = queryplans.load_snapshot().get(connection.vendor)
+        problems = queryplans.problems(results, accepted)
+        self.assertEqual(problems, [], 'Review the plans and run manage.py check_query_plans --update if intended.')
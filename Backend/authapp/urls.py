@@ -8,6 +8,8 @@ from .views import (
     LoginView, 
     ClientListCreateView, 
     ClientDetailView,
+    ClientPortfolioView,
+    ClientDeadlineFeedView,
     DeveloperDataListCreateView,
     DeveloperDataDetailView,
     DeveloperDataSearchView,
@@ -25,6 +27,13 @@ from .views import (
     JobApplicationSearchView,
     JobApplicationByBDView,
     JobApplicationStatsView,
+    JobApplicationStatusView,
+    JobApplicationFunnelView,
+    JobApplicationTimeInStageView,
+    JobApplicationTimeSeriesView,
+    CompensationStatsView,
+    BDReportRunListCreateView,
+    BDReportRunDetailView,
 )
 
 urlpatterns = [
@@ -34,19 +43,21 @@ urlpatterns = [
     
     # Client management endpoints
     path('clients/', ClientListCreateView.as_view(), name='client-list-create'),
+    path('clients/analytics/', ClientPortfolioView.as_view(), name='client-portfolio'),
+    path('clients/deadlines/', ClientDeadlineFeedView.as_view(), name='client-deadlines'),
     path('clients/<int:client_id>/', ClientDetailView.as_view(), name='client-detail'),
     
     # Developer data management endpoints
     path('developers/', DeveloperDataListCreateView.as_view(), name='developer-list-create'),
-    path('developers/<str:office_id>/', DeveloperDataDetailView.as_view(), name='developer-detail'),
     path('developers/search/', DeveloperDataSearchView.as_view(), name='developer-search'),
+    path('developers/<str:office_id>/', DeveloperDataDetailView.as_view(), name='developer-detail'),
      path('developers/email/<str:email>/', views.get_developer_by_email, name='developer-by-email'),
 
 
     # BD URLs
     path('bds/', BDListCreateView.as_view(), name='bd-list-create'),
-    path('bds/<str:bd_id>/', BDDetailView.as_view(), name='bd-detail'),
     path('bds/search/', BDSearchView.as_view(), name='bd-search'),
+    path('bds/<str:bd_id>/', BDDetailView.as_view(), name='bd-detail'),
     path('bds/group/location/', BDByLocationView.as_view(), name='bd-by-location'),
     path('bds/group/experience/', BDByExperienceView.as_view(), name='bd-by-experience'),
 
@@ -56,6 +67,17 @@ urlpatterns = [
     path('job-applications/search/', JobApplicationSearchView.as_view(), name='job-application-search'),
     path('job-applications/by-bd/', JobApplicationByBDView.as_view(), name='job-applications-by-bd'),
     path('job-applications/stats/', JobApplicationStatsView.as_view(), name='job-application-stats'),
+    path('job-applications/<int:job_id>/status/', JobApplicationStatusView.as_view(), name='job-application-status'),
+    path('job-applications/funnel/', JobApplicationFunnelView.as_view(), name='job-application-funnel'),
+    path('job-applications/time-in-stage/', JobApplicationTimeInStageView.as_view(), name='job-application-time-in-stage'),
+
+    # Analytics
+    path('analytics/job-applications/', JobApplicationTimeSeriesView.as_view(), name='job-application-timeseries'),
+    path('analytics/compensation/', CompensationStatsView.as_view(), name='compensation-stats'),
+
+    # Weekly BD reports
+    path('reports/bd-weekly/', BDReportRunListCreateView.as_view(), name='bd-report-run-list-create'),
+    path('reports/bd-weekly/<int:run_id>/', BDReportRunDetailView.as_view(), name='bd-report-run-detail'),
 
 
 
@@ -4,23 +4,40 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.hashers import make_password, check_password
-from .models import Admin, Developer, Client, Developer_data, BD,JobApplication,InterviewSchedule
+from .models import Admin, Developer, Client, Developer_data, BD,JobApplication,InterviewSchedule, JobStatusTransition, BDReportRun
 from django.shortcuts import get_object_or_404
 import logging
-from .serializers import RegisterSerializer, LoginSerializer, ClientSerializer, DeveloperDataSerializer, BDSerializer,JobApplicationSerializer, JobApplicationListSerializer,InterviewScheduleSerializer
+from .serializers import RegisterSerializer, LoginSerializer, ClientSerializer, DeveloperDataSerializer, BDSerializer,JobApplicationSerializer, JobApplicationListSerializer,InterviewScheduleSerializer, use_display_fields
 from rest_framework.decorators import api_view
+from backend.log import redacted
+from .fast_serializers import serialize_list
+from .fieldsets import prune_representation, resolve_fieldset
+from . import analytics, archive, clustering, compensation, dedup, portfolio, reports, roster, tasks, workflow
+from .experience import experience_range_params, filter_experience_range
 
 
 
 from django.utils import timezone
+from datetime import date, timedelta
 
 from django.db import transaction
+from django.db.models import Count
 
 
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+
+def with_display_relations(queryset, *relations):
+    """
+    Join the BD/developer rows embedded in list payloads, unless the
+    denormalized display columns are in use and the table is read on its own.
+    """
+    if use_display_fields():
+        return queryset
+    return queryset.select_related(*relations)
+
 class RegisterView(APIView):
     def post(self, request):
         serializer = RegisterSerializer(data=request.data)
@@ -44,8 +61,8 @@ class ClientListCreateView(APIView):
     def get(self, request):
         try:
             clients = Client.objects.all().order_by('-client_id')
-            serializer = ClientSerializer(clients, many=True)
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            data = serialize_list(clients, ClientSerializer, fields=request.query_params.get('fields'))
+            return Response(data, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({
                 'error': 'Failed to retrieve clients',
@@ -72,6 +89,86 @@ class ClientListCreateView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class ClientPortfolioView(APIView):
+    """
+    Projected revenue, deadline buckets (overdue / this week / this month /
+    later) and per-company totals for the Client dashboard (authapp.portfolio).
+    """
+    def get(self, request):
+        try:
+            data = portfolio.portfolio()
+        except Exception as e:
+            logger.exception("Error computing client portfolio")
+            return Response({
+                'success': False,
+                'error': 'Failed to compute client portfolio',
+                'message': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response(dict(data, success=True), status=status.HTTP_200_OK)
+
+
+class ClientDeadlineFeedView(APIView):
+    """
+    Clients by deadline, soonest first, with keyset pagination.
+
+    Query params: due_within (days from today), overdue (true to include or,
+    alone, to select past deadlines), limit (default 50, at most 500),
+    cursor (next_cursor of the previous page) and fields. The first page
+    also carries the overdue / due-within-N-days summary.
+    """
+    def get(self, request):
+        params = request.query_params
+        errors = {}
+        due_within = params.get('due_within')
+        if due_within not in (None, ''):
+            if not (due_within.isascii() and due_within.isdigit()) or int(due_within) > 3650:
+                errors['due_within'] = 'Must be a whole number of days, at most 3650'
+            else:
+                due_within = int(due_within)
+        else:
+            due_within = None
+        limit = params.get('limit') or str(portfolio.FEED_PAGE_SIZE)
+        if not (limit.isascii() and limit.isdigit()) or not 1 <= int(limit) <= portfolio.FEED_MAX_PAGE_SIZE:
+            errors['limit'] = f'Must be between 1 and {portfolio.FEED_MAX_PAGE_SIZE}'
+        after = None
+        if params.get('cursor'):
+            try:
+                after = portfolio.decode_cursor(params['cursor'])
+            except ValueError as e:
+                errors['cursor'] = str(e)
+        if errors:
+            return Response({
+                'success': False,
+                'error': 'Invalid parameters',
+                'details': errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            today = timezone.localdate()
+            overdue = params.get('overdue', '').lower() in ('1', 'true', 'yes')
+            page, next_cursor = portfolio.deadline_feed(today, due_within, overdue, after, int(limit))
+            data = ClientSerializer(page, many=True).data
+            fieldset = resolve_fieldset(ClientSerializer, params.get('fields'))
+            if fieldset is not None:
+                data = [prune_representation(row, fieldset) for row in data]
+            body = {
+                'success': True,
+                'count': len(data),
+                'clients': data,
+                'next_cursor': next_cursor
+            }
+            if after is None:
+                body['summary'] = portfolio.deadline_summary(today)
+            return Response(body, status=status.HTTP_200_OK)
+        except Exception as e:
+            logger.exception("Error building client deadline feed")
+            return Response({
+                'success': False,
+                'error': 'Failed to retrieve client deadlines',
+                'message': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
 class ClientDetailView(APIView):
     def get_client(self, client_id):
         try:
@@ -126,12 +223,14 @@ class ClientDetailView(APIView):
 class DeveloperDataListCreateView(APIView):
     def get(self, request):
         try:
-            developers = Developer_data.objects.all().order_by('-created_at')
-            serializer = DeveloperDataSerializer(developers, many=True)
+            data = roster.search({'fields': request.query_params.get('fields')})
+            if data is None:
+                developers = Developer_data.objects.all().order_by(*roster.ORDERING)
+                data = serialize_list(developers, DeveloperDataSerializer, fields=request.query_params.get('fields'))
             return Response({
                 'success': True,
-                'count': len(serializer.data),
-                'developers': serializer.data
+                'count': len(data),
+                'developers': data
             }, status=status.HTTP_200_OK)
         except Exception as e:
             return Response({
@@ -246,7 +345,26 @@ class DeveloperDataDetailView(APIView):
 class DeveloperDataSearchView(APIView):
     def get(self, request):
         try:
-            queryset = Developer_data.objects.all()
+            min_years, max_years = experience_range_params(request.query_params)
+            salary_range = compensation.salary_range_params(request.query_params)
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': 'Invalid parameters',
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            # The snapshot does not carry salaries
+            data = None if salary_range else roster.search(request.query_params, min_years, max_years)
+            if data is not None:
+                return Response({
+                    'success': True,
+                    'count': len(data),
+                    'developers': data
+                }, status=status.HTTP_200_OK)
+
+            queryset = Developer_data.objects.all().order_by(*roster.ORDERING)
             
             # Search by name
             name = request.query_params.get('name', None)
@@ -276,12 +394,16 @@ class DeveloperDataSearchView(APIView):
             skills = request.query_params.get('skills', None)
             if skills:
                 queryset = queryset.filter(technicalSkills__icontains=skills)
+
+            # Filter by years of experience and salary
+            queryset = filter_experience_range(queryset, min_years, max_years)
+            queryset = compensation.filter_salary_range(queryset, salary_range)
             
-            serializer = DeveloperDataSerializer(queryset, many=True)
+            data = serialize_list(queryset, DeveloperDataSerializer, fields=request.query_params.get('fields'))
             return Response({
                 'success': True,
-                'count': len(serializer.data),
-                'developers': serializer.data
+                'count': len(data),
+                'developers': data
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
@@ -302,11 +424,11 @@ class BDListCreateView(APIView):
         """Get all BDs - Return simple array format to match frontend expectation"""
         try:
             bds = BD.objects.all().order_by('-created_at')
-            serializer = BDSerializer(bds, many=True)
+            data = serialize_list(bds, BDSerializer, fields=request.query_params.get('fields'))
             # Return simple array format that matches frontend expectation
-            return Response(serializer.data, status=status.HTTP_200_OK)
+            return Response(data, status=status.HTTP_200_OK)
         except Exception as e:
-            logger.error(f"Error retrieving BDs: {str(e)}")
+            logger.exception("Error retrieving BDs")
             return Response({
                 'error': 'Failed to retrieve BDs',
                 'message': str(e)
@@ -315,25 +437,25 @@ class BDListCreateView(APIView):
     def post(self, request):
         """Create new BD - Return simple format matching frontend expectation"""
         try:
-            logger.info(f"Creating BD with data: {request.data}")
+            logger.debug("Creating BD with data: %s", redacted(request.data))
             
             serializer = BDSerializer(data=request.data)
             if serializer.is_valid():
                 bd = serializer.save()
-                logger.info(f"BD created successfully: {bd.BD_id}")
+                logger.info("BD created successfully: %s", bd.BD_id)
                 
                 # Return simple format that matches frontend expectation
                 response_data = BDSerializer(bd).data
                 return Response(response_data, status=status.HTTP_201_CREATED)
             else:
-                logger.error(f"BD validation failed: {serializer.errors}")
+                logger.info("BD validation failed: %s", redacted(serializer.errors))
                 return Response({
                     'error': 'Validation failed',
                     'details': serializer.errors
                 }, status=status.HTTP_400_BAD_REQUEST)
                 
         except Exception as e:
-            logger.error(f"Error creating BD: {str(e)}")
+            logger.exception("Error creating BD")
             return Response({
                 'error': 'Failed to create BD',
                 'message': str(e)
@@ -372,25 +494,25 @@ class BDDetailView(APIView):
             }, status=status.HTTP_404_NOT_FOUND)
 
         try:
-            logger.info(f"Updating BD {bd_id} with data: {request.data}")
+            logger.debug("Updating BD %s with data: %s", bd_id, redacted(request.data))
             
             serializer = BDSerializer(bd, data=request.data, partial=True)
             if serializer.is_valid():
                 updated_bd = serializer.save()
-                logger.info(f"BD updated successfully: {bd_id}")
+                logger.info("BD updated successfully: %s", bd_id)
                 
                 # Return simple format
                 response_data = BDSerializer(updated_bd).data
                 return Response(response_data, status=status.HTTP_200_OK)
             else:
-                logger.error(f"BD update validation failed: {serializer.errors}")
+                logger.info("BD update validation failed: %s", redacted(serializer.errors))
                 return Response({
                     'error': 'Validation failed',
                     'details': serializer.errors
                 }, status=status.HTTP_400_BAD_REQUEST)
                 
         except Exception as e:
-            logger.error(f"Error updating BD: {str(e)}")
+            logger.exception("Error updating BD")
             return Response({
                 'error': 'Failed to update BD',
                 'message': str(e)
@@ -407,13 +529,13 @@ class BDDetailView(APIView):
         try:
             bd_name = bd.name
             bd.delete()
-            logger.info(f"BD deleted successfully: {bd_id}")
+            logger.info("BD deleted successfully: %s", bd_id)
             return Response({
                 'message': f'BD "{bd_name}" deleted successfully'
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"Error deleting BD: {str(e)}")
+            logger.exception("Error deleting BD")
             return Response({
                 'error': 'Failed to delete BD',
                 'message': str(e)
@@ -423,6 +545,16 @@ class BDDetailView(APIView):
 # -------- Additional BD Views --------
 class BDSearchView(APIView):
     def get(self, request):
+        try:
+            min_years, max_years = experience_range_params(request.query_params)
+            salary_range = compensation.salary_range_params(request.query_params)
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': 'Invalid parameters',
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
         try:
             queryset = BD.objects.all()
             
@@ -445,12 +577,16 @@ class BDSearchView(APIView):
             location = request.query_params.get('location', None)
             if location:
                 queryset = queryset.filter(location__icontains=location)
+
+            # Filter by years of experience and salary
+            queryset = filter_experience_range(queryset, min_years, max_years)
+            queryset = compensation.filter_salary_range(queryset, salary_range)
             
-            serializer = BDSerializer(queryset, many=True)
+            data = serialize_list(queryset, BDSerializer, fields=request.query_params.get('fields'))
             return Response({
                 'success': True,
-                'count': len(serializer.data),
-                'bds': serializer.data
+                'count': len(data),
+                'bds': data
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
@@ -469,10 +605,10 @@ class BDByLocationView(APIView):
             
             for location in locations:
                 bds_in_location = BD.objects.filter(location=location)
-                serializer = BDSerializer(bds_in_location, many=True)
+                data = serialize_list(bds_in_location, BDSerializer, fields=request.query_params.get('fields'))
                 location_data[location] = {
-                    'count': len(serializer.data),
-                    'bds': serializer.data
+                    'count': len(data),
+                    'bds': data
                 }
             
             return Response({
@@ -496,10 +632,10 @@ class BDByExperienceView(APIView):
             
             for experience in experience_levels:
                 bds_with_experience = BD.objects.filter(experience=experience)
-                serializer = BDSerializer(bds_with_experience, many=True)
+                data = serialize_list(bds_with_experience, BDSerializer, fields=request.query_params.get('fields'))
                 experience_data[experience] = {
-                    'count': len(serializer.data),
-                    'bds': serializer.data
+                    'count': len(data),
+                    'bds': data
                 }
             
             return Response({
@@ -535,34 +671,17 @@ class JobApplicationListCreateView(APIView):
         return response
     
     def get(self, request):
-        """Get all job applications with debugging"""
+        """Get all job applications"""
         try:
-            # Debug logging
-            logger.info("=== JobApplicationListCreateView GET method called ===")
-            logger.info(f"Request method: {request.method}")
-            logger.info(f"Request path: {request.path}")
-            logger.info(f"Query params: {request.query_params}")
-            
-            # Check if JobApplication model exists and has data
-            try:
-                from .models import JobApplication
-                total_count = JobApplication.objects.count()
-                logger.info(f"Total JobApplications in database: {total_count}")
-            except Exception as model_error:
-                logger.error(f"Error accessing JobApplication model: {model_error}")
-                return Response({
-                    'success': False,
-                    'error': 'Database model error',
-                    'message': str(model_error)
-                }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-            
+            logger.debug("Listing job applications with params: %s", redacted(request.query_params))
+
             # Get query parameters for filtering
             bd_id = request.query_params.get('bd_id', None)
             status_filter = request.query_params.get('status', None)
             company = request.query_params.get('company', None)
             
-            queryset = JobApplication.objects.all().order_by('-created_at')
-            logger.info(f"Base queryset count: {queryset.count()}")
+            # Live jobs only unless ?include_archived=1
+            queryset = archive.jobs(archive.include_archived(request.query_params)).order_by('-created_at')
             
             # Apply filters if provided
             if bd_id:
@@ -578,22 +697,23 @@ class JobApplicationListCreateView(APIView):
                             'jobs': []
                         }, status=status.HTTP_400_BAD_REQUEST)
                     
-                    queryset = queryset.filter(bd_id__BD_id=bd_id)
-                    logger.info(f"After BD filter: {queryset.count()}")
-                except Exception as filter_error:
-                    logger.error(f"Error filtering by BD: {filter_error}")
+                    queryset = queryset.for_bd(bd_id)
+                except Exception:
+                    logger.exception("Error filtering by BD")
                     
             if status_filter:
                 queryset = queryset.filter(application_status=status_filter)
-                logger.info(f"After status filter: {queryset.count()}")
                 
             if company:
                 queryset = queryset.filter(company__icontains=company)
-                logger.info(f"After company filter: {queryset.count()}")
+            
+            # One job per near-duplicate description cluster
+            if request.query_params.get('collapse') == 'clusters':
+                queryset = clustering.collapse_clusters(queryset)
             
             # Check if any jobs exist
             if not queryset.exists():
-                logger.info("No job applications found after filtering")
+                logger.debug("No job applications found after filtering")
                 return Response({
                     'success': True,
                     'message': 'No job applications found',
@@ -602,29 +722,20 @@ class JobApplicationListCreateView(APIView):
                 }, status=status.HTTP_200_OK)
             
             # Serialize the data
-            from .serializers import JobApplicationListSerializer
-            serializer = JobApplicationListSerializer(queryset, many=True)
-            logger.info(f"Serialized {len(serializer.data)} job applications")
-            
-            # Log sample data if exists
-            if serializer.data:
-                logger.info(f"Sample job data: {serializer.data[0] if serializer.data else 'None'}")
+            queryset = with_display_relations(queryset, 'bd_id')
+            data = serialize_list(queryset, JobApplicationListSerializer, fields=request.query_params.get('fields'))
             
             response_data = {
                 'success': True,
-                'count': len(serializer.data),
-                'jobs': serializer.data
+                'count': len(data),
+                'jobs': data
             }
             
-            logger.info("=== GET method completed successfully ===")
+            logger.debug("Listed %d job applications", response_data['count'])
             return Response(response_data, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"=== ERROR in GET method ===")
-            logger.error(f"Error type: {type(e).__name__}")
-            logger.error(f"Error message: {str(e)}")
-            import traceback
-            logger.error(f"Traceback: {traceback.format_exc()}")
+            logger.exception("Error listing job applications")
             
             return Response({
                 'success': False,
@@ -638,7 +749,7 @@ class JobApplicationListCreateView(APIView):
     def post(self, request):
         """Create new job application"""
         try:
-            logger.info(f"Creating job application with data: {request.data}")
+            logger.debug("Creating job application with data: %s", redacted(request.data))
             
             # Handle bdId to bd_id conversion from frontend
             data = request.data.copy()
@@ -671,10 +782,37 @@ class JobApplicationListCreateView(APIView):
                 if frontend_field in data:
                     data[backend_field] = data.pop(frontend_field)
             
+            try:
+                policy = dedup.dedup_policy(request.query_params.get('on_duplicate'))
+            except ValueError as e:
+                return Response({
+                    'success': False,
+                    'error': 'Invalid on_duplicate',
+                    'message': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            
             serializer = JobApplicationSerializer(data=data)
             if serializer.is_valid():
-                job = serializer.save()
-                logger.info(f"Job application created successfully: {job.job_id}")
+                job, outcome = dedup.save_new_job(serializer, policy)
+                if outcome == 'duplicate':
+                    logger.info("Rejected duplicate of job application %s", job.job_id)
+                    return Response({
+                        'success': False,
+                        'error': 'Duplicate job application',
+                        'message': f'This posting was already added as job application {job.job_id}',
+                        'duplicate_of': job.job_id,
+                        'data': JobApplicationSerializer(job).data
+                    }, status=status.HTTP_409_CONFLICT)
+                analytics.schedule_refresh()
+                if outcome == 'merged':
+                    logger.info("Merged duplicate into job application %s", job.job_id)
+                    return Response({
+                        'success': True,
+                        'message': 'This posting was already saved; its details were merged.',
+                        'merged': True,
+                        'data': JobApplicationSerializer(job).data
+                    }, status=status.HTTP_200_OK)
+                logger.info("Job application created successfully: %s", job.job_id)
                 
                 return Response({
                     'success': True,
@@ -682,7 +820,7 @@ class JobApplicationListCreateView(APIView):
                     'data': JobApplicationSerializer(job).data
                 }, status=status.HTTP_201_CREATED)
             else:
-                logger.error(f"Job application validation failed: {serializer.errors}")
+                logger.info("Job application validation failed: %s", redacted(serializer.errors))
                 return Response({
                     'success': False,
                     'error': 'Validation failed',
@@ -690,7 +828,7 @@ class JobApplicationListCreateView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
                 
         except Exception as e:
-            logger.error(f"Error creating job application: {str(e)}")
+            logger.exception("Error creating job application")
             return Response({
                 'success': False,
                 'error': 'Failed to create job application',
@@ -735,7 +873,7 @@ class JobApplicationDetailView(APIView):
             }, status=status.HTTP_404_NOT_FOUND)
 
         try:
-            logger.info(f"Updating job application {job_id} with data: {request.data}")
+            logger.debug("Updating job application %s with data: %s", job_id, redacted(request.data))
             
             # Handle field name conversions from frontend form
             data = request.data.copy()
@@ -770,7 +908,8 @@ class JobApplicationDetailView(APIView):
             serializer = JobApplicationSerializer(job, data=data, partial=True)
             if serializer.is_valid():
                 updated_job = serializer.save()
-                logger.info(f"Job application updated successfully: {job_id}")
+                analytics.schedule_refresh()
+                logger.info("Job application updated successfully: %s", job_id)
                 
                 return Response({
                     'success': True,
@@ -778,7 +917,7 @@ class JobApplicationDetailView(APIView):
                     'job': JobApplicationSerializer(updated_job).data
                 }, status=status.HTTP_200_OK)
             else:
-                logger.error(f"Job application update validation failed: {serializer.errors}")
+                logger.info("Job application update validation failed: %s", redacted(serializer.errors))
                 return Response({
                     'success': False,
                     'error': 'Validation failed',
@@ -786,7 +925,7 @@ class JobApplicationDetailView(APIView):
                 }, status=status.HTTP_400_BAD_REQUEST)
                 
         except Exception as e:
-            logger.error(f"Error updating job application: {str(e)}")
+            logger.exception("Error updating job application")
             return Response({
                 'success': False,
                 'error': 'Failed to update job application',
@@ -810,14 +949,15 @@ class JobApplicationDetailView(APIView):
             job_title = job.job_title
             company = job.company
             job.delete()
-            logger.info(f"Job application deleted successfully: {job_id}")
+            analytics.schedule_refresh()
+            logger.info("Job application deleted successfully: %s", job_id)
             return Response({
                 'success': True,
                 'message': f'Job application "{job_title}" at {company} deleted successfully'
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"Error deleting job application: {str(e)}")
+            logger.exception("Error deleting job application")
             return Response({
                 'success': False,
                 'error': 'Failed to delete job application',
@@ -829,11 +969,20 @@ class JobApplicationSearchView(APIView):
     Search and filter job applications
     """
     def get(self, request):
-        """Get all job applications with debugging"""
+        """Get all job applications matching the filters"""
         try:
-            logger.info("=== JobApplicationSearchView GET method called ===")
+            salary_range = compensation.salary_range_params(request.query_params)
+        except ValueError as e:
+            return Response({
+                'success': False,
+                'error': 'Invalid parameters',
+                'message': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            logger.debug("Searching job applications with params: %s", redacted(request.query_params))
         
-            queryset = JobApplication.objects.all().order_by('-created_at')
+            queryset = archive.jobs(archive.include_archived(request.query_params)).order_by('-created_at')
         
             # Apply filters
             bd_id = request.query_params.get('bd_id', None)
@@ -841,33 +990,26 @@ class JobApplicationSearchView(APIView):
             company = request.query_params.get('company', None)
 
             if bd_id:
-                queryset = queryset.filter(bd_id__BD_id=bd_id)
+                queryset = queryset.for_bd(bd_id)
             if status_filter:
                 queryset = queryset.filter(application_status=status_filter)
             if company:
                 queryset = queryset.filter(company__icontains=company)
+            queryset = compensation.filter_salary_range(queryset, salary_range)
 
             # Serialize data
-            from .serializers import JobApplicationListSerializer
-            serializer = JobApplicationListSerializer(queryset, many=True)
-
-            # ✅ Print jobs to console (for debugging)
-            print("=== Jobs Retrieved ===")
-            for job in serializer.data:
-                print(job)  # each job will be a dict
-            print("======================")
-
-            # ✅ Or use logger (recommended for production)
-            logger.info(f"Jobs retrieved: {serializer.data}")
+            queryset = with_display_relations(queryset, 'bd_id')
+            data = serialize_list(queryset, JobApplicationListSerializer, fields=request.query_params.get('fields'))
+            logger.debug("Job search returned %d rows", len(data))
 
             return Response({
                 'success': True,
-                'count': len(serializer.data),
-                'jobs': serializer.data
+                'count': len(data),
+                'jobs': data
             }, status=status.HTTP_200_OK)
 
         except Exception as e:
-            logger.error(f"Error in JobApplicationSearchView GET method: {str(e)}")
+            logger.exception("Error in JobApplicationSearchView GET method")
             return Response({
                 'success': False,
                 'error': 'Failed to retrieve job applications',
@@ -885,18 +1027,21 @@ class JobApplicationByBDView(APIView):
         try:
             bds = BD.objects.all()
             bd_data = {}
+            include_archived = archive.include_archived(request.query_params)
             
             for bd in bds:
-                jobs = JobApplication.objects.filter(bd_id=bd).order_by('-created_at')
-                serializer = JobApplicationListSerializer(jobs, many=True)
+                jobs = with_display_relations(
+                    archive.jobs(include_archived).for_bd(bd).order_by('-created_at'), 'bd_id'
+                )
+                data = serialize_list(jobs, JobApplicationListSerializer, fields=request.query_params.get('fields'))
                 bd_data[bd.BD_id] = {
                     'bd_info': {
                         'bd_id': bd.BD_id,
                         'name': bd.name,
                         'email': bd.email
                     },
-                    'job_count': len(serializer.data),
-                    'jobs': serializer.data
+                    'job_count': len(data),
+                    'jobs': data
                 }
             
             return Response({
@@ -905,7 +1050,7 @@ class JobApplicationByBDView(APIView):
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"Error retrieving job applications by BD: {str(e)}")
+            logger.exception("Error retrieving job applications by BD")
             return Response({
                 'success': False,
                 'error': 'Failed to retrieve job applications by BD',
@@ -919,28 +1064,35 @@ class JobApplicationStatsView(APIView):
     """
     def get(self, request):
         try:
-            total_jobs = JobApplication.objects.count()
-            
-            # Status distribution
-            status_stats = {}
-            for status_choice in JobApplication.APPLICATION_STATUS_CHOICES:
-                status = status_choice[0]
-                count = JobApplication.objects.filter(application_status=status).count()
-                status_stats[status] = count
+            include_archived = archive.include_archived(request.query_params)
+
+            # Status distribution comes from the workflow counters (live jobs)
+            status_stats = {
+                status_name: totals['current']
+                for status_name, totals in workflow.status_totals().items()
+            }
+            if include_archived:
+                for status_name, count in archive.archived_counts('application_status').items():
+                    status_stats[status_name] = status_stats.get(status_name, 0) + count
+            total_jobs = sum(status_stats.values())
             
             # Platform distribution
-            platform_stats = {}
-            for platform_choice in JobApplication.PLATFORM_CHOICES:
-                platform = platform_choice[0]
-                count = JobApplication.objects.filter(platform=platform).count()
-                platform_stats[platform] = count
+            platform_counts = dict(
+                archive.jobs(include_archived).order_by().values_list('platform').annotate(count=Count('pk'))
+            )
+            platform_stats = {
+                platform: platform_counts.get(platform, 0)
+                for platform, _ in JobApplication.PLATFORM_CHOICES
+            }
             
             # Job type distribution
-            job_type_stats = {}
-            for job_type_choice in JobApplication.JOB_TYPE_CHOICES:
-                job_type = job_type_choice[0]
-                count = JobApplication.objects.filter(job_type=job_type).count()
-                job_type_stats[job_type] = count
+            job_type_counts = dict(
+                archive.jobs(include_archived).order_by().values_list('job_type').annotate(count=Count('pk'))
+            )
+            job_type_stats = {
+                job_type: job_type_counts.get(job_type, 0)
+                for job_type, _ in JobApplication.JOB_TYPE_CHOICES
+            }
             
             return Response({
                 'success': True,
@@ -953,7 +1105,7 @@ class JobApplicationStatsView(APIView):
             }, status=status.HTTP_200_OK)
             
         except Exception as e:
-            logger.error(f"Error retrieving job application stats: {str(e)}")
+            logger.exception("Error retrieving job application stats")
             return Response({
                 'success': False,
                 'error': 'Failed to retrieve statistics',
@@ -961,6 +1113,274 @@ class JobApplicationStatsView(APIView):
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+class JobApplicationStatusView(APIView):
+    """
+    GET: status history of a job application
+    POST: move it to a new status ({"status": "Under Review"})
+    """
+    def get(self, request, job_id):
+        if not JobApplication.objects.filter(job_id=job_id).exists():
+            return Response({
+                'success': False,
+                'error': 'Job application not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        transitions = JobStatusTransition.objects.filter(job_id=job_id).values(
+            'from_status', 'to_status', 'changed_at', 'seconds_in_previous'
+        )
+        history = [
+            {
+                'from_status': item['from_status'],
+                'to_status': item['to_status'],
+                'changed_at': item['changed_at'].isoformat(),
+                'seconds_in_previous': item['seconds_in_previous']
+            }
+            for item in transitions
+        ]
+        return Response({
+            'success': True,
+            'job_id': job_id,
+            'count': len(history),
+            'history': history
+        }, status=status.HTTP_200_OK)
+
+    def post(self, request, job_id):
+        to_status = request.data.get('status') or request.data.get('application_status')
+        if not to_status:
+            return Response({
+                'success': False,
+                'error': 'status is required'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            job = workflow.transition(job_id, to_status)
+        except JobApplication.DoesNotExist:
+            return Response({
+                'success': False,
+                'error': 'Job application not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        except workflow.InvalidTransition as e:
+            return Response({
+                'success': False,
+                'error': 'Invalid status transition',
+                'message': str(e),
+                'allowed': e.allowed
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        analytics.schedule_refresh()
+        logger.info("Job application %s moved to %s", job_id, to_status)
+        return Response({
+            'success': True,
+            'job': JobApplicationSerializer(job).data
+        }, status=status.HTTP_200_OK)
+
+
+class JobApplicationFunnelView(APIView):
+    """
+    Application funnel per status, optionally for one BD (?bd_id=)
+    """
+    def get(self, request):
+        bd_id = request.query_params.get('bd_id', None)
+        return Response({
+            'success': True,
+            'bd_id': bd_id,
+            'funnel': workflow.funnel(bd_id)
+        }, status=status.HTTP_200_OK)
+
+
+class JobApplicationTimeInStageView(APIView):
+    """
+    Average time applications spend in each status, optionally for one BD (?bd_id=)
+    """
+    def get(self, request):
+        bd_id = request.query_params.get('bd_id', None)
+        return Response({
+            'success': True,
+            'bd_id': bd_id,
+            'stages': workflow.time_in_stage(bd_id)
+        }, status=status.HTTP_200_OK)
+
+
+
+class JobApplicationTimeSeriesView(APIView):
+    """
+    Job application counts per day/week/month from the analytics rollup.
+
+    Query params: interval (day|week|month), group_by (comma separated:
+    bd, platform, status, job_type), date_field (applied_date|created_at),
+    start/end (YYYY-MM-DD, default the last 365 days) and the filters
+    bd_id, platform, status, job_type.
+    """
+    def get(self, request):
+        params = request.query_params
+        interval = params.get('interval', 'day')
+        basis = params.get('date_field', 'applied_date')
+        group_by = [name.strip() for name in params.get('group_by', '').split(',') if name.strip()]
+
+        errors = {}
+        if interval not in analytics.INTERVALS:
+            errors['interval'] = f"Must be one of: {', '.join(analytics.INTERVALS)}"
+        if basis not in analytics.BASES:
+            errors['date_field'] = f"Must be one of: {', '.join(analytics.BASES)}"
+        unknown = [name for name in group_by if name not in analytics.GROUP_BY_FIELDS]
+        if unknown:
+            errors['group_by'] = f"Unknown: {', '.join(unknown)}. Must be among: {', '.join(analytics.GROUP_BY_FIELDS)}"
+        try:
+            end = date.fromisoformat(params['end']) if params.get('end') else timezone.localdate()
+            start = date.fromisoformat(params['start']) if params.get('start') else end - timedelta(days=365)
+        except ValueError:
+            errors['date'] = 'start and end must be YYYY-MM-DD'
+        if errors:
+            return Response({
+                'success': False,
+                'error': 'Invalid parameters',
+                'details': errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        filters = {'bd': params.get('bd_id')}
+        for name in ('platform', 'status', 'job_type'):
+            filters[name] = params.get(name)
+        filters = {name: value for name, value in filters.items() if value}
+
+        try:
+            analytics.ensure_fresh()
+            buckets = analytics.job_timeseries(interval, list(dict.fromkeys(group_by)), start, end, basis, filters)
+        except Exception as e:
+            logger.exception("Error building job application time series")
+            return Response({
+                'success': False,
+                'error': 'Failed to build time series',
+                'message': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        return Response({
+            'success': True,
+            'interval': interval,
+            'date_field': basis,
+            'group_by': group_by,
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'count': len(buckets),
+            'buckets': buckets
+        }, status=status.HTTP_200_OK)
+
+
+
+class CompensationStatsView(APIView):
+    """
+    Salary statistics from the parsed salary columns (authapp.compensation).
+
+    Query params: source (developers|bds|jobs, default developers), group_by
+    (skill|location|experience, default skill), salary_period (default year)
+    and currency. Rows are per group and currency, largest groups first.
+    """
+    def get(self, request):
+        params = request.query_params
+        source = params.get('source', 'developers')
+        group_by = params.get('group_by', 'skill')
+        period = params.get('salary_period', 'year')
+
+        errors = {}
+        if source not in compensation.SOURCES:
+            errors['source'] = f"Must be one of: {', '.join(compensation.SOURCES)}"
+        elif group_by == 'skill' and compensation.SOURCES[source][2] is None:
+            errors['group_by'] = f"'{source}' has no skills"
+        if group_by not in compensation.GROUP_BY:
+            errors['group_by'] = f"Must be one of: {', '.join(compensation.GROUP_BY)}"
+        if period not in compensation.PERIODS:
+            errors['salary_period'] = f"Must be one of: {', '.join(compensation.PERIODS)}"
+        if errors:
+            return Response({
+                'success': False,
+                'error': 'Invalid parameters',
+                'details': errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            rows = compensation.compensation_stats(source, group_by, period, params.get('currency', ''))
+        except Exception as e:
+            logger.exception("Error computing compensation stats")
+            return Response({
+                'success': False,
+                'error': 'Failed to compute compensation stats',
+                'message': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        return Response({
+            'success': True,
+            'source': source,
+            'group_by': group_by,
+            'salary_period': period,
+            'count': len(rows),
+            'groups': rows
+        }, status=status.HTTP_200_OK)
+
+# -------- Weekly BD reports --------
+class BDReportRunListCreateView(APIView):
+    """
+    GET lists recent report runs; POST starts one for the week containing
+    ``week_start`` (YYYY-MM-DD, default the last complete week) and returns
+    202 with the run to poll. Runs need the task queue: with it disabled the
+    POST is refused with 503 rather than running the report in the request.
+    """
+    def get(self, request):
+        runs = BDReportRun.objects.all()[:20]
+        return Response({
+            'success': True,
+            'runs': [reports.run_summary(run) for run in runs]
+        }, status=status.HTTP_200_OK)
+
+    def post(self, request):
+        week_start = request.data.get('week_start')
+        try:
+            week_start = date.fromisoformat(week_start) if week_start else None
+        except (TypeError, ValueError):
+            return Response({
+                'success': False,
+                'error': 'week_start must be YYYY-MM-DD'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        if not tasks.enabled():
+            return Response({
+                'success': False,
+                'error': 'Report runs need the task queue',
+                'message': 'Set TASK_QUEUE_ENABLED and run manage.py run_task_worker, '
+                           'or run manage.py generate_bd_reports instead.'
+            }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
+
+        try:
+            run = reports.start_report(week_start)
+        except Exception as e:
+            logger.exception("Error starting BD report run")
+            return Response({
+                'success': False,
+                'error': 'Failed to start report',
+                'message': str(e)
+            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+        logger.info("BD report run %s queued for week %s", run.run_id, run.week_start)
+        return Response({
+            'success': True,
+            'run': reports.run_summary(run),
+            'status_url': request.build_absolute_uri(f'{run.run_id}/')
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+class BDReportRunDetailView(APIView):
+    """Progress of a report run, with every BD's report once it is done."""
+    def get(self, request, run_id):
+        run = BDReportRun.objects.filter(run_id=run_id).first()
+        if run is None:
+            return Response({
+                'success': False,
+                'error': 'Report run not found'
+            }, status=status.HTTP_404_NOT_FOUND)
+
+        data = {'success': True, 'run': reports.run_summary(run)}
+        if run.status in ('done', 'failed'):
+            data['reports'] = reports.report_rows(run)
+        return Response(data, status=status.HTTP_200_OK)
+
 
 @api_view(['GET', 'POST'])
 def interview_schedule_list_create(request):
@@ -969,12 +1389,14 @@ def interview_schedule_list_create(request):
     POST: Create a new interview schedule
     """
     if request.method == 'GET':
-        interview_schedules = InterviewSchedule.objects.all().order_by('-created_at')
-        serializer = InterviewScheduleSerializer(interview_schedules, many=True)
+        interview_schedules = with_display_relations(
+            archive.interviews(archive.include_archived(request.query_params)).order_by('-created_at'), 'bd_id', 'dev_id'
+        )
+        data = serialize_list(interview_schedules, InterviewScheduleSerializer, fields=request.query_params.get('fields'))
         return Response({
             'success': True,
-            'count': len(interview_schedules),
-            'interview_schedules': serializer.data
+            'count': len(data),
+            'interview_schedules': data
         })
     
     elif request.method == 'POST':
@@ -1040,14 +1462,17 @@ def interview_schedules_by_developer(request, dev_id):
     """
     Get all interview schedules for a specific developer
     """
-    interview_schedules = InterviewSchedule.objects.filter(dev_id__office_id=dev_id).order_by('-interview_date')
-    serializer = InterviewScheduleSerializer(interview_schedules, many=True)
+    interview_schedules = with_display_relations(
+        archive.interviews(archive.include_archived(request.query_params))
+        .filter(dev_id__office_id=dev_id).order_by('-interview_date'), 'bd_id', 'dev_id'
+    )
+    data = serialize_list(interview_schedules, InterviewScheduleSerializer, fields=request.query_params.get('fields'))
     
     return Response({
         'success': True,
         'developer_id': dev_id,
-        'count': len(interview_schedules),
-        'interview_schedules': serializer.data
+        'count': len(data),
+        'interview_schedules': data
     })
 
 
@@ -1056,14 +1481,17 @@ def interview_schedules_by_bd(request, bd_id):
     """
     Get all interview schedules managed by a specific BD
     """
-    interview_schedules = InterviewSchedule.objects.filter(bd_id__BD_id=bd_id).order_by('-interview_date')
-    serializer = InterviewScheduleSerializer(interview_schedules, many=True)
+    interview_schedules = with_display_relations(
+        archive.interviews(archive.include_archived(request.query_params))
+        .for_bd(bd_id).order_by('-interview_date'), 'bd_id', 'dev_id'
+    )
+    data = serialize_list(interview_schedules, InterviewScheduleSerializer, fields=request.query_params.get('fields'))
     
     return Response({
         'success': True,
         'bd_id': bd_id,
-        'count': len(interview_schedules),
-        'interview_schedules': serializer.data
+        'count': len(data),
+        'interview_schedules': data
     })
 
 
@@ -0,0 +1,203 @@
+"""
+Job application status workflow.
+
+Status changes go through :data:`ALLOWED_TRANSITIONS`. Every change is
+appended to ``JobStatusTransition`` and folded into the per-BD/per-status
+``JobStatusCounter`` rows in the same transaction (see authapp.signals), which
+is what the stats, funnel and time-in-stage reports read.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.utils import timezone
+
+from .models import JobApplication, JobStatusCounter, JobStatusTransition
+
+# Funnel order
+PIPELINE = [choice[0] for choice in JobApplication.APPLICATION_STATUS_CHOICES]
+
+TERMINAL_STATUSES = ('Rejected', 'Withdrawn', 'Accepted')
+
+ALLOWED_TRANSITIONS = {
+    'Applied': ('Under Review', 'Interview Scheduled', 'Rejected', 'Withdrawn'),
+    'Under Review': ('Interview Scheduled', 'Rejected', 'Withdrawn'),
+    'Interview Scheduled': ('Interview Completed', 'Under Review', 'Rejected', 'Withdrawn'),
+    'Interview Completed': ('Interview Scheduled', 'Offer Received', 'Rejected', 'Withdrawn'),
+    'Offer Received': ('Accepted', 'Rejected', 'Withdrawn'),
+    'Rejected': (),
+    'Withdrawn': (),
+    'Accepted': (),
+}
+
+
+class InvalidTransition(ValueError):
+    def __init__(self, message, allowed=()):
+        super().__init__(message)
+        self.allowed = list(allowed)
+
+
+def can_transition(from_status, to_status):
+    return from_status == to_status or to_status in ALLOWED_TRANSITIONS.get(from_status, ())
+
+
+def validate_transition(from_status, to_status):
+    allowed = ALLOWED_TRANSITIONS.get(from_status, ())
+    if to_status not in ALLOWED_TRANSITIONS:
+        raise InvalidTransition(f"Unknown application status '{to_status}'.", allowed)
+    if not can_transition(from_status, to_status):
+        raise InvalidTransition(
+            f"Cannot move an application from '{from_status}' to '{to_status}'. "
+            f"Allowed: {', '.join(allowed) or 'none, it is final'}.",
+            allowed
+        )
+
+
+def transition(job_id, to_status):
+    """
+    Move job ``job_id`` to ``to_status`` and return it. The row is locked
+    while the transition is validated so two concurrent requests cannot both
+    leave the same status.
+    """
+    with transaction.atomic():
+        locked = JobApplication.objects.select_for_update().get(pk=job_id)
+        validate_transition(locked.application_status, to_status)
+        if locked.application_status == to_status:
+            return locked
+        locked.application_status = to_status
+        locked.save(update_fields=['application_status', 'status_changed_at', 'updated_at'])
+        return locked
+
+
+# -------- Log and counters (called from authapp.signals) --------
+def _bump(bd_id, status, **deltas):
+    expressions = {name: F(name) + delta for name, delta in deltas.items()}
+    if JobStatusCounter.objects.filter(bd_id=bd_id, status=status).update(**expressions):
+        return
+    try:
+        with transaction.atomic():
+            JobStatusCounter.objects.create(bd_id=bd_id, status=status, **deltas)
+    except IntegrityError:
+        # Created concurrently since the update above
+        JobStatusCounter.objects.filter(bd_id=bd_id, status=status).update(**expressions)
+
+
+def record_created(job):
+    JobStatusTransition.objects.create(
+        job_id=job, bd_id=job.bd_id_id, from_status=None, to_status=job.application_status,
+        changed_at=job.status_changed_at or timezone.now(),
+    )
+    _bump(job.bd_id_id, job.application_status, current=1, entered=1)
+
+
+def record_transition(job, from_status, from_bd_id, previous_changed_at):
+    """Log ``from_status`` -> ``job.application_status`` and update the counters."""
+    changed_at = job.status_changed_at or timezone.now()
+    seconds = max(int((changed_at - previous_changed_at).total_seconds()), 0) if previous_changed_at else 0
+    JobStatusTransition.objects.create(
+        job_id=job, bd_id=job.bd_id_id, from_status=from_status, to_status=job.application_status,
+        changed_at=changed_at, seconds_in_previous=seconds,
+    )
+    _bump(from_bd_id, from_status, current=-1, exited=1, seconds_in_stage=seconds)
+    _bump(job.bd_id_id, job.application_status, current=1, entered=1)
+
+
+def record_reassigned(job, from_bd_id):
+    """Move a job's current-status count to its new BD."""
+    _bump(from_bd_id, job.application_status, current=-1)
+    _bump(job.bd_id_id, job.application_status, current=1)
+
+
+def record_deleted(bd_id, status):
+    _bump(bd_id, status, current=-1)
+
+
+def record_archived(bd_id, status, count):
+    """``count`` jobs left the live table for the archive (authapp.archive)."""
+    _bump(bd_id, status, current=-count)
+
+
+def record_restored(bd_id, status, count):
+    _bump(bd_id, status, current=count)
+
+
+def rebuild_counters():
+    """
+    Recompute every counter from the live jobs table (current) and the
+    transition log (entered/exited/time in stage). Returns the row count.
+    """
+    totals = {}
+
+    def row(bd_id, status):
+        return totals.setdefault((bd_id, status), {'current': 0, 'entered': 0, 'exited': 0, 'seconds_in_stage': 0})
+
+    for item in JobApplication.objects.order_by().values('bd_id', 'application_status').annotate(n=Count('pk')):
+        row(item['bd_id'], item['application_status'])['current'] = item['n']
+    log = JobStatusTransition.objects.order_by()
+    for item in log.values('bd_id', 'to_status').annotate(n=Count('pk')):
+        row(item['bd_id'], item['to_status'])['entered'] = item['n']
+    # Exits are attributed to the BD recorded on the transition
+    exits = log.exclude(from_status=None).values('bd_id', 'from_status')
+    for item in exits.annotate(n=Count('pk'), seconds=Sum('seconds_in_previous')):
+        counter = row(item['bd_id'], item['from_status'])
+        counter['exited'] = item['n']
+        counter['seconds_in_stage'] = item['seconds']
+
+    with transaction.atomic():
+        JobStatusCounter.objects.all().delete()
+        JobStatusCounter.objects.bulk_create(
+            JobStatusCounter(bd_id=bd_id, status=status, **values) for (bd_id, status), values in totals.items()
+        )
+    return len(totals)
+
+
+# -------- Reports --------
+def status_totals(bd_id=None):
+    """{status: {current, entered, exited, seconds_in_stage}} summed over BDs."""
+    counters = JobStatusCounter.objects.all()
+    if bd_id:
+        counters = counters.filter(bd_id=bd_id)
+    rows = counters.values('status').annotate(
+        current_total=Sum('current'), entered_total=Sum('entered'),
+        exited_total=Sum('exited'), seconds_total=Sum('seconds_in_stage'),
+    )
+    totals = {status: {'current': 0, 'entered': 0, 'exited': 0, 'seconds_in_stage': 0} for status in PIPELINE}
+    for item in rows:
+        totals[item['status']] = {
+            'current': item['current_total'],
+            'entered': item['entered_total'],
+            'exited': item['exited_total'],
+            'seconds_in_stage': item['seconds_total'],
+        }
+    return totals
+
+
+def funnel(bd_id=None):
+    totals = status_totals(bd_id)
+    applied = totals['Applied']['entered']
+    return [
+        {
+            'status': status,
+            'current': totals[status]['current'],
+            'entered': totals[status]['entered'],
+            'exited': totals[status]['exited'],
+            'conversion_from_applied': round(totals[status]['entered'] / applied, 4) if applied else None,
+        }
+        for status in PIPELINE
+    ]
+
+
+def time_in_stage(bd_id=None):
+    """Average time spent in each non-final status by applications that left it."""
+    totals = status_totals(bd_id)
+    report = []
+    for status in PIPELINE:
+        if status in TERMINAL_STATUSES:
+            continue
+        exited = totals[status]['exited']
+        seconds = totals[status]['seconds_in_stage']
+        report.append({
+            'status': status,
+            'exited': exited,
+            'average_seconds': round(seconds / exited) if exited else None,
+            'average_days': round(seconds / exited / 86400, 2) if exited else None,
+        })
+    return report
@@ -0,0 +1,136 @@
+"""
+Environment-driven database configuration.
+
+Every knob is read from a ``DB_*`` environment variable so that credentials and
+connection behaviour can change per deployment without editing settings.py.
+The defaults reproduce the local development setup.
+"""
+import os
+from importlib.util import find_spec
+from pathlib import Path
+
+
+def env_str(name, default=None):
+    value = os.environ.get(name)
+    return default if value is None or value == '' else value
+
+
+def env_int(name, default):
+    value = os.environ.get(name)
+    if value is None or value.strip() == '':
+        return default
+    return int(value)
+
+
+def env_bool(name, default=False):
+    value = os.environ.get(name)
+    if value is None or value.strip() == '':
+        return default
+    return value.strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def env_list(name, default=None):
+    value = os.environ.get(name)
+    if value is None or value.strip() == '':
+        return list(default or [])
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+ENGINE_ALIASES = {
+    'postgres': 'django.db.backends.postgresql',
+    'postgresql': 'django.db.backends.postgresql',
+    'sqlite': 'django.db.backends.sqlite3',
+    'sqlite3': 'django.db.backends.sqlite3',
+}
+
+
+def pool_available():
+    """True when the psycopg 3 connection pool can be imported."""
+    return find_spec('psycopg') is not None and find_spec('psycopg_pool') is not None
+
+
+def database_config(prefix='DB', base_dir=None, defaults=None):
+    """
+    Build one ``DATABASES`` entry from ``<prefix>_*`` environment variables.
+
+    Persistent connections (``CONN_MAX_AGE``) with health checks are the
+    default. Setting ``<prefix>_POOL=1`` switches a PostgreSQL alias to
+    psycopg's built-in pool instead; Django forbids combining the two, so
+    ``CONN_MAX_AGE`` is forced to 0 in that case. If the pool was requested but
+    psycopg_pool is not installed the alias keeps persistent connections and
+    the reason is recorded under ``POOL_STATUS`` for the startup check.
+    """
+    defaults = defaults or {}
+    engine = env_str(f'{prefix}_ENGINE', defaults.get('ENGINE', 'postgresql'))
+    engine = ENGINE_ALIASES.get(engine, engine)
+
+    name = env_str(f'{prefix}_NAME', defaults.get('NAME', 'Business'))
+    if engine == 'django.db.backends.sqlite3' and base_dir and not Path(name).is_absolute():
+        name = str(Path(base_dir) / name)
+
+    config = {
+        'ENGINE': engine,
+        'NAME': name,
+        'USER': env_str(f'{prefix}_USER', defaults.get('USER', '')),
+        'PASSWORD': env_str(f'{prefix}_PASSWORD', defaults.get('PASSWORD', '')),
+        'HOST': env_str(f'{prefix}_HOST', defaults.get('HOST', '')),
+        'PORT': env_str(f'{prefix}_PORT', defaults.get('PORT', '')),
+        'CONN_MAX_AGE': env_int(f'{prefix}_CONN_MAX_AGE', defaults.get('CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': env_bool(f'{prefix}_CONN_HEALTH_CHECKS', defaults.get('CONN_HEALTH_CHECKS', True)),
+        'OPTIONS': {},
+    }
+
+    if engine == 'django.db.backends.postgresql':
+        connect_timeout = env_int(f'{prefix}_CONNECT_TIMEOUT', 5)
+        if connect_timeout:
+            config['OPTIONS']['connect_timeout'] = connect_timeout
+
+    pool_requested = env_bool(f'{prefix}_POOL', defaults.get('POOL', False))
+    if pool_requested and engine != 'django.db.backends.postgresql':
+        config['POOL_STATUS'] = f'pool disabled: {engine} does not support connection pooling'
+    elif pool_requested and not pool_available():
+        config['POOL_STATUS'] = 'pool disabled: psycopg[pool] is not installed, using persistent connections'
+    elif pool_requested:
+        min_size = env_int(f'{prefix}_POOL_MIN_SIZE', 2)
+        max_size = max(min_size, env_int(f'{prefix}_POOL_MAX_SIZE', 10))
+        config['CONN_MAX_AGE'] = 0
+        config['OPTIONS']['pool'] = {
+            'min_size': min_size,
+            'max_size': max_size,
+            'timeout': env_int(f'{prefix}_POOL_TIMEOUT', 10),
+            'max_idle': env_int(f'{prefix}_POOL_MAX_IDLE', 300),
+        }
+        config['POOL_STATUS'] = 'pool enabled'
+
+    return config
+
+
+def effective_pool_size(config):
+    """
+    Return ``(min_size, max_size)`` connections one worker process can hold.
+
+    Without a pool a Django process keeps at most one connection per thread,
+    so the sizes collapse to ``(0, 1)`` for persistent connections.
+    """
+    pool = config.get('OPTIONS', {}).get('pool')
+    if not pool:
+        return 0, 1
+    if pool is True:
+        return 4, 4  # psycopg_pool.ConnectionPool defaults
+    min_size = pool.get('min_size', 4)
+    return min_size, pool.get('max_size') or min_size
+
+
+def connection_summary(alias, config, workers=1):
+    """One line describing how ``alias`` connects, for ``check --deploy`` and ``bench_db_connections``."""
+    if config.get('OPTIONS', {}).get('pool'):
+        min_size, max_size = effective_pool_size(config)
+        return (
+            f"Database '{alias}': psycopg pool min_size={min_size}, max_size={max_size} "
+            f"per worker, up to {max_size * workers} connections across {workers} worker(s)."
+        )
+    return (
+        f"Database '{alias}': persistent connections "
+        f"(CONN_MAX_AGE={config.get('CONN_MAX_AGE')}, "
+        f"CONN_HEALTH_CHECKS={config.get('CONN_HEALTH_CHECKS')})."
+    )
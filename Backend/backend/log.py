@@ -0,0 +1,208 @@
+"""
+Structured, sampled, non-blocking logging.
+
+Request handlers only pay for a filter check and a queue put; formatting and
+I/O happen on a background listener thread. Payloads are wrapped with
+:func:`redacted` so they are neither copied nor rendered unless the record is
+actually emitted, and secrets never reach the log stream.
+"""
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+from collections.abc import Mapping
+from logging.handlers import QueueHandler, QueueListener
+
+REDACTED = '[REDACTED]'
+REDACTED_KEYS = frozenset({
+    'password', 'new_password', 'old_password', 'token', 'access', 'refresh',
+    'secret', 'authorization', 'api_key',
+})
+MAX_PAYLOAD_CHARS = 2000
+
+# Attributes every LogRecord has; anything else was passed through ``extra``.
+_RECORD_ATTRS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def redact(value):
+    """Return a copy of ``value`` with secret-looking keys masked."""
+    if isinstance(value, Mapping):
+        return {
+            key: REDACTED if str(key).lower() in REDACTED_KEYS else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact(item) for item in value]
+    return value
+
+
+class redacted:
+    """
+    Lazy log argument: redacts and truncates ``payload`` only when rendered.
+
+        logger.debug("Creating BD with data: %s", redacted(request.data))
+    """
+
+    __slots__ = ('payload',)
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def __str__(self):
+        payload = self.payload
+        if hasattr(payload, 'dict') and callable(payload.dict):  # QueryDict
+            payload = payload.dict()
+        text = json.dumps(redact(payload), default=str, ensure_ascii=False)
+        if len(text) > MAX_PAYLOAD_CHARS:
+            text = text[:MAX_PAYLOAD_CHARS] + '...'
+        return text
+
+    __repr__ = __str__
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Drop a fraction of low-severity records per logger.
+
+    Rates come from ``settings.LOG_SAMPLE_RATES`` (logger name prefix -> rate
+    between 0 and 1); the longest matching prefix wins. WARNING and above are
+    never sampled out.
+    """
+
+    def __init__(self, rates=None):
+        super().__init__()
+        self._rates = rates
+        self._cache = {}
+
+    @property
+    def rates(self):
+        if self._rates is None:
+            from django.conf import settings
+            self._rates = dict(getattr(settings, 'LOG_SAMPLE_RATES', {}))
+        return self._rates
+
+    def rate_for(self, name):
+        rate = self._cache.get(name)
+        if rate is None:
+            rate = 1.0
+            best = -1
+            for prefix, prefix_rate in self.rates.items():
+                if (name == prefix or name.startswith(prefix + '.')) and len(prefix) > best:
+                    rate, best = prefix_rate, len(prefix)
+            self._cache[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate_for(record.name)
+        return rate >= 1.0 or random.random() < rate
+
+
+class RedactionFilter(logging.Filter):
+    """Mask secrets in mapping arguments and ``extra`` fields of a record."""
+
+    def filter(self, record):
+        if isinstance(record.args, Mapping):
+            record.args = redact(record.args)
+        for key in set(vars(record)) - _RECORD_ATTRS:
+            if key.lower() in REDACTED_KEYS:
+                setattr(record, key, REDACTED)
+            elif isinstance(getattr(record, key), Mapping):
+                setattr(record, key, redact(getattr(record, key)))
+        return True
+
+
+class JSONFormatter(logging.Formatter):
+    """One JSON object per line, including any ``extra`` fields."""
+
+    def format(self, record):
+        entry = {
+            'ts': self.formatTime(record, '%Y-%m-%dT%H:%M:%S'),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        for key in set(vars(record)) - _RECORD_ATTRS:
+            entry[key] = getattr(record, key)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    Hand records to a bounded queue drained by a background thread.
+
+    The caller never blocks on I/O: when the queue is full the record is
+    dropped and counted in ``dropped``. Message formatting is deferred to the
+    listener thread, so records filtered out by sampling cost nothing.
+    """
+
+    def __init__(self, stream=None, queue_size=10000):
+        super().__init__(queue.Queue(maxsize=queue_size))
+        self.target = logging.StreamHandler(stream or sys.stderr)
+        self.dropped = 0
+        self.listener = QueueListener(self.queue, self.target, respect_handler_level=False)
+        self.listener.start()
+        atexit.register(self.close)
+
+    def setFormatter(self, fmt):
+        super().setFormatter(fmt)
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        # Tracebacks must be rendered while the frames are still alive; the
+        # message itself is rendered by the target handler on the listener thread.
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def plain(self):
+        """A synchronous handler writing to the same stream, with the same formatter and filters."""
+        handler = logging.StreamHandler(self.target.stream)
+        handler.setLevel(self.level)
+        handler.setFormatter(self.formatter)
+        for log_filter in self.filters:
+            handler.addFilter(log_filter)
+        return handler
+
+    def close(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        self.target.close()
+        super().close()
+
+
+def use_plain_handlers():
+    """
+    Replace every AsyncQueueHandler of the configured loggers by its
+    :meth:`~AsyncQueueHandler.plain` handler.
+
+    For worker processes: a forked child inherits the handler but not its
+    listener thread, and pool workers exit without running the atexit hook
+    that drains the queue, so their records would never be written.
+    """
+    loggers = [logging.getLogger()] + [
+        logger for logger in logging.Logger.manager.loggerDict.values() if isinstance(logger, logging.Logger)
+    ]
+    replacements = {}
+    for logger in loggers:
+        for handler in list(logger.handlers):
+            if isinstance(handler, AsyncQueueHandler):
+                if handler not in replacements:
+                    replacements[handler] = handler.plain()
+                logger.removeHandler(handler)
+                logger.addHandler(replacements[handler])
@@ -0,0 +1,192 @@
+import hashlib
+import logging
+import math
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+from . import routers, throttling
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+STICKY_COOKIE = 'db_primary_sticky'
+COMPRESSIBLE_TYPES = ('application/json', 'text/', 'application/javascript', 'application/xml')
+
+logger = logging.getLogger(__name__)
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Send read-only endpoints listed in ``REPLICA_ROUTED_VIEWS`` to a replica.
+
+    A caller who wrote within the last ``REPLICA_STICKY_SECONDS`` stays on the
+    primary. The marker is kept both as a cookie and in the cache under the
+    caller's identity (Authorization header or remote address), because the
+    frontend does not always send cookies on cross-origin requests.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state, token = routers.begin_request()
+        try:
+            response = self.get_response(request)
+        finally:
+            routers.end_request(token)
+
+        if state.wrote and routers.get_replicas():
+            sticky_seconds = getattr(settings, 'REPLICA_STICKY_SECONDS', 15)
+            cache.set(self._sticky_key(request), True, sticky_seconds)
+            response.set_cookie(STICKY_COOKIE, '1', max_age=sticky_seconds, httponly=True, samesite='Lax')
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = routers.get_state()
+        replicas = routers.get_replicas()
+        if state is None or not replicas or request.method not in SAFE_METHODS:
+            return None
+
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        if url_name not in getattr(settings, 'REPLICA_ROUTED_VIEWS', ()):
+            return None
+        if request.COOKIES.get(STICKY_COOKIE) or cache.get(self._sticky_key(request)):
+            return None
+
+        state.use_replica(replicas)
+        return None
+
+    @staticmethod
+    def _sticky_key(request):
+        identity = request.META.get('HTTP_AUTHORIZATION') or request.META.get('REMOTE_ADDR', '')
+        return 'db-sticky:' + hashlib.sha1(identity.encode()).hexdigest()
+
+
+def parse_accept_encoding(header):
+    """``Accept-Encoding`` -> {coding: q}, codings lower-cased."""
+    accepted = {}
+    for part in header.split(','):
+        coding, _, params = part.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate_encoding(header):
+    """
+    The coding to answer with: 'br' or 'gzip', or None for identity.
+    Ties go to brotli, which compresses JSON noticeably better.
+    """
+    accepted = parse_accept_encoding(header or '')
+    wildcard = accepted.get('*', 0.0)
+    best, best_quality = None, 0.0
+    for coding in (('br', 'gzip') if brotli is not None else ('gzip',)):
+        quality = accepted.get(coding, wildcard)
+        if quality > best_quality:
+            best, best_quality = coding, quality
+    return best
+
+
+class CompressionMiddleware:
+    """
+    Compress responses with brotli or gzip, as negotiated by Accept-Encoding.
+
+    Like Django's ``GZipMiddleware`` but with a configurable size threshold
+    (``COMPRESSION_MIN_SIZE``), brotli when installed, and only for textual
+    content types. gzip output keeps Django's random filename padding against
+    BREACH-style length attacks. Streaming responses are left alone.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_size = getattr(settings, 'COMPRESSION_MIN_SIZE', 1024)
+        self.brotli_quality = getattr(settings, 'COMPRESSION_BROTLI_QUALITY', 4)
+        self.gzip_random_bytes = getattr(settings, 'COMPRESSION_GZIP_RANDOM_BYTES', 100)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+        if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+            return response
+        if len(response.content) < self.min_size:
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = negotiate_encoding(request.META.get('HTTP_ACCEPT_ENCODING'))
+        if encoding is None:
+            return response
+
+        if encoding == 'br':
+            compressed = brotli.compress(response.content, quality=self.brotli_quality)
+        else:
+            compressed = compress_string(response.content, max_random_bytes=self.gzip_random_bytes)
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers['Content-Length'] = str(len(response.content))
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = encoding
+        return response
+
+
+def too_many_requests(message, retry_after):
+    response = JsonResponse({'success': False, 'error': 'Too many requests', 'message': message}, status=429)
+    response['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+class AdmissionControlMiddleware:
+    """
+    Refuse requests with 429 when the caller is over its rate limit or the
+    endpoint's class is at its concurrency cap (backend.throttling), instead
+    of letting them queue up on the database. Off unless ``THROTTLE_ENABLED``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'THROTTLE_ENABLED', False)
+
+    def __call__(self, request):
+        try:
+            return self.get_response(request)
+        finally:
+            release = getattr(request, '_admission_release', None)
+            if release is not None:
+                release()
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if not self.enabled or request.method == 'OPTIONS':
+            return None
+        retry_after = throttling.check_rate(request)
+        if retry_after is not None:
+            logger.info("Rate limited %s %s", request.method, request.path)
+            return too_many_requests('Rate limit exceeded, retry later.', retry_after)
+
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        release = throttling.limiter.acquire(url_name)
+        if release is None:
+            logger.warning("Shed %s %s: endpoint at its concurrency cap", request.method, request.path)
+            return too_many_requests('Server busy, retry shortly.', 1)
+        request._admission_release = release
+        return None
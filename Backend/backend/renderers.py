@@ -0,0 +1,168 @@
+"""
+orjson-backed JSON renderer and parser for DRF.
+
+The renderer produces exactly the bytes ``rest_framework.renderers.JSONRenderer``
+does for the compact, unicode output this API uses; it only takes over the
+encoding loop. Types orjson would format differently (datetime, date, time,
+Decimal, UUID, lazy strings, querysets, ...) are passed through to DRF's own
+``JSONEncoder.default`` so their representation stays the one DRF defines.
+
+Whenever orjson cannot guarantee identical output the stdlib path is used
+instead:
+
+* indented output (``Accept: application/json; indent=4`` and the browsable API);
+* ``UNICODE_JSON``/``COMPACT_JSON`` turned off;
+* integers outside the 64-bit range and lone surrogates (orjson raises, or
+  on input reads them as floats);
+* floats that Python writes in exponent notation (below 1e-4 or from 1e16
+  upwards), NaN and infinity, found by walking the data before encoding.
+  Text in the payload never matters, only float values do.
+
+The walk visits one nesting level at a time and does the per-value work
+(``type()``, set membership, selection) in C through ``map`` and
+``itertools.compress``, so it costs a fraction of the stdlib encoder.
+
+orjson is optional. Without it both classes behave exactly like their DRF
+parents.
+"""
+import io
+import json
+from itertools import chain, compress
+
+from django.conf import settings
+
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speedup
+    orjson = None
+
+
+if orjson is not None:
+    DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+# orjson reads integers outside the 64-bit range as floats; json keeps them
+# exact. Negative ones start at 19 digits (below -2**63), so any run of 19
+# digits sends the body to json (translate + find is far cheaper than a
+# regex scan).
+_DIGITS_TO_ZERO = bytes.maketrans(b'123456789', b'000000000')
+_LONG_NUMBER = b'0' * 19
+
+
+# Types orjson writes exactly as json does
+_SCALARS = frozenset((str, int, bool, type(None)))
+_FLOAT = frozenset((float,))
+
+
+def _float_differs(value):
+    # Python writes 1e-05 / 1e+16 where orjson writes 0.00001 / 1e16, and
+    # NaN / Infinity where orjson writes null.
+    return value != 0 and not 1e-4 <= abs(value) < 1e16 or value != value
+
+
+def _float_mismatch(data):
+    """True when ``data`` holds a float orjson would format differently from json."""
+    dicts, sequences = [], [[data]]
+    while dicts or sequences:
+        values = list(chain(chain.from_iterable(map(dict.values, dicts)), chain.from_iterable(sequences)))
+        kinds = list(map(type, values))
+        dict_kinds, sequence_kinds = set(), set()
+        for kind in set(kinds) - _SCALARS:
+            if kind is float:
+                if any(map(_float_differs, compress(values, map(_FLOAT.__contains__, kinds)))):
+                    return True
+            elif issubclass(kind, dict):
+                dict_kinds.add(kind)
+            elif issubclass(kind, (list, tuple)):
+                sequence_kinds.add(kind)
+            elif not issubclass(kind, (str, int)) and hasattr(kind, '__iter__'):
+                # Encoded through JSONEncoder.default (querysets, generators, ...);
+                # what they hold is not visible here
+                return True
+        dicts = list(compress(values, map(dict_kinds.__contains__, kinds))) if dict_kinds else []
+        sequences = list(compress(values, map(sequence_kinds.__contains__, kinds))) if sequence_kinds else []
+    return False
+
+
+def _orjson_loads(data):
+    """orjson.loads, or None when json would decode ``data`` differently."""
+    if isinstance(data, str):
+        data = data.encode('utf-8', 'surrogatepass')
+    if data.translate(_DIGITS_TO_ZERO).find(_LONG_NUMBER) != -1:
+        return None
+    try:
+        return orjson.loads(data)
+    except orjson.JSONDecodeError:
+        # Let json report the error, or accept NaN/Infinity where allowed.
+        return None
+
+
+_default = JSONEncoder().default
+
+
+def dumps(data):
+    """
+    Encode ``data`` the way DRF's compact renderer does, returning bytes, or
+    None when the stdlib encoder has to be used to get identical output.
+    """
+    if orjson is None:
+        return None
+    if _float_mismatch(data):
+        return None
+    try:
+        ret = orjson.dumps(data, default=_default, option=DUMPS_OPTIONS)
+    except orjson.JSONEncodeError:
+        return None
+    # Same as DRF: keep the output a strict javascript subset.
+    return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+def loads(data):
+    """Drop-in for ``json.loads``; raises ``json.JSONDecodeError`` on bad input."""
+    if orjson is not None:
+        result = _orjson_loads(data)
+        if result is not None:
+            return result
+    return json.loads(data)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` that encodes with orjson when the output is identical."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if self.compact and not self.ensure_ascii and not self._wants_indent(accepted_media_type, renderer_context):
+            ret = dumps(data)
+            if ret is not None:
+                return ret
+        return super().render(data, accepted_media_type, renderer_context)
+
+    def _wants_indent(self, accepted_media_type, renderer_context):
+        if renderer_context and renderer_context.get('indent') is not None:
+            return True
+        if accepted_media_type and 'indent' in accepted_media_type:
+            return self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        return False
+
+
+class ORJSONParser(JSONParser):
+    """``JSONParser`` that decodes UTF-8 bodies with orjson."""
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('_', '-') not in ('utf-8', 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+        raw = stream.read() if stream is not None else b''
+        result = _orjson_loads(raw)
+        if result is not None:
+            return result
+        # Reparse with json so the error message, and STRICT_JSON handling of
+        # NaN/Infinity, are exactly DRF's.
+        return super().parse(io.BytesIO(raw), media_type, parser_context)
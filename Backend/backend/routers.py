@@ -0,0 +1,74 @@
+"""
+Read-replica database routing.
+
+Reads go to the primary unless the current request was marked as replica-safe
+by ``backend.middleware.ReplicaRoutingMiddleware``. Any write pins the rest of
+the request to the primary, and the middleware keeps the caller pinned for a
+short window afterwards so they read their own writes.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+
+PRIMARY = 'default'
+
+_routing_state = ContextVar('db_routing_state', default=None)
+
+
+class RoutingState:
+    """Per-request routing decision."""
+
+    def __init__(self):
+        self.replica = None
+        self.wrote = False
+
+    def use_replica(self, replicas):
+        if replicas and not self.wrote:
+            self.replica = random.choice(replicas)
+
+    def pin_to_primary(self):
+        self.wrote = True
+        self.replica = None
+
+
+def get_replicas():
+    return list(getattr(settings, 'DATABASE_REPLICAS', []))
+
+
+def get_state():
+    return _routing_state.get()
+
+
+def begin_request():
+    """Install a fresh routing state; returns a token for :func:`end_request`."""
+    state = RoutingState()
+    return state, _routing_state.set(state)
+
+
+def end_request(token):
+    _routing_state.reset(token)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _routing_state.get()
+        if state is None or state.wrote:
+            return PRIMARY
+        return state.replica or PRIMARY
+
+    def db_for_write(self, model, **hints):
+        state = _routing_state.get()
+        if state is not None:
+            state.pin_to_primary()
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {PRIMARY, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive schema changes through replication.
+        return db not in get_replicas()
@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 from datetime import timedelta
 
+from .db import database_config, env_bool, env_int, env_list, env_str
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -47,6 +49,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # ✅ Must be first!
+    'backend.middleware.CompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,6 +57,9 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'backend.middleware.AdmissionControlMiddleware',
+    'authapp.idempotency.IdempotencyMiddleware',
+    'backend.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'backend.urls'
@@ -76,17 +82,73 @@ TEMPLATES = [
 WSGI_APPLICATION = 'backend.wsgi.application'
 
 # Database
+# Configured from DB_* environment variables, see backend/db.py. The defaults
+# match the local development database.
 DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.postgresql',
+    'default': database_config('DB', base_dir=BASE_DIR, defaults={
+        'ENGINE': 'postgresql',
         'NAME': 'Business',
         'USER': 'postgres',
         'PASSWORD': '123454321',
         'HOST': 'localhost',
         'PORT': '5432',
-    }
+    }),
 }
 
+# Read replicas: DB_REPLICAS lists the aliases, each configured from its own
+# DB_<ALIAS>_* variables and falling back to the primary's values.
+DATABASE_REPLICAS = env_list('DB_REPLICAS')
+for _alias in DATABASE_REPLICAS:
+    DATABASES[_alias] = database_config(f'DB_{_alias.upper()}', base_dir=BASE_DIR, defaults=DATABASES['default'])
+    DATABASES[_alias]['TEST'] = {'MIRROR': 'default'}
+
+DATABASE_ROUTERS = ['backend.routers.ReplicaRouter']
+
+# Read-only endpoints (by URL name) that may be served from a replica.
+REPLICA_ROUTED_VIEWS = [
+    'client-list-create',
+    'client-portfolio',
+    'client-deadlines',
+    'developer-list-create',
+    'developer-search',
+    'bd-list-create',
+    'bd-search',
+    'bd-by-location',
+    'bd-by-experience',
+    'job-application-list-create',
+    'job-application-search',
+    'job-applications-by-bd',
+    'job-application-stats',
+    'job-application-funnel',
+    'job-application-time-in-stage',
+    'job-application-timeseries',
+    'interview-schedule-list-create',
+    'interview-schedules-by-developer',
+    'interview-schedules-by-bd',
+]
+
+# How long a caller keeps reading from the primary after a write. The marker
+# is kept in the default cache, which every worker must share for that to
+# hold across processes (authapp.E001).
+REPLICA_STICKY_SECONDS = env_int('DB_REPLICA_STICKY_SECONDS', 15)
+
+# Shared cache, e.g. CACHE_REDIS_URL=redis://localhost:6379/0 (needs the
+# redis package). Without it every process has its own in-memory cache.
+CACHE_REDIS_URL = env_str('CACHE_REDIS_URL', '')
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+        },
+    }
+
+# Number of worker processes sharing the database, used by the startup check
+# to warn when the pools together could exceed DB_MAX_CONNECTIONS. The
+# effective pool sizes are reported by ``manage.py check --deploy``.
+WEB_CONCURRENCY = env_int('WEB_CONCURRENCY', 1)
+DB_MAX_CONNECTIONS = env_int('DB_MAX_CONNECTIONS', 100)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -136,7 +198,11 @@ CORS_ALLOWED_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'idempotency-key',
 ]
+# The name django-cors-headers actually reads
+CORS_ALLOW_HEADERS = CORS_ALLOWED_HEADERS
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed', 'Retry-After']
 
 CORS_ALLOW_METHODS = [
     'DELETE',
@@ -153,10 +219,164 @@ if DEBUG:
 
 
 
+# Serve BD/developer names embedded in job and interview payloads from the
+# denormalized columns on those tables instead of joining bd_data and
+# developer_data. The columns are always kept up to date by authapp.signals.
+DENORMALIZED_DISPLAY_FIELDS = env_bool('DENORMALIZED_DISPLAY_FIELDS', False)
+
+# Serialize list endpoints with the compiled serializers in
+# authapp/fast_serializers.py instead of DRF's field machinery.
+FAST_LIST_SERIALIZERS = env_bool('FAST_LIST_SERIALIZERS', False)
+
+# Response compression (backend.middleware.CompressionMiddleware): brotli when
+# the package is installed and the client accepts it, gzip otherwise. Bodies
+# smaller than COMPRESSION_MIN_SIZE bytes are sent as is.
+COMPRESSION_MIN_SIZE = env_int('COMPRESSION_MIN_SIZE', 1024)
+COMPRESSION_BROTLI_QUALITY = env_int('COMPRESSION_BROTLI_QUALITY', 4)
+
+# The analytics endpoint refreshes the job rollup table (authapp.analytics)
+# incrementally when it is older than this many seconds.
+ANALYTICS_ROLLUP_MAX_AGE = env_int('ANALYTICS_ROLLUP_MAX_AGE', 60)
+
+# What creating a job a BD already added does (authapp.dedup): 'reject'
+# (409 with the existing job), 'merge' (fill in the existing job) or 'allow'.
+# A request can override it with ?on_duplicate=.
+JOB_DEDUP_POLICY = env_str('JOB_DEDUP_POLICY', 'reject')
+
+# Background task queue (authapp.tasks). When enabled, follow-up work such as
+# display field propagation and rollup refreshes is queued in the database and
+# run by `manage.py run_task_worker`; otherwise it runs inline. A task whose
+# worker holds it longer than TASK_LEASE_SECONDS is queued again; finished
+# tasks are purged after TASK_RETENTION_DAYS.
+TASK_QUEUE_ENABLED = env_bool('TASK_QUEUE_ENABLED', False)
+TASK_LEASE_SECONDS = env_int('TASK_LEASE_SECONDS', 300)
+TASK_RETENTION_DAYS = env_int('TASK_RETENTION_DAYS', 7)
+
+# Worker processes for weekly BD report runs (authapp.reports); 0 = one per CPU
+REPORT_PROCESSES = env_int('REPORT_PROCESSES', 0)
+
+# Serve the developer list/search endpoints from an in-memory NumPy snapshot
+# of the roster (authapp.roster). Each process re-checks the database for
+# changes at most every ROSTER_SNAPSHOT_CHECK_SECONDS; writes made by the
+# same process are seen immediately.
+ROSTER_SNAPSHOT = env_bool('ROSTER_SNAPSHOT', False)
+ROSTER_SNAPSHOT_CHECK_SECONDS = env_int('ROSTER_SNAPSHOT_CHECK_SECONDS', 1)
+
+# Salary text is parsed into numeric columns (authapp.compensation). These
+# apply when the text names no currency ('' = unknown) or no period; figures
+# under 1000 without a period are read as hourly rates.
+SALARY_DEFAULT_CURRENCY = env_str('SALARY_DEFAULT_CURRENCY', '')
+SALARY_DEFAULT_PERIOD = env_str('SALARY_DEFAULT_PERIOD', 'year')
+
+# Client portfolio rollup (authapp.portfolio): projected revenue assumes this
+# many billable hours per working day; results are cached for
+# CLIENT_ANALYTICS_CACHE_SECONDS or until a Client is saved or deleted.
+CLIENT_BILLABLE_HOURS_PER_DAY = env_int('CLIENT_BILLABLE_HOURS_PER_DAY', 8)
+CLIENT_ANALYTICS_CACHE_SECONDS = env_int('CLIENT_ANALYTICS_CACHE_SECONDS', 300)
+
+# Admission control (backend.throttling): token-bucket rate limits per JWT
+# role + email ('anon' for callers without a valid token, keyed by address),
+# and per-process caps on concurrent requests of expensive endpoint classes.
+# Over either limit the request gets 429 with Retry-After. THROTTLE_BACKEND
+# 'backend.throttling.CacheBackend' shares buckets through the Django cache.
+THROTTLE_ENABLED = env_bool('THROTTLE_ENABLED', False)
+THROTTLE_BACKEND = env_str('THROTTLE_BACKEND', 'backend.throttling.LocalBackend')
+THROTTLE_RATES = {
+    'admin': env_str('THROTTLE_RATE_ADMIN', '1200/min'),
+    'bd': env_str('THROTTLE_RATE_BD', '600/min'),
+    'developer': env_str('THROTTLE_RATE_DEVELOPER', '600/min'),
+    'client': env_str('THROTTLE_RATE_CLIENT', '600/min'),
+    'anon': env_str('THROTTLE_RATE_ANON', '120/min'),
+}
+THROTTLE_ENDPOINT_CLASSES = {
+    # Scans and per-row loops that hold a connection for a long time
+    'expensive': [
+        'developer-search',
+        'bd-search',
+        'bd-by-location',
+        'bd-by-experience',
+        'job-application-search',
+        'job-applications-by-bd',
+        'job-application-timeseries',
+        'compensation-stats',
+        'client-portfolio',
+    ],
+}
+THROTTLE_CONCURRENCY = {
+    'expensive': env_int('THROTTLE_CONCURRENCY_EXPENSIVE', 4),
+}
+
+# POSTs sent with an Idempotency-Key header (authapp.idempotency) store their
+# response for IDEMPOTENCY_TTL_HOURS and replay it to retries. An attempt
+# still "processing" after IDEMPOTENCY_LOCK_SECONDS is assumed dead. Views
+# whose responses carry credentials are never stored.
+IDEMPOTENCY_TTL_HOURS = env_int('IDEMPOTENCY_TTL_HOURS', 24)
+IDEMPOTENCY_LOCK_SECONDS = env_int('IDEMPOTENCY_LOCK_SECONDS', 120)
+IDEMPOTENCY_EXCLUDED_VIEWS = ['login', 'register']
+
+# Query plan guard (authapp.queryplans, manage.py check_query_plans): flag
+# sequential scans of tables larger than this and compare plan fingerprints
+# with the reviewed snapshot.
+QUERY_PLAN_SEQ_SCAN_ROWS = env_int('QUERY_PLAN_SEQ_SCAN_ROWS', 1000)
+QUERY_PLAN_SNAPSHOT = BASE_DIR / 'authapp' / 'query_plans.json'
+
+# API-only profile (API_ONLY=1) for the workers that serve the JSON API: no
+# admin, sessions, messages, static files or browsable API. The API
+# authenticates with JWTs in the Authorization header and uses none of
+# them; leaving them out cuts worker boot time, memory and per-request
+# middleware. ``manage.py startup_report --api-only`` shows the difference.
+API_ONLY = env_bool('API_ONLY', False)
+if API_ONLY:
+    INSTALLED_APPS = [
+        app for app in INSTALLED_APPS
+        if app not in (
+            'django.contrib.admin',
+            'django.contrib.sessions',
+            'django.contrib.messages',
+            'django.contrib.staticfiles',
+        )
+    ]
+    MIDDLEWARE = [
+        middleware for middleware in MIDDLEWARE
+        if middleware not in (
+            'django.contrib.sessions.middleware.SessionMiddleware',
+            'django.middleware.csrf.CsrfViewMiddleware',  # DRF views are CSRF-exempt
+            'django.contrib.auth.middleware.AuthenticationMiddleware',
+            'django.contrib.messages.middleware.MessageMiddleware',
+            'django.middleware.clickjacking.XFrameOptionsMiddleware',
+        )
+    ]
+    TEMPLATES[0]['OPTIONS']['context_processors'] = ['django.template.context_processors.request']
+
+# Optional PostgreSQL partitioning of jobs and interview_schedules
+# (authapp.partitioning; manage.py partition_tables, create_partitions,
+# detach_partitions, bench_partitioning): partitions per table for the hash
+# scheme, and how many months of range partitions to keep created ahead.
+PARTITION_HASH_PARTITIONS = env_int('PARTITION_HASH_PARTITIONS', 16)
+PARTITION_MONTHS_AHEAD = env_int('PARTITION_MONTHS_AHEAD', 3)
+
+# Archive tier (authapp.archive; manage.py archive_jobs, restore_archived_jobs):
+# jobs in a final status that has not changed for ARCHIVE_AFTER_DAYS days
+# move, with their interviews, to the archive tables, ARCHIVE_BATCH_SIZE jobs
+# per transaction.
+ARCHIVE_AFTER_DAYS = env_int('ARCHIVE_AFTER_DAYS', 180)
+ARCHIVE_BATCH_SIZE = env_int('ARCHIVE_BATCH_SIZE', 500)
+
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    # orjson-backed JSON (falls back to DRF's encoder/decoder byte-for-byte
+    # when orjson is missing or would format a value differently).
+    'DEFAULT_RENDERER_CLASSES': (
+        'backend.renderers.ORJSONRenderer',
+    ) + (() if API_ONLY else ('rest_framework.renderers.BrowsableAPIRenderer',)),
+    'DEFAULT_PARSER_CLASSES': (
+        'backend.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
 }
 
 SIMPLE_JWT = {
@@ -168,4 +388,38 @@ SIMPLE_JWT = {
     "SIGNING_KEY": SECRET_KEY,
       'USER_ID_FIELD': 'email',  # or 'username' or any field that exists
     'USER_ID_CLAIM': 'user_id',
-}    
\ No newline at end of file
+}
+
+
+# Logging: JSON lines written from a background thread, with per-logger
+# sampling of DEBUG/INFO records and redaction of secrets.
+LOG_LEVEL = env_str('LOG_LEVEL', 'INFO')
+
+# Logger name prefix -> fraction of DEBUG/INFO records kept.
+LOG_SAMPLE_RATES = {
+    'authapp.views': float(env_str('LOG_SAMPLE_RATE_VIEWS', '1.0')),
+    'accounts.views': float(env_str('LOG_SAMPLE_RATE_VIEWS', '1.0')),
+}
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'filters': {
+        'sample': {'()': 'backend.log.SamplingFilter'},
+        'redact': {'()': 'backend.log.RedactionFilter'},
+    },
+    'formatters': {
+        'json': {'()': 'backend.log.JSONFormatter'},
+    },
+    'handlers': {
+        'async_console': {
+            'class': 'backend.log.AsyncQueueHandler',
+            'formatter': 'json',
+            'filters': ['sample', 'redact'],
+        },
+    },
+    'loggers': {
+        app: {'handlers': ['async_console'], 'level': LOG_LEVEL, 'propagate': False}
+        for app in ('authapp', 'accounts', 'backend')
+    },
+}
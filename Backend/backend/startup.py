@@ -0,0 +1,158 @@
+"""
+Worker start-up: deferred imports, lazily loaded views and the measurements
+behind ``manage.py startup_report``.
+
+Every worker pays for what is imported while it boots (``django.setup()``,
+loading middleware) and while the URLconf is loaded on its first request.
+Code that only a few requests or a management command needs is therefore
+imported when it is first used:
+
+* :func:`optional_import` for optional dependencies such as NumPy (the
+  roster snapshot and job clustering), which is ~80ms and ~15MB per worker
+  that never touches them;
+* :func:`lazy_view` for rarely used routes whose view module is not
+  otherwise loaded.
+
+``API_ONLY=1`` (backend.settings) leaves out the admin, sessions, messages,
+static files and the browsable API, none of which the JSON API uses.
+
+:func:`measure` runs in a fresh interpreter started by the
+``startup_report`` command and prints the time and resident memory of each
+start-up phase as JSON.
+"""
+import importlib
+import json
+import os
+import sys
+import time
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def optional_import(name):
+    """The module ``name``, or None when it is not installed. Imported on the first call only."""
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+def lazy_view(dotted_path, **initkwargs):
+    """
+    A view that imports ``dotted_path`` (a view function or a class with
+    ``as_view()``) when the route is first requested.
+
+    Only for views that are CSRF-exempt anyway (DRF's ``APIView`` and
+    ``@api_view``): CsrfViewMiddleware sees the wrapper, not the view.
+    """
+    # Imported here so that importing this module in measure() loads no Django code
+    from django.utils.module_loading import import_string
+    from django.views.decorators.csrf import csrf_exempt
+
+    resolved = []
+
+    @csrf_exempt
+    def view(request, *args, **kwargs):
+        if not resolved:
+            target = import_string(dotted_path)
+            resolved.append(target.as_view(**initkwargs) if hasattr(target, 'as_view') else target)
+        return resolved[0](request, *args, **kwargs)
+
+    view.__name__ = dotted_path.rpartition('.')[2]
+    view.__qualname__ = view.__name__
+    view.__module__ = dotted_path.rpartition('.')[0]
+    return view
+
+
+# -------- Measurements --------
+def resident_kb():
+    """Resident set size of this process in KiB (peak RSS where /proc is unavailable)."""
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') // 1024
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def measure():
+    """
+    Boot Django the way a worker does and print, as JSON, each phase's
+    seconds and the resident KiB after it, plus per-app import and
+    ``ready()`` times. Meant for a fresh interpreter (``-X importtime``).
+    """
+    phases = []
+    apps_timing = {}
+    start = mark = time.perf_counter()
+
+    def phase(name):
+        nonlocal mark
+        now = time.perf_counter()
+        phases.append((name, now - mark, resident_kb()))
+        mark = now
+
+    phase('interpreter')
+    import django
+    from django.apps.config import AppConfig
+    phase('import django')
+
+    from django.conf import settings
+    settings.INSTALLED_APPS  # imports the settings module
+    phase('settings')
+
+    create, import_models = AppConfig.create.__func__, AppConfig.import_models
+
+    def timed(label, column, function, *args):
+        began = time.perf_counter()
+        result = function(*args)
+        apps_timing.setdefault(label, [0.0, 0.0, 0.0])[column] += time.perf_counter() - began
+        return result
+
+    def timed_create(cls, entry):
+        return timed(entry, 0, create, cls, entry)
+
+    def timed_import_models(config):
+        ready = config.ready
+        config.ready = lambda: timed(config.name, 2, ready)
+        return timed(config.name, 1, import_models, config)
+
+    AppConfig.create = classmethod(timed_create)
+    AppConfig.import_models = timed_import_models
+    try:
+        django.setup()
+    finally:
+        AppConfig.create, AppConfig.import_models = classmethod(create), import_models
+    phase('django.setup()')
+
+    from django.core.handlers.wsgi import WSGIHandler
+    WSGIHandler()
+    phase('middleware')
+
+    from django.urls import get_resolver
+    get_resolver().url_patterns
+    phase('URLconf')
+
+    print(json.dumps({
+        'settings': settings.SETTINGS_MODULE,
+        'python': sys.version.split()[0],
+        'total': time.perf_counter() - start,
+        'phases': phases,
+        'apps': sorted(([label, *times] for label, times in apps_timing.items()), key=lambda row: -sum(row[1:])),
+        'modules': len(sys.modules),
+    }))
+
+
+def parse_importtime(stderr):
+    """``[(module, self seconds, cumulative seconds, depth)]`` from ``python -X importtime`` output."""
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        depth = (len(name) - len(name.lstrip())) // 2
+        imports.append((name.strip(), int(fields[0]) / 1e6, int(fields[1]) / 1e6, depth))
+    return imports
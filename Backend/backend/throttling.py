@@ -0,0 +1,175 @@
+"""
+Request admission control: per-caller rate limits and per-endpoint-class
+concurrency caps, applied by ``backend.middleware.AdmissionControlMiddleware``.
+
+Rate limits are token buckets keyed by the caller's JWT ``role`` and
+``email`` claims (anonymous callers and invalid tokens by remote address).
+``THROTTLE_RATES`` maps a role to ``'<requests>/<second|minute|hour>'``:
+the bucket holds that many requests and refills at that rate, so a caller
+can burst up to one period's worth and is then held to the average.
+
+Buckets live in a backend named by ``THROTTLE_BACKEND``:
+
+* :class:`LocalBackend` (default) keeps them in process memory: no I/O,
+  but each worker process limits on its own;
+* :class:`CacheBackend` keeps them in Django's cache, shared by every
+  process when that cache is (Redis, Memcached). Updates are
+  read-modify-write, so concurrent requests can occasionally let a
+  request or two more through than the bucket allows.
+
+Any class with ``take(key, rate, capacity) -> (allowed, retry_after)`` can
+be plugged in the same way.
+
+Concurrency caps bound how many requests of an endpoint class (URL names
+listed in ``THROTTLE_ENDPOINT_CLASSES``) a worker process runs at once.
+Past the cap the request is refused with 429 straight away instead of
+queueing for a database connection behind the others.
+"""
+import hashlib
+import threading
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.module_loading import import_string
+
+PERIODS = {'s': 1, 'sec': 1, 'second': 1, 'm': 60, 'min': 60, 'minute': 60, 'h': 3600, 'hour': 3600}
+ANONYMOUS = 'anon'
+
+
+def parse_rate(rate):
+    """'600/min' -> (600, 60)."""
+    count, _, period = rate.partition('/')
+    return int(count), PERIODS[period.strip().lower()]
+
+
+# -------- Bucket backends --------
+# Size of LocalBackend's table past which idle buckets are dropped
+MAX_LOCAL_BUCKETS = 100000
+
+
+class LocalBackend:
+    def __init__(self, max_buckets=MAX_LOCAL_BUCKETS):
+        # key -> (tokens, updated, time the bucket is full again)
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._max_buckets = max_buckets
+        self._prune_above = max_buckets
+
+    def take(self, key, rate, capacity):
+        """Take one token; returns (allowed, seconds until one is available)."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated, _ = self._buckets.get(key, (capacity, now, now))
+            tokens = min(capacity, tokens + (now - updated) * rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            if key not in self._buckets and len(self._buckets) >= self._prune_above:
+                self._prune(now)
+            self._buckets[key] = (tokens, now, now + (capacity - tokens) / rate)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+    def _prune(self, now):
+        # Buckets that are full again carry no state worth keeping
+        self._buckets = {key: value for key, value in self._buckets.items() if value[2] > now}
+        # When most callers are still active, let the table double before the
+        # next scan so inserting stays O(1) amortised
+        self._prune_above = max(self._max_buckets, 2 * len(self._buckets))
+
+
+class CacheBackend:
+    prefix = 'throttle:'
+
+    def take(self, key, rate, capacity):
+        now = time.time()
+        cache_key = self.prefix + hashlib.sha1(key.encode()).hexdigest()
+        tokens, updated = cache.get(cache_key) or (capacity, now)
+        tokens = min(capacity, tokens + max(0.0, now - updated) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # Expire once the bucket would be full again anyway
+        cache.set(cache_key, (tokens, now), int(capacity / rate) + 1)
+        return allowed, 0.0 if allowed else (1 - tokens) / rate
+
+
+@lru_cache(maxsize=None)
+def get_backend(path):
+    return import_string(path)()
+
+
+# -------- Rate limits --------
+def caller(request):
+    """(role, identity) from the request's access token; anonymous callers by address."""
+    header = request.META.get('HTTP_AUTHORIZATION', '')
+    scheme, _, raw = header.partition(' ')
+    if scheme.lower() == 'bearer' and raw:
+        # Imported here: simplejwt reads settings when its module loads
+        from rest_framework_simplejwt.exceptions import TokenError
+        from rest_framework_simplejwt.tokens import AccessToken
+        try:
+            token = AccessToken(raw.strip())
+        except TokenError:
+            pass
+        else:
+            role = token.get('role') or ANONYMOUS
+            return role, token.get('email') or str(token.get('user_id', ''))
+    return ANONYMOUS, request.META.get('REMOTE_ADDR', '')
+
+
+def check_rate(request):
+    """Seconds the caller has to wait before the next request, or None when it may proceed."""
+    role, identity = caller(request)
+    rates = getattr(settings, 'THROTTLE_RATES', {})
+    rate = rates.get(role) or rates.get(ANONYMOUS)
+    if not rate:
+        return None
+    count, period = parse_rate(rate)
+    backend = get_backend(getattr(settings, 'THROTTLE_BACKEND', 'backend.throttling.LocalBackend'))
+    allowed, retry_after = backend.take(f'{role}:{identity}', count / period, count)
+    return None if allowed else retry_after
+
+
+# -------- Concurrency caps --------
+class ConcurrencyLimiter:
+    """Per-process cap on in-flight requests of each endpoint class."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._semaphores = {}
+
+    @staticmethod
+    def endpoint_class(url_name):
+        for name, url_names in getattr(settings, 'THROTTLE_ENDPOINT_CLASSES', {}).items():
+            if url_name in url_names:
+                return name
+        return None
+
+    def _semaphore(self, endpoint_class):
+        with self._lock:
+            if endpoint_class not in self._semaphores:
+                limit = getattr(settings, 'THROTTLE_CONCURRENCY', {}).get(endpoint_class)
+                self._semaphores[endpoint_class] = threading.BoundedSemaphore(limit) if limit else None
+            return self._semaphores[endpoint_class]
+
+    def acquire(self, url_name):
+        """
+        Admit a request for ``url_name``. Returns a release callable, None when
+        the endpoint class is at its cap, or a no-op when it is uncapped.
+        """
+        endpoint_class = self.endpoint_class(url_name)
+        semaphore = self._semaphore(endpoint_class) if endpoint_class else None
+        if semaphore is None:
+            return _no_release
+        if not semaphore.acquire(blocking=False):
+            return None
+        return semaphore.release
+
+
+def _no_release():
+    pass
+
+
+limiter = ConcurrencyLimiter()
@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import { ArrowLeft, Briefcase, Plus, X, Save, AlertCircle, CheckCircle } from 'lucide-react';
 import './form.css';
+import { idempotencyKey, settleIdempotencyKey } from '../Components/idempotencyKey';
 
 interface JobApplicationData {
   jobTitle: string;
@@ -150,13 +151,17 @@ const JobApplicationForm = () => {
     try {
       const API_BASE_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000/api';
 
-      const response = await fetch(`${API_BASE_URL}/job-applications/`, {
+      const url = `${API_BASE_URL}/job-applications/`;
+      const body = JSON.stringify(formData);
+      const response = await fetch(url, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          'Idempotency-Key': idempotencyKey(url, body),
         },
-        body: JSON.stringify(formData),
+        body,
       });
+      settleIdempotencyKey(url, body, response);
 
       const data: ApiResponse = await response.json();
 
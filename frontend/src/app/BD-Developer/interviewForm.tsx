@@ -1,6 +1,7 @@
 import React, { useState } from 'react';
 import { X } from 'lucide-react';
 import './interviewForm.css'; // Assuming you have some styles for the form
+import { idempotencyKey, settleIdempotencyKey } from '../Components/idempotencyKey';
 
 interface Developer {
   office_id: string;
@@ -68,15 +69,19 @@ const InterviewAssignmentForm: React.FC<InterviewAssignmentFormProps> = ({
         company_url: formData.companyUrl || null // Send null if empty
       };
 
-      const response = await fetch(`${apiBaseUrl}/interview-schedules/`, {
+      const url = `${apiBaseUrl}/interview-schedules/`;
+      const body = JSON.stringify(interviewData);
+      const response = await fetch(url, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          'Idempotency-Key': idempotencyKey(url, body),
           // Add any authentication headers if needed
           // 'Authorization': `Bearer ${token}`,
         },
-        body: JSON.stringify(interviewData)
+        body
       });
+      settleIdempotencyKey(url, body, response);
 
       const result = await response.json();
 
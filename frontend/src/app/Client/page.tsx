@@ -35,6 +35,22 @@ interface Client {
   isOverdue: boolean;
 }
 
+// Rollup from /clients/analytics/; money comes as two-decimal strings
+interface Portfolio {
+  as_of: string;
+  totals: {
+    clients: number;
+    total_hourly_rate: string;
+    projected_revenue: string;
+  };
+  deadlines: Record<'overdue' | 'this_week' | 'this_month' | 'later', { count: number; total_hourly_rate: string }>;
+}
+
+interface ClientPage {
+  clients: any[];
+  next_cursor: string | null;
+}
+
 interface ClientFormData {
   clientId: string;
   clientName: string;
@@ -48,8 +64,25 @@ interface ClientFormData {
 const API_BASE_URL = 'http://localhost:8000/api';
 
 // API Functions
-const getClientsAPI = async (): Promise<any[]> => {
-  const response = await fetch(`${API_BASE_URL}/clients/`, {
+const getPortfolioAPI = async (): Promise<Portfolio> => {
+  const response = await fetch(`${API_BASE_URL}/clients/analytics/`, {
+    method: 'GET',
+    headers: {
+      'Content-Type': 'application/json',
+    },
+  });
+
+  if (!response.ok) {
+    throw new Error(`HTTP error! status: ${response.status}`);
+  }
+
+  return response.json();
+};
+
+// One page of clients, soonest deadline first; pass next_cursor for the next one
+const getClientPageAPI = async (cursor?: string): Promise<ClientPage> => {
+  const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : '';
+  const response = await fetch(`${API_BASE_URL}/clients/deadlines/${query}`, {
     method: 'GET',
     headers: {
       'Content-Type': 'application/json',
@@ -77,10 +110,24 @@ const deleteClientAPI = async (clientId: string): Promise<void> => {
   }
 };
 
+// Convert Django response to Client format; overdue against the server's date
+const toClient = (response: any, asOf: string): Client => ({
+  name: response.client_name,
+  company: response.company_name,
+  email: response.email,
+  hourlyRate: response.hourly_rate,
+  dueDate: response.project_deadline,
+  project: response.project_name,
+  clientId: response.client_id,
+  isOverdue: response.project_deadline < asOf,
+});
 
 const DashboardPage: React.FC = () => {
   // State management
   const [clients, setClients] = useState<Client[]>([]);
+  const [portfolio, setPortfolio] = useState<Portfolio | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
   const [isModalOpen, setIsModalOpen] = useState(false);
@@ -99,19 +146,10 @@ const DashboardPage: React.FC = () => {
       
       // Try to get clients from Django API first
       try {
-        const clientResponses = await getClientsAPI();
-        // Convert Django response to Client format
-        const clientsData = clientResponses.map((response: any) => ({
-          name: response.client_name,
-          company: response.company_name,
-          email: response.email,
-          hourlyRate: response.hourly_rate,
-          dueDate: response.project_deadline,
-          project: response.project_name,
-          clientId: response.client_id,
-          isOverdue: new Date(response.project_deadline) < new Date(),
-        }));
-        setClients(clientsData);
+        const [rollup, page] = await Promise.all([getPortfolioAPI(), getClientPageAPI()]);
+        setPortfolio(rollup);
+        setClients(page.clients.map((response: any) => toClient(response, rollup.as_of)));
+        setNextCursor(page.next_cursor);
       } catch (apiError) {
         console.log("Django API not available, using fake data:", apiError);
        
@@ -124,6 +162,30 @@ const DashboardPage: React.FC = () => {
     }
   };
 
+  const loadMoreClients = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const page = await getClientPageAPI(nextCursor);
+      const asOf = portfolio?.as_of ?? new Date().toISOString().slice(0, 10);
+      setClients(prevClients => [...prevClients, ...page.clients.map((response: any) => toClient(response, asOf))]);
+      setNextCursor(page.next_cursor);
+    } catch (err) {
+      console.error("Error loading more clients:", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // The totals are computed by the server; fetch them again after a change
+  const refreshPortfolio = async () => {
+    try {
+      setPortfolio(await getPortfolioAPI());
+    } catch (err) {
+      console.error("Error refreshing client totals:", err);
+    }
+  };
+
   // Modal handlers
   const openModal = () => {
     console.log("Opening modal, current state:", isModalOpen);
@@ -156,6 +218,7 @@ const DashboardPage: React.FC = () => {
 
     // Add to clients state (optimistic update)
     setClients(prevClients => [newClient, ...prevClients]);
+    refreshPortfolio();
   };
 
   // Client action handlers
@@ -188,6 +251,7 @@ const DashboardPage: React.FC = () => {
         client.clientId === updatedClient.clientId ? updatedClient : client
       )
     );
+    refreshPortfolio();
 
     closeModal();
   };
@@ -209,6 +273,7 @@ const DashboardPage: React.FC = () => {
           // Try to delete from Django API
           await deleteClientAPI(clientId);
           console.log("Client deleted successfully from API");
+          refreshPortfolio();
           
           // Show success message
           alert(`Client "${clientName}" has been deleted successfully.`);
@@ -235,15 +300,13 @@ const DashboardPage: React.FC = () => {
       }
     }
   };
-//Here I am Calculating stats based on the clients data
-  const validRates = clients
-  .map(c => Number(c.hourlyRate))
-  .filter(rate => !isNaN(rate) && rate > 0);
-  const totalClients = clients.length;
-  const activeClients = clients.filter(client => !client.isOverdue).length;
-  const avgRate = validRates.length > 0
-  ? Math.round(validRates.reduce((sum, rate) => sum + rate, 0) / validRates.length)
+  // Stats from the server-side rollup (/clients/analytics/), not the loaded page
+  const totalClients = portfolio?.totals.clients ?? 0;
+  const activeClients = totalClients - (portfolio?.deadlines.overdue.count ?? 0);
+  const avgRate = totalClients > 0
+  ? Math.round(Number(portfolio?.totals.total_hourly_rate) / totalClients)
   : 0;
+  const projectedRevenue = Math.round(Number(portfolio?.totals.projected_revenue ?? 0)).toLocaleString();
 
   const statsData = [
     { 
@@ -265,6 +328,13 @@ const DashboardPage: React.FC = () => {
       prefix: "$", 
       icon: <DollarIcon /> 
     },
+    { 
+      title: "Projected Revenue", 
+      value: projectedRevenue, 
+      color: "orange" as const, 
+      prefix: "$", 
+      icon: <DollarIcon /> 
+    },
   ];
 
   return (
@@ -359,6 +429,18 @@ const DashboardPage: React.FC = () => {
               ))}
             </div>
           )}
+
+          {!loading && !error && nextCursor && (
+            <div className="text-center">
+              <button
+                onClick={loadMoreClients}
+                disabled={loadingMore}
+                className="px-4 py-2 bg-blue-600 text-white rounded-lg hover:bg-blue-700 transition-colors disabled:opacity-50"
+              >
+                {loadingMore ? "Loading..." : "Load more clients"}
+              </button>
+            </div>
+          )}
         </div>
       </div>
 
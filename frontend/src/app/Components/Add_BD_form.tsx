@@ -1,5 +1,6 @@
 import React, { useState, useRef, useEffect } from "react";
 import "./CSS/AddClientForm.css";
+import { idempotencyKey, settleIdempotencyKey } from "./idempotencyKey";
 
 // Interfaces
 interface BDFormData {
@@ -55,13 +56,17 @@ const createBDAPI = async (bdData: BDFormData): Promise<BDResponse> => {
 
   console.log('Sending create request:', requestData);
 
-  const response = await fetch(`${API_BASE_URL}/bds/`, {
+  const url = `${API_BASE_URL}/bds/`;
+  const body = JSON.stringify(requestData);
+  const response = await fetch(url, {
     method: "POST",
     headers: {
       "Content-Type": "application/json",
+      "Idempotency-Key": idempotencyKey(url, body),
     },
-    body: JSON.stringify(requestData),
+    body,
   });
+  settleIdempotencyKey(url, body, response);
 
   console.log('Create response status:', response.status);
 
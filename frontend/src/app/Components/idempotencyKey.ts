@@ -0,0 +1,39 @@
+// Idempotency-Key for POST requests: the same key is reused while the same
+// payload is being retried, so the backend replays its first response
+// instead of creating the row twice. The key is kept only when the attempt
+// may still have to be retried (network error, 5xx, 429, or the 409 with
+// Retry-After sent while the first attempt is still running); any other
+// answer settles it, so fixing the form or the data and submitting again
+// starts a new request.
+const keys = new Map<string, string>();
+
+const newKey = () =>
+  typeof crypto !== 'undefined' && 'randomUUID' in crypto
+    ? crypto.randomUUID()
+    : `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}`;
+
+export const idempotencyKey = (url: string, body: string): string => {
+  const id = `${url}\n${body}`;
+  let key = keys.get(id);
+  if (!key) {
+    key = newKey();
+    keys.set(id, key);
+  }
+  return key;
+};
+
+export const clearIdempotencyKey = (url: string, body: string) => {
+  keys.delete(`${url}\n${body}`);
+};
+
+const retryable = (response: Response) =>
+  response.status >= 500 ||
+  response.status === 429 ||
+  (response.status === 409 && response.headers.has('Retry-After'));
+
+// Call with the response of every completed request
+export const settleIdempotencyKey = (url: string, body: string, response: Response) => {
+  if (!retryable(response)) {
+    clearIdempotencyKey(url, body);
+  }
+};